@@ -11,11 +11,15 @@ from src.api.routes.bookings import blp as bookings_blp
 from src.api.routes.auth_routes import blp as auth_blp
 from src.api.routes.contacts import blp as contacts_blp
 from src.api.routes.reviews import blp as reviews_blp
-from src.api.auth import login_required_web, admin_required
+from src.api.routes.metrics import blp as metrics_blp
+from src.api.auth import login_required_web, admin_required, load_current_user, resolve_request_identity
 import os
 import traceback
-from src.api.db import create_tables, db
+from src.api.db import create_tables, db, SessionLocal
+from src.api.services.availability_index import availability_index
 from src.api.scheduler import init_scheduler, shutdown_scheduler
+from src.api.services.outbox import outbox_worker
+from src.api.services.password_hasher import password_hasher, PasswordHasherBusy
 import atexit
 
 import logging
@@ -47,6 +51,12 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 app.config["JWT_SECRET_KEY"] = SECRET_KEY
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(days=1)
 
+try:
+    with SessionLocal() as startup_session:
+        availability_index.rebuild(startup_session)
+except Exception as e:
+    logger.warning(f"Availability index will be built on first use: {e}")
+
 try:
       scheduler = init_scheduler()
       logger.info("Scheduler initialized")
@@ -54,6 +64,17 @@ try:
 except Exception as e:
       logger.error(f"Scheduler failed: {e}")
 
+# Доставка листів з outbox; кілька процесів можуть працювати одночасно (SKIP LOCKED)
+if os.getenv('OUTBOX_WORKER_ENABLED', 'true').lower() == 'true':
+    outbox_worker.start()
+    atexit.register(outbox_worker.stop)
+
+# Пул процесів хешування паролів створюється при першому зверненні
+atexit.register(password_hasher.shutdown)
+
+# JWT запиту перевіряється один раз; декоратори з src/api/auth.py лише читають результат з g
+app.before_request(resolve_request_identity)
+
 # Security headers
 @app.after_request
 def set_security_headers(response):
@@ -97,6 +118,7 @@ try:
     api.register_blueprint(auth_blp)
     api.register_blueprint(contacts_blp)
     api.register_blueprint(reviews_blp)
+    api.register_blueprint(metrics_blp)
 
     logger.info("API routes registered successfully")
 
@@ -113,6 +135,13 @@ def shutdown_session(exception=None):
 def not_found(error):
     return jsonify({'message': 'Resource not found'}), 404
 
+@app.errorhandler(PasswordHasherBusy)
+def password_hashing_busy(error):
+    # черга хешування паролів заповнена - швидка відмова замість очікування
+    response = jsonify({'message': 'Server is busy, please retry later'})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503
+
 @app.errorhandler(500)
 def internal_error(error):
     logger.error("Internal server error")
@@ -156,8 +185,7 @@ def profile():
 @admin_required
 def admin_panel():
     """Адмін панель"""
-    from flask import g
-    return render_template('admin.html', user=g.current_user)
+    return render_template('admin.html', user=load_current_user())
 
 @app.route('/admin/stats')
 @login_required_web
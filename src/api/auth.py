@@ -1,24 +1,42 @@
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify, g
+import hashlib
 import jwt
 from datetime import datetime, timedelta, timezone
 import os
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
 from .models.user_model import User, UserRole
 from .db import db
+from .services.identity_cache import identity_cache, token_version_cache, UserIdentity
+from .services.token_revocation import is_token_revoked
 
 load_dotenv()
 SECRET_KEY = os.getenv('SECRET_KEY') or 'dev-secret-key'
+TOKEN_CLAIMS_CACHE_SIZE = int(os.getenv('TOKEN_CLAIMS_CACHE_SIZE', '4096'))
+# Claims-only режим: для читаючих запитів права беруться з підписаних claims,
+# а з БД (через кеш) звіряється лише token_version користувача
+AUTH_CLAIMS_ONLY = os.getenv('AUTH_CLAIMS_ONLY', 'false').lower() == 'true'
+CLAIMS_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Короткоживучі токени в claims-only режимі, інакше - 1 день
+TOKEN_LIFETIME_MINUTES = int(os.getenv('TOKEN_LIFETIME_MINUTES', '15' if AUTH_CLAIMS_ONLY else '1440'))
 
 
-def create_token(user_id, role=None, is_admin=False):
+def create_token(user_id, role=None, is_admin=False, token_version=None):
     """Generate JWT token for a user"""
     payload = {
         'user_id': user_id,
         'role': role,
         'is_admin': is_admin,
-        'exp': datetime.now(timezone.utc) + timedelta(days=1)  # Token expires in 1 day
+        'exp': datetime.now(timezone.utc) + timedelta(minutes=TOKEN_LIFETIME_MINUTES),
+        # ідентифікатор для відкликання (logout, зміна пароля)
+        'jti': uuid.uuid4().hex
     }
+    if token_version is not None:
+        payload['token_version'] = token_version
     token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
     # PyJWT v1 returns bytes, v2 returns str
     if isinstance(token, bytes):
@@ -28,51 +46,222 @@ def create_token(user_id, role=None, is_admin=False):
 def generate_auth_token_for_user(user: User):
     """Generate JWT token for a user object."""
     role_value = user.role.value if user.role else 'GUEST'
-    return create_token(user.user_id, role=role_value, is_admin=user.role == UserRole.ADMIN)
+    return create_token(user.user_id, role=role_value, is_admin=user.role == UserRole.ADMIN,
+                        token_version=user.token_version or 0)
+
+def _load_user(user_id):
+    return db.query(User).get(user_id)
+
+
+def get_user_identity(user_id):
+    """Identity (user_id, role, is_registered) of a user; the users table is read only on a cache miss"""
+    return identity_cache.get(user_id, _load_user)
+
+
+def load_current_user():
+    """Full User row of the authenticated user, for routes that need more than the identity"""
+    return db.query(User).get(g.current_user.user_id)
+
+
+class TokenClaimsCache:
+    """LRU of verified JWT claims keyed by the SHA-256 of the token.
+
+    Only tokens that passed verification are stored, and an entry is used
+    only until the token's own ``exp``, so a hit is exactly what decoding the
+    same token again would return.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token, decode):
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+
+        # ExpiredSignatureError / InvalidTokenError - як і без кешу
+        claims = decode(token)
+        with self._lock:
+            self._entries[key] = (claims, claims.get('exp'))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return claims
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+token_claims_cache = TokenClaimsCache(TOKEN_CLAIMS_CACHE_SIZE)
+
+
+class TokenRevokedError(jwt.InvalidTokenError):
+    """The token is valid but was revoked before its expiry"""
+
+
+def _decode_token(token):
+    return jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+
+
+def decode_token(token):
+    """Verified claims of a token (memoized); raises jwt.InvalidTokenError like jwt.decode.
+
+    Revoked tokens raise TokenRevokedError; the check is in memory (see
+    services/token_revocation.py), so it is done on every call.
+    """
+    claims = token_claims_cache.get(token, _decode_token)
+    if is_token_revoked(claims):
+        raise TokenRevokedError('Token has been revoked')
+    return claims
+
 
 def verify_auth_token(token):
     """Verify the authentication token."""
     try:
-        data = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        return db.query(User).get(data['user_id'])
+        return get_user_identity(decode_token(token)['user_id'])
     except jwt.InvalidTokenError:
         return None
 
 
-def token_required(f):
-    """Decorator to require authentication"""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
-
-        # Check for token in Authorization header
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
+class RequestAuth:
+    """Outcome of authenticating one token: its claims or the error.
 
+    The user identity is looked up on first use, so requests that never
+    reach an authenticated view do not touch the user cache or the database.
+    In every mode a token's token_version (all issued tokens carry one) must
+    match the user's current one, so a password, role or registration change
+    invalidates all tokens issued before it. With claims_only the identity is
+    built from the claims; otherwise it comes from the identity cache, and
+    other processes see the change within USER_CACHE_TTL.
+    """
+    _UNRESOLVED = object()
+
+    def __init__(self, token, claims_only=False):
+        self.token = token
+        self.claims_only = claims_only
+        self.claims = None
+        self.error = None
+        self._identity = self._UNRESOLVED
         if not token:
-            return jsonify({'message': 'Token is missing'}), 401
-
+            return
         try:
-            # Decode the token
-            data = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+            self.claims = decode_token(token)
+        except jwt.ExpiredSignatureError:
+            self.error = 'Token has expired'
+        except TokenRevokedError:
+            self.error = 'Token has been revoked'
+        except jwt.InvalidTokenError:
+            self.error = 'Invalid token'
+
+    @property
+    def identity(self):
+        if self._identity is self._UNRESOLVED:
+            if not self.claims:
+                self._identity = None
+            elif self.claims_only and 'token_version' in self.claims:
+                self._identity = self._identity_from_claims()
+            else:
+                self._identity = self._current(get_user_identity(self.claims['user_id']))
+        return self._identity
+
+    def _current(self, identity):
+        """identity, or None if the token was issued before its token_version changed"""
+        if identity is not None and 'token_version' in self.claims \
+                and identity.token_version != self.claims['token_version']:
+            # роль, пароль чи реєстрація змінилися після видачі токена
+            self.error = 'Token has been revoked'
+            return None
+        return identity
+
+    def _identity_from_claims(self):
+        user_id = self.claims['user_id']
+        current = self._current(token_version_cache.get(user_id, _load_user))
+        if current is None:
+            return None
+        role = self.claims.get('role')
+        return UserIdentity(user_id, UserRole(role) if role else None, current.is_registered, current.token_version)
+
+
+def _bearer_token():
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        return auth_header.split(' ')[1]
+    return None
+
+
+def resolve_request_identity():
+    """before_request hook: authenticate the bearer token and the auth cookie once per request.
+
+    The results are kept on g as bearer_auth and cookie_auth; the decorators
+    below only read them.
+    """
+    bearer_token = _bearer_token()
+    cookie_token = request.cookies.get('auth_token')
+    claims_only = AUTH_CLAIMS_ONLY and request.method in CLAIMS_ONLY_METHODS
+    g.bearer_auth = RequestAuth(bearer_token, claims_only)
+    g.cookie_auth = g.bearer_auth if cookie_token == bearer_token else RequestAuth(cookie_token, claims_only)
+    g.auth_request = request._get_current_object()
 
-            # Get the user from the database
-            current_user = db.query(User).get(data['user_id'])
 
-            if not current_user:
-                return jsonify({'message': 'User not found'}), 401
+def _request_auth():
+    # застосунок без before_request-хука (напр. у тестах) - автентифікуємо при першому зверненні;
+    # g може пережити запит, якщо app context відкритий ззовні, тому звіряємо сам запит
+    if g.get('auth_request') is not request._get_current_object():
+        resolve_request_identity()
+    return g.bearer_auth, g.cookie_auth
 
-            # Add user to Flask's g object
-            g.current_user = current_user
-            g.is_admin = data.get('is_admin', False)
 
-        except jwt.ExpiredSignatureError:
-            return jsonify({'message': 'Token has expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'message': 'Invalid token'}), 401
+def _authenticate(auth, missing_message):
+    """Put the user on g; returns an error response if the token does not authenticate"""
+    if not auth.token:
+        return jsonify({'message': missing_message}), 401
+
+    current_user = auth.identity
+    if auth.error:
+        return jsonify({'message': auth.error}), 401
+    if not current_user:
+        return jsonify({'message': 'User not found'}), 401
 
+    # Add user to Flask's g object
+    g.current_user = current_user
+    g.is_admin = auth.claims.get('is_admin', False)
+    g.token_claims = auth.claims
+    return None
+
+
+def token_required(f):
+    """Decorator to require authentication"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        bearer_auth, _ = _request_auth()
+        error = _authenticate(bearer_auth, 'Token is missing')
+        if error:
+            return error
         return f(*args, **kwargs)
 
     return decorated
@@ -120,36 +309,11 @@ def login_required_web(f):
     """Decorator for web routes that require authentication"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        # Check for token in cookies or session
-        token = request.cookies.get('auth_token')
-        if not token:
-            # Check Authorization header
-            auth_header = request.headers.get('Authorization')
-            if auth_header and auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-
-        if not token:
-            return jsonify({'message': 'Authentication required'}), 401
-
-        try:
-            # Decode the token
-            data = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-
-            # Get the user from the database
-            current_user = db.query(User).get(data['user_id'])
-
-            if not current_user:
-                return jsonify({'message': 'User not found'}), 401
-
-            # Add user to Flask's g object
-            g.current_user = current_user
-            g.is_admin = data.get('is_admin', False)
-
-        except jwt.ExpiredSignatureError:
-            return jsonify({'message': 'Token has expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'message': 'Invalid token'}), 401
-
+        # Check for token in cookies, then in the Authorization header
+        bearer_auth, cookie_auth = _request_auth()
+        error = _authenticate(cookie_auth if cookie_auth.token else bearer_auth, 'Authentication required')
+        if error:
+            return error
         return f(*args, **kwargs)
 
     return decorated
@@ -159,30 +323,11 @@ def token_optional(f):
     """Decorator for optional authentication (allows both authenticated and guest users)"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-
-        # Check for token in Authorization header
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-
-        if token:
-            try:
-                # Decode the token
-                data = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-
-                # Get the user from the database
-                current_user = db.query(User).get(data['user_id'])
-
-                if current_user:
-                    # Add user to Flask's g object
-                    g.current_user = current_user
-                    g.is_admin = data.get('is_admin', False)
-
-            except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
-                # Ignore token errors for optional auth
-                pass
+        bearer_auth, _ = _request_auth()
+        # Ignore token errors for optional auth
+        if bearer_auth.claims and bearer_auth.identity:
+            g.current_user = bearer_auth.identity
+            g.is_admin = bearer_auth.claims.get('is_admin', False)
 
         return f(*args, **kwargs)
 
@@ -195,7 +340,7 @@ def is_token_expired(token: str) -> bool:
     Returns True if token is expired or invalid, False if valid
     """
     try:
-        jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+        decode_token(token)
         return False
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
         return True
@@ -18,6 +18,7 @@ def init_database():
         from src.api.models.room_model import Room, Amenity, RoomAmenity
         from src.api.models.booking_model import Booking
         from src.api.models.contact_model import Contact
+        from src.api.models.outbox_model import OutboxMessage
         print("Models imported successfully")
 
         print("Creating tables...")
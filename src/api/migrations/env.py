@@ -0,0 +1,42 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from src.api.db import Base, engine
+import src.api.models  # noqa: F401 - реєструє всі таблиці в Base.metadata
+import src.api.models.contact_model  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# sqlalchemy.url задають лише тести (свою БД); інакше - engine застосунку
+url = config.get_main_option("sqlalchemy.url")
+connectable = create_engine(url, poolclass=pool.NullPool) if url else engine
+
+
+def run_migrations_offline():
+    context.configure(
+        url=connectable.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"}
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,45 @@
+"""Composite and partial indexes for the booking hot queries
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Indexes are built CONCURRENTLY so that bookings stay writable while they
+build, and with IF NOT EXISTS because databases created from the models by
+init_db already have them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ACTIVE_ONLY = sa.text("status = 'ACTIVE'")
+
+INDEXES = (
+    ("ix_bookings_active_room_dates", ["room_id", "check_in_date", "check_out_date"], ACTIVE_ONLY),
+    ("ix_bookings_active_check_in", ["check_in_date"], ACTIVE_ONLY),
+    ("ix_bookings_active_check_out", ["check_out_date"], ACTIVE_ONLY),
+    ("ix_bookings_user_room_status", ["user_id", "room_id", "status"], None),
+)
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY не може виконуватися всередині транзакції
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name, "bookings", columns,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="bookings", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,45 @@
+"""Outbox table for notifications delivered by the background worker
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # БД, створені init_db з моделей, уже мають таблицю
+    if "outbox" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("recipient", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("status", sa.Enum("PENDING", "SENT", "FAILED", name="outboxstatus"), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_outbox_pending_available_at", "outbox", ["available_at", "id"],
+        postgresql_where=sa.text("status = 'PENDING'")
+    )
+
+
+def downgrade():
+    op.drop_index("ix_outbox_pending_available_at", table_name="outbox")
+    op.drop_table("outbox")
+    sa.Enum(name="outboxstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,29 @@
+"""token_version column on users for claims-only authorization
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # БД, створені init_db з моделей, уже мають колонку
+    columns = [column["name"] for column in sa.inspect(op.get_bind()).get_columns("users")]
+    if "token_version" in columns:
+        return
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0")
+    )
+
+
+def downgrade():
+    op.drop_column("users", "token_version")
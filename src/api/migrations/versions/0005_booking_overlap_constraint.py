@@ -0,0 +1,104 @@
+"""stay_period column and the exclusion constraint against overlapping bookings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+bookings.stay_period is a stored generated daterange [check_in, check_out).
+ex_bookings_room_stay_period forbids two ACTIVE bookings of one room whose
+stay periods overlap. room_id is compared as int4range, so the GiST index
+works with the built-in range operator classes and does not need the
+btree_gist extension.
+
+The constraint cannot be added while overlapping ACTIVE bookings exist. By
+default the migration then fails and lists the conflicting booking codes, so
+they can be resolved with the guests first; nothing is changed. Setting
+MIGRATION_CANCEL_OVERLAPPING_BOOKINGS=true opts in to cancelling them: with
+bookings locked against writes, every ACTIVE booking that overlaps an earlier
+kept one of the same room (earliest created_at first) is set to CANCELLED,
+and the cancelled codes are logged. Adding the stored column rewrites the
+table under an ACCESS EXCLUSIVE lock.
+"""
+import logging
+import os
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+CONSTRAINT = "ex_bookings_room_stay_period"
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _overlapping_active_bookings(bind):
+    """Codes of ACTIVE bookings that overlap an earlier kept booking of the same room."""
+    rows = bind.execute(sa.text(
+        "SELECT booking_code, room_id, check_in_date, check_out_date FROM bookings "
+        "WHERE status = 'ACTIVE' ORDER BY room_id, created_at NULLS LAST, booking_code"
+    )).all()
+
+    kept = {}
+    conflicts = []
+    for booking_code, room_id, check_in, check_out in rows:
+        stays = kept.setdefault(room_id, [])
+        if any(check_in < other_out and other_in < check_out for other_in, other_out in stays):
+            conflicts.append(booking_code)
+        else:
+            stays.append((check_in, check_out))
+    return conflicts
+
+
+def _cancel_bookings(bind, codes):
+    bind.execute(
+        sa.text("UPDATE bookings SET status = 'CANCELLED' WHERE booking_code IN :codes")
+        .bindparams(sa.bindparam("codes", expanding=True)),
+        {"codes": codes}
+    )
+    logger.warning(f"Cancelled {len(codes)} overlapping ACTIVE bookings: {', '.join(codes)}")
+
+
+def upgrade():
+    bind = op.get_bind()
+    # БД, створені init_db з моделей, уже мають колонку й обмеження
+    columns = [column["name"] for column in sa.inspect(bind).get_columns("bookings")]
+    if "stay_period" not in columns:
+        op.add_column("bookings", sa.Column(
+            "stay_period", postgresql.DATERANGE(),
+            sa.Computed("daterange(check_in_date, check_out_date, '[)')", persisted=True)
+        ))
+
+    exists = bind.execute(
+        sa.text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": CONSTRAINT}
+    ).first()
+    if exists:
+        return
+
+    # до кінця міграції нові бронювання не з'являться між перевіркою і ALTER
+    op.execute("LOCK TABLE bookings IN SHARE ROW EXCLUSIVE MODE")
+    conflicts = _overlapping_active_bookings(bind)
+    if conflicts:
+        # скасування оплачених бронювань гостей - лише за явною згодою
+        if os.getenv("MIGRATION_CANCEL_OVERLAPPING_BOOKINGS", "false").lower() != "true":
+            raise RuntimeError(
+                f"{len(conflicts)} ACTIVE bookings overlap earlier bookings of the same room: "
+                f"{', '.join(conflicts)}. Resolve them, or rerun with "
+                "MIGRATION_CANCEL_OVERLAPPING_BOOKINGS=true to cancel them."
+            )
+        _cancel_bookings(bind, conflicts)
+    # op.create_exclude_constraint не приймає вирази, лише колонки
+    op.execute(
+        f"ALTER TABLE bookings ADD CONSTRAINT {CONSTRAINT} EXCLUDE USING gist "
+        "(int4range(room_id, room_id, '[]') WITH &&, stay_period WITH &&) WHERE (status = 'ACTIVE')"
+    )
+
+
+def downgrade():
+    op.execute(f"ALTER TABLE bookings DROP CONSTRAINT IF EXISTS {CONSTRAINT}")
+    op.execute("ALTER TABLE bookings DROP COLUMN IF EXISTS stay_period")
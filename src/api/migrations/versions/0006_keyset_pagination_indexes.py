@@ -0,0 +1,33 @@
+"""Sort-key indexes for keyset pagination of bookings and reviews
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+Built CONCURRENTLY and with IF NOT EXISTS, like revision 0001.
+"""
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_bookings_created_at_code", "bookings", ["created_at", "booking_code"]),
+    ("ix_reviews_created_at_id", "reviews", ["created_at", "review_id"]),
+)
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY не може виконуватися всередині транзакції
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,32 @@
+"""version columns on bookings and rooms for optimistic concurrency
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+Existing rows start at version 1, like rows inserted by the models.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+TABLES = ("bookings", "rooms")
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        # БД, створені init_db з моделей, уже мають колонку
+        if "version" in [column["name"] for column in inspector.get_columns(table)]:
+            continue
+        op.add_column(table, sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_column(table, "version")
@@ -0,0 +1,39 @@
+"""bookings.created_at NOT NULL
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+created_at is the first key of keyset pagination of bookings, and a cursor
+cannot carry NULL. Rows without it get updated_at or, failing that, the
+check-in date; new rows default to the current UTC time on the server too.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+SERVER_DEFAULT = sa.text("timezone('utc', now())")
+
+
+def upgrade():
+    op.execute(
+        "UPDATE bookings SET created_at = COALESCE(updated_at, check_in_date::timestamp) "
+        "WHERE created_at IS NULL"
+    )
+    # у БД, створених init_db з моделей, колонка вже така - ALTER нічого не змінить
+    op.alter_column(
+        "bookings", "created_at",
+        existing_type=sa.DateTime(), nullable=False, server_default=SERVER_DEFAULT
+    )
+
+
+def downgrade():
+    op.alter_column(
+        "bookings", "created_at",
+        existing_type=sa.DateTime(), nullable=True, server_default=None
+    )
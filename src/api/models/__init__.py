@@ -2,5 +2,7 @@ from .user_model import User
 from .room_model import Room, Amenity, RoomAmenity
 from .booking_model import Booking
 from .review_model import Review
+from .outbox_model import OutboxMessage
+from .revoked_token_model import RevokedToken
 
-__all__ = ["User", "Room", "Amenity", "RoomAmenity", "Booking", "Review"]
\ No newline at end of file
+__all__ = ["User", "Room", "Amenity", "RoomAmenity", "Booking", "Review", "OutboxMessage", "RevokedToken"]
@@ -1,9 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Text, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, Enum, ForeignKey, Computed, Index, Sequence, text, case, and_, literal
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.dialects.postgresql import DATERANGE, ExcludeConstraint
 from src.api.db import Base
 from sqlalchemy.orm import relationship
 import enum
 import datetime
 
+BOOKING_OVERLAP_CONSTRAINT = "ex_bookings_room_stay_period"
+
+# Номери для booking_code: кожен nextval() резервує блок із BOOKING_CODE_BLOCK_SIZE значень
+BOOKING_CODE_BLOCK_SIZE = 100
+booking_code_seq = Sequence(
+    "booking_code_seq", start=1, increment=BOOKING_CODE_BLOCK_SIZE, metadata=Base.metadata
+)
+
+
 class BookingStatus(enum.Enum):
     ACTIVE = "ACTIVE"
     COMPLETED = "COMPLETED"
@@ -17,10 +28,70 @@ class Booking(Base):
     room_id = Column(Integer, ForeignKey("rooms.room_id"), nullable=False)
     check_in_date = Column(Date, nullable=False)
     check_out_date = Column(Date, nullable=False)
+    stay_period = Column(
+        DATERANGE,
+        Computed("daterange(check_in_date, check_out_date, '[)')", persisted=True)
+    )
     special_requests = Column(Text, nullable=True)
     status = Column(Enum(BookingStatus), nullable=False, default=BookingStatus.ACTIVE)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # NOT NULL: ключ keyset-пагінації, курсор не може нести NULL
+    created_at = Column(
+        DateTime, nullable=False, default=datetime.datetime.utcnow,
+        server_default=text("timezone('utc', now())")
+    )
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    # лічильник оптимістичної конкуренції, див. src/api/versioning.py
+    version = Column(Integer, nullable=False, server_default=text("1"))
+
+    # Два ACTIVE бронювання однієї кімнати не можуть перетинатися в часі.
+    # room_id порівнюється як int4range, щоб GiST-індекс працював без btree_gist.
+    __table_args__ = (
+        ExcludeConstraint(
+            (text("int4range(room_id, room_id, '[]')"), "&&"),
+            (stay_period, "&&"),
+            name=BOOKING_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("status = 'ACTIVE'")
+        ),
+        # ключ keyset-пагінації списку бронювань (нові спершу)
+        Index("ix_bookings_created_at_code", "created_at", "booking_code"),
+        # Індекси гарячих запитів; додаються на існуючих БД міграцією
+        # src/api/migrations/versions/0001_booking_hot_query_indexes.py
+        # перевірка перекриттів (create_booking, групове бронювання)
+        Index(
+            "ix_bookings_active_room_dates", "room_id", "check_in_date", "check_out_date",
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+        # нагадування про заїзд, найближчі заїзди
+        Index("ix_bookings_active_check_in", "check_in_date", postgresql_where=text("status = 'ACTIVE'")),
+        # нагадування про виїзд, нічне завершення прострочених бронювань
+        Index("ix_bookings_active_check_out", "check_out_date", postgresql_where=text("status = 'ACTIVE'")),
+        # бронювання користувача (префікс user_id) і перевірка при схваленні відгуку
+        Index("ix_bookings_user_room_status", "user_id", "room_id", "status"),
+    )
+
+    __mapper_args__ = {"version_id_col": version}
 
     user = relationship("User", back_populates="bookings")
     room = relationship("Room", back_populates="bookings")
+
+    @hybrid_property
+    def effective_status(self):
+        """Status as seen by readers.
+
+        An ACTIVE booking whose check-out date has passed reads as COMPLETED even
+        before the nightly job persists it, so read endpoints never have to write.
+        """
+        if self.status == BookingStatus.ACTIVE and self.check_out_date < datetime.date.today():
+            return BookingStatus.COMPLETED
+        return self.status
+
+    @effective_status.expression
+    def effective_status(cls):
+        return case(
+            (
+                and_(cls.status == BookingStatus.ACTIVE, cls.check_out_date < datetime.date.today()),
+                literal(BookingStatus.COMPLETED, cls.status.type)
+            ),
+            else_=cls.status
+        )
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, Enum, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from src.api.db import Base
+import enum
+
+
+class OutboxStatus(enum.Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
+class OutboxMessage(Base):
+    """Notification written in the same transaction as the change it reports.
+
+    Delivered later by the outbox worker (src/api/services/outbox.py).
+    """
+    __tablename__ = "outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # значення NotificationType
+    kind = Column(String(50), nullable=False)
+    recipient = Column(String, nullable=False)
+    phone = Column(String, nullable=True)
+    payload = Column(JSONB, nullable=False)
+    status = Column(Enum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # не раніше цього часу worker бере повідомлення (backoff між спробами)
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # черга worker'а: лише PENDING, у порядку готовності
+        Index("ix_outbox_pending_available_at", "available_at", "id", postgresql_where=text("status = 'PENDING'")),
+    )
+
+    def __repr__(self):
+        return f"<OutboxMessage {self.id} {self.kind} {self.status.value if self.status else None}>"
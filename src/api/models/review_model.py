@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.api.db import Base
 
@@ -17,6 +17,10 @@ class Review(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index('ix_reviews_created_at_id', 'created_at', 'review_id'),
+    )
+
     user = relationship('User', backref='reviews')
     room = relationship('Room', backref='reviews')
 
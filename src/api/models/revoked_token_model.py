@@ -0,0 +1,29 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index, func
+from src.api.db import Base
+
+
+class RevokedToken(Base):
+    """JWT revoked before its expiry (logout, password change).
+
+    Mirrored into each process by the revocation list
+    (src/api/services/token_revocation.py); rows past expires_at can be pruned.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # jti claim токена
+    jti = Column(String(64), nullable=False)
+    user_id = Column(Integer, nullable=True)
+    reason = Column(String(32), nullable=False)
+    # exp токена: після нього запис більше не потрібен
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_revoked_tokens_jti", "jti", unique=True),
+        # інкрементальне оновлення списку в процесах
+        Index("ix_revoked_tokens_revoked_at", "revoked_at"),
+    )
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti} {self.reason}>"
@@ -1,6 +1,6 @@
 from sqlalchemy import (Column, Integer, String, Enum, Float,
                         Text, Boolean, DECIMAL, JSON, ForeignKey,
-                        PrimaryKeyConstraint)
+                        PrimaryKeyConstraint, text)
 from src.api.db import Base
 from sqlalchemy.orm import relationship
 import enum
@@ -29,6 +29,10 @@ class Room(Base):
     size_sqm = Column(Float, nullable=True)
     main_photo_url = Column(String, nullable=True)
     photo_urls = Column(JSON, nullable=True)
+    # лічильник оптимістичної конкуренції, див. src/api/versioning.py
+    version = Column(Integer, nullable=False, server_default=text("1"))
+
+    __mapper_args__ = {"version_id_col": version}
 
     bookings = relationship("Booking", back_populates="room")
     amenities = relationship("RoomAmenity", back_populates="room")
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Index, event
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Index, event, inspect
 from src.api.db import Base
 from sqlalchemy.orm import relationship
 import enum
 import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.api.services.password_hasher import password_hasher, PasswordHasherBusy
 
 
 class UserRole(enum.Enum):
@@ -24,6 +24,8 @@ class User(Base):
     password = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     is_registered = Column(Boolean, default=False)
+    # збільшується при зміні ролі, пароля чи реєстрації: токени зі старою версією недійсні
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     __table_args__ = (
         Index(
@@ -42,16 +44,18 @@ class User(Base):
     # reviews = relationship("Review", back_populates="user")
 
     def set_password(self, password):
-        """Create hashed password."""
-        self.password = generate_password_hash(password, method='pbkdf2:sha256')
+        """Create hashed password (in the password hashing pool)."""
+        self.password = password_hasher.hash(password)
 
     def check_password(self, password):
-        """Check hashed password."""
+        """Check hashed password (in the password hashing pool)."""
         # Guard against None or malformed stored password
         if not self.password:
             return False
         try:
-            return check_password_hash(self.password, password)
+            return password_hasher.verify(self.password, password)
+        except PasswordHasherBusy:
+            raise
         except Exception:
             return False
 
@@ -90,4 +94,15 @@ class User(Base):
             'role': self.role.value if self.role else None,
             'created_at': self.created_at,
             'is_registered': self.is_registered
-        }
\ No newline at end of file
+        }
+
+
+# Зміни, після яких claims у вже виданих токенах більше не відповідають користувачу
+TOKEN_VERSION_FIELDS = ("role", "password", "is_registered")
+
+
+@event.listens_for(User, "before_update")
+def _bump_token_version(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in TOKEN_VERSION_FIELDS):
+        target.token_version = (target.token_version or 0) + 1
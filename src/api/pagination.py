@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A page is fetched with ``WHERE (k1, k2) > (:v1, :v2) ORDER BY k1, k2 LIMIT n``
+(``<``/DESC for newest-first lists), so every page costs one index range scan
+no matter how deep the client has paged. The cursor is the sort key of the last
+row of the previous page, JSON-encoded and base64url-wrapped; clients must treat
+it as opaque.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor back into sort-key values typed like the given columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for value, column in zip(values, columns):
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif value is not None and not isinstance(value, python_type):
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def keyset_page(query, columns, limit=DEFAULT_PAGE_SIZE, cursor=None, descending=False):
+    """Return (items, next_cursor) for one page of query ordered by columns.
+
+    columns must form a unique key (end with the primary key) so that no row is
+    skipped or repeated between pages. next_cursor is None on the last page.
+    """
+    limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    key = tuple_(*columns)
+
+    if cursor:
+        after = tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < after if descending else key > after)
+
+    order = [c.desc() for c in columns] if descending else list(columns)
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return items, next_cursor
@@ -4,8 +4,12 @@ from flask.views import MethodView
 from flask_smorest import Blueprint as SmorestBlueprint, abort
 from werkzeug.security import check_password_hash
 from ..models.user_model import User, UserRole
-from ..services.user_service import get_user_by_email, create_user, update_user_partial
-from ..auth import token_required, admin_required, create_token, generate_auth_token_for_user
+from ..services.user_service import get_user_by_email, create_user, update_user_partial, rehash_password
+from ..auth import (
+    token_required, admin_required, create_token, generate_auth_token_for_user, load_current_user, validate_password
+)
+from ..services.token_revocation import revoke_token
+from ..services.password_hasher import PasswordHasherBusy
 from ..db import db
 import logging
 
@@ -100,6 +104,9 @@ class Register(MethodView):  # <--- Змінено на MethodView
             db.rollback()
             logger.exception('Database error during registration')
             return jsonify({'message': 'Database error occurred'}), 500
+        except PasswordHasherBusy:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             logger.exception('Unexpected error during registration')
@@ -223,6 +230,8 @@ def login():
 
         if not user or not user.check_password(password):
             return jsonify({'message': 'Invalid email or password'}), 401
+        # хеш зі старими параметрами замінюємо, поки маємо перевірений пароль
+        rehash_password(db, user, password)
 
         # Generate auth token
         token = generate_auth_token_for_user(user)
@@ -241,6 +250,8 @@ def login():
                 'is_admin': is_admin
             }
         })
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         current_app.logger.exception("Login error")
         return jsonify({'message': 'Internal server error during login'}), 500
@@ -249,18 +260,66 @@ def login():
 @token_required
 def get_current_user():
     """Get current user info"""
-    role_value = _get_role_value(g.current_user)
+    # g.current_user - лише кешована ідентичність; профіль читаємо з БД
+    user = load_current_user()
+    if not user:
+        return jsonify({'message': 'User not found'}), 401
+    role_value = _get_role_value(user)
     is_admin = (role_value == 'ADMIN')
     return jsonify({
-        'id': g.current_user.user_id,
-        'email': g.current_user.email,
-        'first_name': g.current_user.first_name,
-        'last_name': g.current_user.last_name,
-        'phone': g.current_user.phone,
+        'id': user.user_id,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'phone': user.phone,
         'role': role_value,
         'is_admin': is_admin
     })
 
+@blp.route('/logout', methods=['POST'])
+@token_required
+def logout():
+    """Revoke the current token"""
+    try:
+        revoke_token(db, g.token_claims, 'logout')
+        db.commit()
+        return jsonify({'message': 'Logged out'})
+    except SQLAlchemyError:
+        db.rollback()
+        current_app.logger.exception("Logout error")
+        return jsonify({'message': 'Internal server error during logout'}), 500
+
+@blp.route('/change-password', methods=['POST'])
+@token_required
+def change_password():
+    """Change password; all tokens issued before it stop working and a new one is returned"""
+    data = request.get_json(silent=True) or {}
+    current_password = data.get('current_password') or ''
+    new_password = data.get('new_password') or ''
+
+    if not current_password or not new_password:
+        return jsonify({'message': 'Current and new password are required'}), 400
+    is_valid, message = validate_password(new_password)
+    if not is_valid:
+        return jsonify({'message': message}), 400
+
+    user = load_current_user()
+    if not user or not user.check_password(current_password):
+        return jsonify({'message': 'Invalid current password'}), 401
+
+    try:
+        user.set_password(new_password)
+        # set_password збільшує token_version - решта токенів користувача недійсні;
+        # цей токен ще й відкликається в тій самій транзакції, що й зміна пароля
+        revoke_token(db, g.token_claims, 'password_change')
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        current_app.logger.exception("Password change error")
+        return jsonify({'message': 'Internal server error during password change'}), 500
+
+    return jsonify({'message': 'Password changed', 'token': generate_auth_token_for_user(user)})
+
 # Admin-only route example
 @blp.route('/admin')
 @token_required
@@ -274,5 +333,6 @@ def admin_only():
 def refresh_token():
     role_value = _get_role_value(g.current_user)
     is_admin = (role_value == 'ADMIN')
-    token = create_token(user_id=g.current_user.user_id, role=role_value, is_admin=is_admin)
+    token = create_token(user_id=g.current_user.user_id, role=role_value, is_admin=is_admin,
+                         token_version=g.current_user.token_version)
     return _auth_token_response(token, role=role_value)
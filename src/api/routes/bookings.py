@@ -1,21 +1,32 @@
+import csv
+import io
+import json
+from datetime import date
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
-from flask import g
-from src.api.auth import token_optional
+from flask import g, jsonify, request, Response, stream_with_context
+from src.api.auth import admin_required, token_optional, token_required
 from src.api.schemas.booking_schema import (
-    BookingInSchema, BookingOutSchema, BookingPatchSchema
+    BookingInSchema, BookingOutSchema, BookingPatchSchema, BookingPageSchema,
+    GroupBookingInSchema, GroupBookingOutSchema
 )
+from src.api.schemas.pagination_schema import PageQuerySchema
 from src.api.services.booking_service import (
     get_all_bookings,
+    get_bookings_page,
     create_booking,
+    create_group_booking,
     get_booking_by_code,
     update_booking_partial,
     update_booking_full,
     cancel_booking,
     get_user_bookings,
-    get_upcoming_checkins
+    get_upcoming_checkins,
+    iter_bookings_for_export,
+    EXPORT_COLUMNS
 )
 from src.api.db import db
+from src.api.versioning import VersionConflictError, make_etag, parse_if_match
 
 blp = Blueprint(
     "Bookings",
@@ -28,11 +39,19 @@ blp = Blueprint(
 @blp.route("/")
 class BookingList(MethodView):
 
-    @blp.response(200, BookingOutSchema(many=True), description="List of all bookings.")
+    @blp.arguments(PageQuerySchema, location="query")
+    @blp.response(200, BookingPageSchema, description="Page of bookings, newest first. With all=true the full list is returned as an array.")
+    @blp.alt_response(400, description="Invalid cursor")
     @blp.alt_response(500, description="Internal server error")
-    def get(self):
-        """Get all bookings"""
-        return get_all_bookings(db)
+    def get(self, page_args):
+        """Get bookings (cursor-paginated)"""
+        if page_args["all"]:
+            return jsonify(BookingOutSchema(many=True).dump(get_all_bookings(db)))
+        try:
+            items, next_cursor = get_bookings_page(db, page_args["limit"], page_args["cursor"])
+        except ValueError as e:
+            abort(400, message=str(e))
+        return {"items": items, "next_cursor": next_cursor}
 
     @blp.arguments(BookingInSchema)
     @blp.response(201, BookingOutSchema, description="Booking created successfully.")
@@ -60,6 +79,32 @@ class BookingList(MethodView):
                 abort(400, message=str(e))
 
 
+@blp.route("/group")
+class GroupBooking(MethodView):
+
+    @blp.arguments(GroupBookingInSchema)
+    @blp.response(201, GroupBookingOutSchema, description="All rooms booked in one transaction.")
+    @blp.alt_response(400, description="Invalid booking data provided")
+    @blp.alt_response(409, description="At least one room is not available for its dates; nothing was booked")
+    @blp.alt_response(404, description="Room or user not found")
+    @token_optional
+    def post(self, group):
+        """Book several rooms for one guest atomically (all or nothing)"""
+        current_user = getattr(g, 'current_user', None)
+        if current_user:
+            group['user_id'] = current_user.user_id
+
+        try:
+            return {"bookings": create_group_booking(db, group)}
+        except ValueError as e:
+            if "not available" in str(e).lower() or "already booked" in str(e).lower():
+                abort(409, message=str(e))
+            elif "not found" in str(e).lower():
+                abort(404, message=str(e))
+            else:
+                abort(400, message=str(e))
+
+
 @blp.route("/user/<int:user_id>")
 class UserBookings(MethodView):
 
@@ -78,16 +123,85 @@ class UpcomingCheckins(MethodView):
         return get_upcoming_checkins(db)
 
 
+def _export_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps({k: _export_value(v) for k, v in row.items()}, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(["" if v is None else _export_value(v) for v in row.values()])
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+@blp.route("/export")
+class BookingExport(MethodView):
+
+    @blp.alt_response(400, description="Invalid format or date range")
+    @blp.alt_response(401, description="Authentication required")
+    @blp.alt_response(403, description="Admin access required")
+    @token_required
+    @admin_required
+    def get(self):
+        """Stream the booking history for accounting (admin only).
+        Query params:
+          - format: ndjson|csv (optional, default=ndjson)
+          - from: YYYY-MM-DD (optional, check-in on or after)
+          - to: YYYY-MM-DD (optional, check-in before)
+        Rows are read through a server-side cursor and written out as they
+        arrive, so memory use does not grow with the number of bookings.
+        """
+        export_format = request.args.get("format", "ndjson").lower()
+        if export_format not in ("ndjson", "csv"):
+            abort(400, message="Invalid format. Use 'ndjson' or 'csv'")
+
+        from_str = request.args.get("from")
+        to_str = request.args.get("to")
+        try:
+            date_from = date.fromisoformat(from_str) if from_str else None
+            date_to = date.fromisoformat(to_str) if to_str else None
+        except ValueError:
+            abort(400, message="Invalid date format. Use YYYY-MM-DD")
+        if date_from and date_to and date_to <= date_from:
+            abort(400, message="'to' must be after 'from'")
+
+        rows = iter_bookings_for_export(db, date_from, date_to)
+        if export_format == "csv":
+            lines, mimetype = _csv_lines(rows), "text/csv"
+        else:
+            lines, mimetype = _ndjson_lines(rows), "application/x-ndjson"
+
+        filename = f"bookings.{export_format}"
+        return Response(
+            stream_with_context(lines),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+
 @blp.route("/<string:booking_code>")
 class BookingResource(MethodView):
 
-    @blp.response(200, BookingOutSchema, description="Booking details retrieved successfully.")
+    @blp.response(200, BookingOutSchema, description="Booking details retrieved successfully. ETag carries the booking version.")
     @blp.alt_response(404, description="Booking not found")
     def get(self, booking_code):
         booking = get_booking_by_code(db, booking_code)
         if not booking:
             abort(404, message=f"Booking with code {booking_code} not found")
-        return booking
+        return booking, {"ETag": make_etag(booking.version)}
 
     @blp.arguments(BookingPatchSchema)
     @blp.response(200, BookingOutSchema, description="Booking updated successfully")
@@ -95,13 +209,18 @@ class BookingResource(MethodView):
     @blp.alt_response(403, description="Cannot modify completed/cancelled booking")
     @blp.alt_response(404, description="Booking not found")
     @blp.alt_response(409, description="Room not available for new dates")
+    @blp.alt_response(412, description="If-Match does not match the current booking version")
     def patch(self, patch_data, booking_code):
         try:
-            booking = update_booking_partial(db, booking_code, patch_data)
+            expected_version = parse_if_match(request.headers.get("If-Match"))
+            booking = update_booking_partial(db, booking_code, patch_data, expected_version=expected_version)
             if not booking:
                 abort(404, message=f"Booking with code {booking_code} not found")
             db.commit()
-            return booking
+            return booking, {"ETag": make_etag(booking.version)}
+        except VersionConflictError as e:
+            db.rollback()
+            abort(412, message=str(e))
         except ValueError as e:
             db.rollback()
             if "cannot modify" in str(e).lower():
@@ -117,13 +236,18 @@ class BookingResource(MethodView):
     @blp.alt_response(400, description="Invalid booking data")
     @blp.alt_response(403, description="Cannot modify completed/cancelled booking")
     @blp.alt_response(409, description="Room not available for new dates")
+    @blp.alt_response(412, description="If-Match does not match the current booking version")
     def put(self, updated_booking, booking_code):
         try:
-            booking = update_booking_full(db, booking_code, updated_booking)
+            expected_version = parse_if_match(request.headers.get("If-Match"))
+            booking = update_booking_full(db, booking_code, updated_booking, expected_version=expected_version)
             if not booking:
                 abort(404, message=f"Booking with code {booking_code} not found")
             db.commit()
-            return booking
+            return booking, {"ETag": make_etag(booking.version)}
+        except VersionConflictError as e:
+            db.rollback()
+            abort(412, message=str(e))
         except ValueError as e:
             db.rollback()
             if "cannot modify" in str(e).lower():
@@ -0,0 +1,40 @@
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from src.api.auth import token_required, admin_required, token_claims_cache
+from src.api.services.identity_cache import identity_cache, token_version_cache
+from src.api.services.lock_manager import lock_metrics
+from src.api.services.notification_service import last_reminder_run, notification_service
+from src.api.services.password_hasher import password_hasher
+from src.api.services.room_catalog import room_catalog
+from src.api.services.token_revocation import revocation_list
+from src.api.services.tx_retry import retry_metrics
+
+blp = Blueprint(
+    "Metrics",
+    "metrics",
+    url_prefix="/api/v1/metrics",
+    description="Runtime metrics of this API process (admin only)."
+)
+
+
+@blp.route("/")
+class Metrics(MethodView):
+
+    @blp.alt_response(401, description="Authentication required")
+    @blp.alt_response(403, description="Admin access required")
+    @token_required
+    @admin_required
+    def get(self):
+        """Get in-process counters: booking locks, serializable retries, daily reminders, SMTP circuit breaker, auth caches, token revocation, password hashing, room catalog cache"""
+        return {
+            "booking_locks": lock_metrics.snapshot(),
+            "serializable_retries": retry_metrics.snapshot(),
+            "daily_reminders": dict(last_reminder_run),
+            "smtp_circuit": notification_service.smtp_breaker.snapshot(),
+            "user_identity_cache": identity_cache.snapshot(),
+            "token_version_cache": token_version_cache.snapshot(),
+            "token_claims_cache": token_claims_cache.snapshot(),
+            "token_revocation": revocation_list.snapshot(),
+            "password_hasher": password_hasher.snapshot(),
+            "room_catalog": room_catalog.snapshot()
+        }
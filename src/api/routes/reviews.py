@@ -1,12 +1,14 @@
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
-from flask import g
+from flask import g, jsonify
 from src.api.auth import token_required, staff_required
 from src.api.schemas.review_schema import (
-    ReviewInSchema, ReviewOutSchema, ReviewPatchSchema
+    ReviewInSchema, ReviewOutSchema, ReviewPatchSchema, ReviewPageSchema
 )
+from src.api.schemas.pagination_schema import PageQuerySchema
 from src.api.services.review_service import (
     get_all_reviews,
+    get_reviews_page,
     get_review_by_id,
     get_user_reviews,
     create_review,
@@ -30,11 +32,19 @@ blp = Blueprint(
 @blp.route("/")
 class ReviewList(MethodView):
 
-    @blp.response(200, ReviewOutSchema(many=True), description="List of all reviews.")
+    @blp.arguments(PageQuerySchema, location="query")
+    @blp.response(200, ReviewPageSchema, description="Page of approved reviews, newest first. With all=true the full list is returned as an array.")
+    @blp.alt_response(400, description="Invalid cursor")
     @blp.alt_response(500, description="Internal server error")
-    def get(self):
-        """Get all reviews"""
-        return get_all_reviews(db)
+    def get(self, page_args):
+        """Get approved reviews (cursor-paginated)"""
+        if page_args["all"]:
+            return jsonify(ReviewOutSchema(many=True).dump(get_all_reviews(db)))
+        try:
+            items, next_cursor = get_reviews_page(db, page_args["limit"], page_args["cursor"])
+        except ValueError as e:
+            abort(400, message=str(e))
+        return {"items": items, "next_cursor": next_cursor}
 
     @blp.arguments(ReviewInSchema)
     @blp.response(201, ReviewOutSchema, description="Review created successfully.")
@@ -1,12 +1,17 @@
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
-from flask import request
+from flask import request, Response, stream_with_context, jsonify
+import json
 from datetime import date, timedelta
 import logging
 from werkzeug.exceptions import BadRequest, HTTPException
 from src.api.schemas.room_schema import (
-    RoomInSchema, RoomOutSchema, RoomPatchSchema
+    RoomInSchema, RoomOutSchema, RoomPatchSchema,
+    RoomAvailabilityBatchInSchema, RoomAvailabilityBatchOutSchema, RoomPageSchema
 )
+from src.api.schemas.pagination_schema import PageQuerySchema
+from src.api.pagination import keyset_page
+from src.api.versioning import VersionConflictError, make_etag, parse_if_match
 from src.api.schemas.amenity_schema import (
     AmenityInSchema, AmenityOutSchema, AmenityPatchSchema
 )
@@ -18,7 +23,13 @@ from src.api.services.room_service import (
     update_room_full,
     delete_room
 )
-from src.api.services.booking_service import get_room_booked_ranges
+from src.api.services.booking_service import (
+    get_room_booked_ranges,
+    get_rooms_availability_matrix,
+    iter_rooms_booked_ranges
+)
+from src.api.services.availability_index import availability_index
+from src.api.services.room_catalog import room_catalog
 from src.api.services.amenity_service import (
     get_all_amenities,
     create_amenity,
@@ -29,7 +40,6 @@ from src.api.services.amenity_service import (
 from src.api.db import db
 from src.api.models.room_model import Room, RoomType, RoomStatus
 from src.api.auth import admin_required, token_required
-from src.api.models.booking_model import Booking, BookingStatus
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +53,11 @@ blp = Blueprint(
 
 @blp.route("/")
 class RoomList(MethodView):
-    @blp.response(200, RoomOutSchema(many=True), description="List of all rooms")
+    @blp.arguments(PageQuerySchema, location="query")
+    @blp.response(200, RoomPageSchema, description="Page of rooms ordered by id. With all=true the full list is returned as an array.")
+    @blp.alt_response(400, description="Invalid filter or cursor")
     @blp.alt_response(500, description="Internal server error")
-    def get(self):
+    def get(self, page_args):
         """Get rooms. If query params provided, apply server-side filtering.
         Query params (optional):
           - check_in: YYYY-MM-DD
@@ -54,6 +66,10 @@ class RoomList(MethodView):
           - min_price: float
           - max_price: float
           - guests: int
+          - limit, cursor: keyset pagination by room id
+          - all: true returns the full list as an array
+        Date filtering is applied to each page after it is fetched, so a page
+        may hold fewer than `limit` rooms while next_cursor is still set.
         """
         check_in_str = request.args.get("check_in")
         check_out_str = request.args.get("check_out")
@@ -63,8 +79,10 @@ class RoomList(MethodView):
         max_price = request.args.get("max_price", type=float)
         guests = request.args.get("guests", type=int)
 
-        if not any([check_in_str, check_out_str, room_type, min_price is not None, max_price is not None, guests]):
-            return get_all_rooms(db)
+        has_filters = any([check_in_str, check_out_str, room_type, min_price is not None, max_price is not None, guests])
+        if page_args["all"] and not has_filters:
+            # готові байти з кешу каталогу, без запиту до БД
+            return Response(room_catalog.list_body(db, get_all_rooms), mimetype="application/json")
 
         check_in_date = None
         check_out_date = None
@@ -93,18 +111,24 @@ class RoomList(MethodView):
         if guests:
             query = query.filter(Room.max_guest >= guests)
 
-        candidates = query.all()
+        next_cursor = None
+        if page_args["all"]:
+            candidates = query.all()
+        else:
+            try:
+                candidates, next_cursor = keyset_page(query, [Room.room_id], page_args["limit"], page_args["cursor"])
+            except ValueError as e:
+                abort(400, message=str(e))
 
         if check_in_date and check_out_date:
-            overlapping = db.query(Booking.room_id).filter(
-                Booking.status != BookingStatus.CANCELLED,
-                ~(((Booking.check_out_date <= check_in_date)) | ((Booking.check_in_date >= check_out_date)))
-            ).distinct().all()
-            occupied_room_ids = {rid for (rid,) in overlapping}
-            available = [room for room in candidates if room.room_id not in occupied_room_ids]
-            return available
+            free_room_ids = availability_index.free_room_ids(
+                db, [room.room_id for room in candidates], check_in_date, check_out_date
+            )
+            candidates = [room for room in candidates if room.room_id in free_room_ids]
 
-        return candidates
+        if page_args["all"]:
+            return jsonify(RoomOutSchema(many=True).dump(candidates))
+        return {"items": candidates, "next_cursor": next_cursor}
 
 
     @blp.arguments(RoomInSchema)
@@ -126,27 +150,33 @@ class RoomList(MethodView):
 @blp.route("/<int:room_id>")
 class RoomResource(MethodView):
 
-    @blp.response(200, RoomOutSchema, description="Room details retrieved successfully")
+    @blp.response(200, RoomOutSchema, description="Room details retrieved successfully. ETag carries the room version.")
     @blp.alt_response(404, description="Room not found")
     def get(self, room_id):
         """Get a single room by ID"""
-        room = get_room_by_id(db, room_id)
-        if not room:
+        cached = room_catalog.room(db, room_id, get_all_rooms)
+        if cached is None:
             abort(404, message=f"Room with ID {room_id} not found")
-        return room
+        body, etag = cached
+        return Response(body, mimetype="application/json", headers={"ETag": etag})
 
     @blp.arguments(RoomPatchSchema)
     @blp.response(200, RoomOutSchema, description="Room updated successfully")
     @blp.alt_response(400, description="Invalid room data")
     @blp.alt_response(404, description="Room not found")
     @blp.alt_response(409, description="Room number conflict")
+    @blp.alt_response(412, description="If-Match does not match the current room version")
     @token_required
     @admin_required
     def patch(self, patch_data, room_id):
         """Partially update room fields"""
         try:
-            room = update_room_partial(db, room_id, patch_data)
-            return room
+            expected_version = parse_if_match(request.headers.get("If-Match"))
+            room = update_room_partial(db, room_id, patch_data, expected_version=expected_version)
+            return room, {"ETag": make_etag(room.version)}
+        except VersionConflictError as e:
+            db.rollback()
+            abort(412, message=str(e))
         except ValueError as e:
             db.rollback()
             error_msg = str(e)
@@ -160,13 +190,18 @@ class RoomResource(MethodView):
     @blp.alt_response(404, description="Room not found")
     @blp.alt_response(400, description="Invalid room data")
     @blp.alt_response(409, description="Room number conflict")
+    @blp.alt_response(412, description="If-Match does not match the current room version")
     @token_required
     @admin_required
     def put(self, updated_room, room_id):
         """Replace a room completely"""
         try:
-            room = update_room_full(db, room_id, updated_room)
-            return room
+            expected_version = parse_if_match(request.headers.get("If-Match"))
+            room = update_room_full(db, room_id, updated_room, expected_version=expected_version)
+            return room, {"ETag": make_etag(room.version)}
+        except VersionConflictError as e:
+            db.rollback()
+            abort(412, message=str(e))
         except ValueError as e:
             db.rollback()
             error_msg = str(e)
@@ -231,6 +266,59 @@ class RoomAvailability(MethodView):
         }
 
 
+@blp.route("/calendar")
+class RoomsCalendar(MethodView):
+    @blp.alt_response(400, description="Invalid date window")
+    def get(self):
+        """Get booked date ranges of every room within [start, end).
+        Query params:
+          - start: YYYY-MM-DD (optional, default=today)
+          - end: YYYY-MM-DD (optional, default=start+30 days)
+        Streams {"start", "end", "rooms": [{"room_id", "room_number", "booked": [...]}]}
+        room by room from a single query.
+        """
+        start_str = request.args.get("start")
+        end_str = request.args.get("end")
+        try:
+            start_date = date.fromisoformat(start_str) if start_str else date.today()
+            end_date = date.fromisoformat(end_str) if end_str else (start_date + timedelta(days=30))
+        except ValueError:
+            abort(400, message="Invalid date format. Use YYYY-MM-DD")
+        if end_date <= start_date:
+            abort(400, message="'end' must be after 'start'")
+
+        def generate():
+            yield f'{{"start": "{start_date.isoformat()}", "end": "{end_date.isoformat()}", "rooms": ['
+            separator = ""
+            for room_id, room_number, booked in iter_rooms_booked_ranges(db, start_date, end_date):
+                yield separator + json.dumps(
+                    {"room_id": room_id, "room_number": room_number, "booked": booked},
+                    ensure_ascii=False
+                )
+                separator = ", "
+            yield "]}"
+
+        return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+@blp.route("/availability:batch")
+class RoomAvailabilityBatch(MethodView):
+    @blp.arguments(RoomAvailabilityBatchInSchema)
+    @blp.response(200, RoomAvailabilityBatchOutSchema, description="Availability matrix for the requested rooms and windows")
+    @blp.alt_response(422, description="Invalid room IDs or date windows")
+    def post(self, batch):
+        """Check many rooms against many candidate stays in one call.
+        Body: {"room_ids": [1, 2], "windows": [{"check_in": "YYYY-MM-DD", "check_out": "YYYY-MM-DD"}]}
+        Each room gets one availability flag per window, in request order.
+        """
+        rows, not_found = get_rooms_availability_matrix(db, batch["room_ids"], batch["windows"])
+        return {
+            "windows": batch["windows"],
+            "rooms": rows,
+            "not_found": not_found
+        }
+
+
 amenities_blp = Blueprint(
     "Amenities",
     "amenities",
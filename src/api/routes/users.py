@@ -1,10 +1,12 @@
 import logging
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
-from flask import request
-from src.api.schemas.user_schema import UserInSchema, UserOutSchema, UserPatchSchema
+from flask import request, jsonify
+from src.api.schemas.user_schema import UserInSchema, UserOutSchema, UserPatchSchema, UserPageSchema
+from src.api.schemas.pagination_schema import PageQuerySchema
 from src.api.services.user_service import (
     get_all_users,
+    get_users_page,
     create_user,
     get_user_by_id,
     update_user_partial,
@@ -26,16 +28,30 @@ blp = Blueprint(
 @blp.route("/")
 class UserList(MethodView):
 
-    @blp.response(200, UserOutSchema(many=True), description="List all users.")
-    def get(self):
-        """Get all users or search by role/last_name"""
+    @blp.arguments(PageQuerySchema, location="query")
+    @blp.response(200, UserPageSchema, description="Page of users ordered by id. With all=true the full list is returned as an array.")
+    @blp.alt_response(400, description="Invalid cursor")
+    def get(self, page_args):
+        """Get users or search by role/last_name (cursor-paginated)"""
         role = request.args.get('role', type=str)
         last_name = request.args.get('last_name', type=str)
+        role = role.strip() if role and role.strip() else None
+        last_name = last_name.strip() if last_name and last_name.strip() else None
 
-        if (role and role.strip()) or (last_name and last_name.strip()):
-            return search_users(db, role=role.strip() if role else None, last_name=last_name.strip() if last_name else None)
+        if page_args["all"]:
+            if role or last_name:
+                users = search_users(db, role=role, last_name=last_name)
+            else:
+                users = get_all_users(db)
+            return jsonify(UserOutSchema(many=True).dump(users))
 
-        return get_all_users(db)
+        try:
+            items, next_cursor = get_users_page(
+                db, page_args["limit"], page_args["cursor"], role=role, last_name=last_name
+            )
+        except ValueError as e:
+            abort(400, message=str(e))
+        return {"items": items, "next_cursor": next_cursor}
 
     @blp.arguments(UserInSchema)
     @blp.response(201, UserOutSchema, description="User created successfully.")
@@ -31,14 +31,29 @@ def update_bookings_status_job():
     logger.info(f"Starting booking status update job at {datetime.now()}")
     session = SessionLocal()
     try:
-        count = update_expired_bookings_status(session)
-        logger.info(f"Updated {count} expired bookings")
+        count, chunks = update_expired_bookings_status(session)
+        logger.info(f"Updated {count} expired bookings in {chunks} chunk(s)")
     except Exception as e:
         logger.error(f"Error updating bookings: {e}")
     finally:
         session.close()
 
 
+def prune_revoked_tokens_job():
+    """Задача для видалення відкликаних токенів, термін дії яких минув"""
+    from src.api.db import SessionLocal
+    from src.api.services.token_revocation import prune_expired_revocations
+
+    session = SessionLocal()
+    try:
+        count = prune_expired_revocations(session)
+        logger.info(f"Pruned {count} expired revoked tokens")
+    except Exception as e:
+        logger.error(f"Error pruning revoked tokens: {e}")
+    finally:
+        session.close()
+
+
 def init_scheduler():
     """
     Ініціалізація scheduler з усіма задачами
@@ -60,6 +75,14 @@ def init_scheduler():
         replace_existing=True
     )
 
+    scheduler.add_job(
+        prune_revoked_tokens_job,
+        trigger=CronTrigger(hour=3, minute=0),
+        id='prune_revoked_tokens',
+        name='Delete expired revoked tokens',
+        replace_existing=True
+    )
+
     scheduler.start()
     logger.info("Scheduler initialized and started")
 
@@ -13,13 +13,13 @@ class BookingOutSchema(Schema):
     class Meta:
         ordered = True
 
-    booking_code = fields.Str(required=True, metadata={"description": "Unique booking code", "example": "BK001ABC"})
+    booking_code = fields.Str(required=True, metadata={"description": "Unique booking code", "example": "BK0000000001Y"})
     user_id = fields.Int(allow_none=True, metadata={"description": "Registered user ID (null for guest)", "example": 1})
     room_id = fields.Int(required=True, metadata={"description": "Booked room ID", "example": 1})
     check_in_date = fields.Date(required=True, metadata={"description": "Check-in date", "example": "2025-10-15"})
     check_out_date = fields.Date(required=True, metadata={"description": "Check-out date", "example": "2025-10-18"})
     special_requests = fields.Str(allow_none=True, metadata={"description": "Guest's special requests", "example": "Late check-in"})
-    status = fields.Str(required=True, attribute="status.value", metadata={"description": "Booking status", "example": "ACTIVE"})
+    status = fields.Str(required=True, attribute="effective_status.value", metadata={"description": "Booking status", "example": "ACTIVE"})
     created_at = fields.DateTime(dump_only=True, metadata={"description": "Created at", "example": "2025-10-06T19:27:00Z"})
     updated_at = fields.DateTime(dump_only=True, metadata={"description": "Updated at", "example": "2025-10-07T10:15:00Z"})
 
@@ -72,6 +72,43 @@ class BookingInSchema(Schema):
                 raise ValidationError("Phone is required for guest bookings")
 
 
+class GroupBookingRoomSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+        ordered = True
+
+    room_id = fields.Int(required=True, validate=validate.Range(min=1),
+                         metadata={"description": "Room ID", "example": 1})
+    check_in_date = fields.Date(required=True, metadata={"description": "Check-in date", "example": "2025-10-15"})
+    check_out_date = fields.Date(required=True, metadata={"description": "Check-out date", "example": "2025-10-18"})
+    special_requests = fields.Str(allow_none=True, validate=validate.Length(max=1000),
+                                  metadata={"description": "Requests for this room only", "example": "Twin beds"})
+
+    @validates_schema
+    def validate_dates(self, data, **kwargs):
+        if data["check_out_date"] <= data["check_in_date"]:
+            raise ValidationError("Check-out date must be after check-in date")
+
+
+# for POST /bookings/group
+class GroupBookingInSchema(BookingInSchema):
+    class Meta:
+        unknown = EXCLUDE
+        ordered = True
+        # кімнати й дати задаються для кожного елемента rooms
+        exclude = ("room_id", "check_in_date", "check_out_date")
+
+    rooms = fields.List(fields.Nested(GroupBookingRoomSchema), required=True, validate=validate.Length(min=1, max=50),
+                        metadata={"description": "Rooms and dates to book (1-50), all or nothing"})
+
+
+class GroupBookingOutSchema(Schema):
+    class Meta:
+        ordered = True
+
+    bookings = fields.List(fields.Nested(BookingOutSchema), required=True)
+
+
 # for PATCH (partial update)
 class BookingPatchSchema(Schema):
     class Meta:
@@ -83,3 +120,11 @@ class BookingPatchSchema(Schema):
     check_out_date = fields.Date(metadata={"description": "New check-out date", "example": "2025-10-19"})
     special_requests = fields.Str(validate=validate.Length(max=1000), metadata={"description": "Updated requests", "example": "Late checkout"})
     status = fields.Str(validate=validate.OneOf([s.value for s in BookingStatus]), metadata={"description": "Booking status", "example": "CANCELLED"})
+
+
+class BookingPageSchema(Schema):
+    class Meta:
+        ordered = True
+
+    items = fields.List(fields.Nested(BookingOutSchema), required=True)
+    next_cursor = fields.Str(allow_none=True, metadata={"description": "Cursor for the next page, null on the last page"})
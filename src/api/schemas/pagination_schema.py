@@ -0,0 +1,17 @@
+from marshmallow import Schema, fields, validate, EXCLUDE
+from src.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+# query string for keyset-paginated list endpoints
+class PageQuerySchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+        ordered = True
+
+    limit = fields.Int(load_default=DEFAULT_PAGE_SIZE, validate=validate.Range(min=1, max=MAX_PAGE_SIZE),
+                       metadata={"description": f"Page size (1-{MAX_PAGE_SIZE})", "example": DEFAULT_PAGE_SIZE})
+    cursor = fields.Str(load_default=None, allow_none=True,
+                        metadata={"description": "Opaque cursor from the previous page's next_cursor"})
+    all = fields.Bool(load_default=False,
+                      metadata={"description": "Return the full unpaginated list as a JSON array (legacy)",
+                                "example": False})
@@ -66,3 +66,9 @@ class ReviewPatchSchema(Schema):
         validate=validate.Length(max=1000)
     )
     room_id = fields.Integer(required=False, allow_none=True)
+
+
+class ReviewPageSchema(Schema):
+    """Schema for a page of reviews"""
+    items = fields.List(fields.Nested(ReviewOutSchema), required=True)
+    next_cursor = fields.String(allow_none=True)
@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, validate, EXCLUDE
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError, EXCLUDE
 from enum import Enum
 
 
@@ -66,3 +66,59 @@ class RoomPatchSchema(Schema):
     size_sqm = fields.Decimal(as_string=True, validate=validate.Range(min=10, max=500), metadata={"description": "Room size (m²)", "example": "25.0"})
     main_photo_url = fields.Str(validate=validate.URL(), metadata={"description": "Main photo URL", "example": "https://example.com/rooms/101-main.jpg"})
     photo_urls = fields.List(fields.Str(validate=validate.URL()), metadata={"description": "Photo URLs list", "example": ["https://example.com/rooms/101-1.jpg"]})
+
+
+# for batch availability (many rooms x many date windows)
+class AvailabilityWindowSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+        ordered = True
+
+    check_in = fields.Date(required=True, metadata={"description": "Window start (inclusive)", "example": "2025-12-01"})
+    check_out = fields.Date(required=True, metadata={"description": "Window end (exclusive)", "example": "2025-12-04"})
+
+    @validates_schema
+    def validate_window(self, data, **kwargs):
+        if data["check_out"] <= data["check_in"]:
+            raise ValidationError("'check_out' must be after 'check_in'")
+
+
+class RoomAvailabilityBatchInSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+        ordered = True
+
+    room_ids = fields.List(fields.Int(validate=validate.Range(min=1)), required=True,
+                           validate=validate.Length(min=1, max=500),
+                           metadata={"description": "Rooms to check (max 500)", "example": [1, 2, 3]})
+    windows = fields.List(fields.Nested(AvailabilityWindowSchema), required=True,
+                          validate=validate.Length(min=1, max=50),
+                          metadata={"description": "Candidate stays (max 50)"})
+
+
+class RoomAvailabilityRowSchema(Schema):
+    class Meta:
+        ordered = True
+
+    room_id = fields.Int(required=True)
+    available = fields.List(fields.Bool(), required=True,
+                            metadata={"description": "One flag per requested window, in request order",
+                                      "example": [True, False]})
+
+
+class RoomAvailabilityBatchOutSchema(Schema):
+    class Meta:
+        ordered = True
+
+    windows = fields.List(fields.Nested(AvailabilityWindowSchema), required=True)
+    rooms = fields.List(fields.Nested(RoomAvailabilityRowSchema), required=True)
+    not_found = fields.List(fields.Int(), required=True,
+                            metadata={"description": "Requested room IDs that do not exist", "example": []})
+
+
+class RoomPageSchema(Schema):
+    class Meta:
+        ordered = True
+
+    items = fields.List(fields.Nested(RoomOutSchema), required=True)
+    next_cursor = fields.Str(allow_none=True, metadata={"description": "Cursor for the next page, null on the last page"})
@@ -44,3 +44,11 @@ class UserPatchSchema(Schema):
     password = fields.Str(load_only=True, validate=validate.Length(min=8), metadata={"description": "Password (min 8 chars). Will not be returned in responses.", "example": "strongP@ssw0rd"})
     phone = fields.Str(validate=validate.Regexp(r'^\+?[\d\s\-\(\)]+$'), metadata={"description": "Phone number", "example": "+380501234567"})
     role = fields.Str(attribute="role.value", validate=validate.OneOf([r.value for r in UserRole]), metadata={"description": "User role", "example": "GUEST"})
+
+
+class UserPageSchema(Schema):
+    class Meta:
+        ordered = True
+
+    items = fields.List(fields.Nested(UserOutSchema), required=True)
+    next_cursor = fields.Str(allow_none=True, metadata={"description": "Cursor for the next page, null on the last page"})
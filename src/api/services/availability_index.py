@@ -0,0 +1,275 @@
+"""
+In-memory per-room interval index of booked stays.
+
+For every room the index keeps its non-cancelled bookings sorted by check-in
+date together with a running maximum of check-out dates, so "is the room free
+for [check_in, check_out)" is a single binary search instead of a query over
+the bookings table.
+
+Only stays that have not ended yet are held (check-out today or later), so the
+index is as large as the hotel's forward book, not its whole history. It is
+rebuilt when the date changes, which drops the stays that ended. Windows that
+start before the rebuild date are answered by a query instead.
+
+The index follows the database through SQLAlchemy session events: booking rows
+flushed by a session are applied when that session commits and dropped when it
+rolls back, and so are rows of bulk ``insert(Booking)`` executions. Bulk
+UPDATE/DELETE statements on bookings mark the index stale, and it is rebuilt
+from the database on next use.
+
+Bookings committed by other processes (or by raw SQL) are not seen by those
+events. The index is rebuilt when it is older than ``max_age`` seconds
+(``AVAILABILITY_INDEX_MAX_AGE``, default 5), so a room booked by another
+worker drops out of this worker's search results within that bound. Search is
+advisory: booking itself is guarded by the overlap exclusion constraint.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import chain
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.api.models.booking_model import Booking, BookingStatus
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "availability_index_pending"
+_STALE_KEY = "availability_index_stale"
+
+
+def _is_cancelled(status):
+    return getattr(status, "value", status) == BookingStatus.CANCELLED.value
+
+
+class _RoomIntervals:
+    """Sorted [start, end) intervals of one room with prefix maximum of ends."""
+
+    __slots__ = ("starts", "entries", "max_ends")
+
+    def __init__(self):
+        self.starts = []
+        self.entries = []
+        self.max_ends = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, start, end, booking_code):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.entries.insert(i, (start, end, booking_code))
+        self._refresh_max_ends(i)
+
+    def remove(self, start, booking_code):
+        i = bisect_left(self.starts, start)
+        while i < len(self.entries) and self.starts[i] == start:
+            if self.entries[i][2] == booking_code:
+                del self.starts[i]
+                del self.entries[i]
+                self._refresh_max_ends(i)
+                return True
+            i += 1
+        return False
+
+    def overlaps(self, check_in, check_out):
+        # Інтервали з початком < check_out лежать у [0, i); перекриття є,
+        # якщо хоча б один з них закінчується після check_in.
+        i = bisect_left(self.starts, check_out)
+        return i > 0 and self.max_ends[i - 1] > check_in
+
+    def _refresh_max_ends(self, i):
+        running = self.max_ends[i - 1] if i else None
+        tail = []
+        for _, end, _ in self.entries[i:]:
+            if running is None or end > running:
+                running = end
+            tail.append(running)
+        self.max_ends[i:] = tail
+
+
+class AvailabilityIndex:
+    """Per-process availability index for date-filtered room search."""
+
+    def __init__(self, max_age=None):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._rooms = {}
+        self._bookings = {}
+        self._stale = True
+        self._built_at = None
+        # дата перебудови: індекс тримає лише проживання з виїздом не раніше неї
+        self._since = None
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def is_stale(self):
+        with self._lock:
+            if self._stale or self._built_at is None:
+                return True
+            if self._since is not None and self._since < date.today():
+                return True
+            return self.max_age is not None and time.monotonic() - self._built_at > self.max_age
+
+    def rebuild(self, session):
+        """Reload non-cancelled bookings that have not ended yet from the database."""
+        # Лок тримається під час запиту: коміти інших потоків, що завершились
+        # після знімка, застосуються поверх нового індексу, а не загубляться.
+        with self._lock:
+            since = date.today()
+            try:
+                rows = session.query(
+                    Booking.booking_code,
+                    Booking.room_id,
+                    Booking.check_in_date,
+                    Booking.check_out_date
+                ).filter(
+                    Booking.status != BookingStatus.CANCELLED,
+                    Booking.check_out_date >= since
+                ).all()
+            except SQLAlchemyError as e:
+                logger.error(f"Database error rebuilding availability index: {e}")
+                raise Exception(f"Database error: {e}")
+
+            self._rooms = {}
+            self._bookings = {}
+            for booking_code, room_id, check_in, check_out in rows:
+                self._add(booking_code, room_id, check_in, check_out)
+            self._stale = False
+            self._built_at = time.monotonic()
+            self._since = since
+            logger.info(f"Availability index rebuilt: {len(rows)} bookings in {len(self._rooms)} rooms")
+            return len(rows)
+
+    def ensure_fresh(self, session):
+        if self.is_stale():
+            self.rebuild(session)
+
+    def apply(self, booking_code, room_id, check_in, check_out, status):
+        """Upsert a booking into the index, or drop it if it is cancelled."""
+        with self._lock:
+            self._remove(booking_code)
+            if _is_cancelled(status) or room_id is None or not (check_in and check_out):
+                return
+            if self._since is not None and check_out < self._since:
+                # проживання вже закінчилось - індекс його не тримає
+                return
+            self._add(booking_code, room_id, check_in, check_out)
+
+    def remove(self, booking_code):
+        with self._lock:
+            self._remove(booking_code)
+
+    def is_free(self, session, room_id, check_in, check_out):
+        return room_id in self.free_room_ids(session, [room_id], check_in, check_out)
+
+    def free_room_ids(self, session, room_ids, check_in, check_out):
+        """Return the subset of room_ids with no booking overlapping [check_in, check_out)."""
+        self.ensure_fresh(session)
+        with self._lock:
+            if self._since is not None and check_in < self._since:
+                return self._free_from_db(session, room_ids, check_in, check_out)
+            free = set()
+            for room_id in room_ids:
+                intervals = self._rooms.get(room_id)
+                if intervals is None or not intervals.overlaps(check_in, check_out):
+                    free.add(room_id)
+            return free
+
+    def _free_from_db(self, session, room_ids, check_in, check_out):
+        # вікна в минулому: завершених проживань в індексі немає
+        try:
+            booked = session.query(Booking.room_id).filter(
+                Booking.room_id.in_(room_ids),
+                Booking.status != BookingStatus.CANCELLED,
+                Booking.check_in_date < check_out,
+                Booking.check_out_date > check_in
+            ).distinct().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error checking availability: {e}")
+            raise Exception(f"Database error: {e}")
+        return set(room_ids) - {room_id for room_id, in booked}
+
+    def _add(self, booking_code, room_id, check_in, check_out):
+        intervals = self._rooms.get(room_id)
+        if intervals is None:
+            intervals = self._rooms[room_id] = _RoomIntervals()
+        intervals.add(check_in, check_out, booking_code)
+        self._bookings[booking_code] = (room_id, check_in)
+
+    def _remove(self, booking_code):
+        entry = self._bookings.pop(booking_code, None)
+        if entry is None:
+            return
+        room_id, check_in = entry
+        intervals = self._rooms.get(room_id)
+        if intervals is not None:
+            intervals.remove(check_in, booking_code)
+            if not intervals:
+                del self._rooms[room_id]
+
+
+availability_index = AvailabilityIndex(
+    max_age=float(os.getenv('AVAILABILITY_INDEX_MAX_AGE', '5'))
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_booking_changes(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Booking) and obj.booking_code:
+            pending[obj.booking_code] = (obj.room_id, obj.check_in_date, obj.check_out_date, obj.status)
+    for obj in session.deleted:
+        if isinstance(obj, Booking) and obj.booking_code:
+            pending[obj.booking_code] = None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_booking_writes(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if not any(mapper.class_ is Booking for mapper in orm_execute_state.all_mappers):
+        return
+    session = orm_execute_state.session
+    params = orm_execute_state.parameters
+    if orm_execute_state.is_insert and params:
+        # session.execute(insert(Booking), [rows]) - рядки відомі, перебудова не потрібна
+        rows = params if isinstance(params, list) else [params]
+        if all(row.get("booking_code") for row in rows):
+            pending = session.info.setdefault(_PENDING_KEY, {})
+            for row in rows:
+                pending[row["booking_code"]] = (
+                    row.get("room_id"), row.get("check_in_date"), row.get("check_out_date"),
+                    row.get("status", BookingStatus.ACTIVE)
+                )
+            return
+    session.info[_STALE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_booking_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_STALE_KEY, False):
+        availability_index.invalidate()
+        return
+    if not pending:
+        return
+    for booking_code, values in pending.items():
+        if values is None:
+            availability_index.remove(booking_code)
+        else:
+            availability_index.apply(booking_code, *values)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_booking_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_STALE_KEY, None)
@@ -0,0 +1,107 @@
+"""
+Booking code generation.
+
+A code is ``BK`` + the booking number as 10 Crockford base32 digits + one
+Luhn mod 32 check digit, e.g. ``BK0000000001Y``. The check digit catches
+single-character typos and most adjacent transpositions.
+
+Numbers come from the ``booking_code_seq`` database sequence using the hi/lo
+scheme: one ``nextval()`` reserves a block of ``BOOKING_CODE_BLOCK_SIZE``
+numbers for this process, and codes within the block are issued from memory.
+Sequence values are never handed out twice, so codes cannot collide between
+threads, workers or hosts. Blocks are reserved in increasing order and the
+encoding is fixed-width, so new codes sort after older ones and inserts land at
+the right edge of the ``bookings`` primary key index.
+"""
+import threading
+
+from sqlalchemy import select
+
+from src.api.models.booking_model import booking_code_seq, BOOKING_CODE_BLOCK_SIZE
+
+CODE_PREFIX = "BK"
+CODE_WIDTH = 10
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_BASE = len(ALPHABET)
+_DIGIT_VALUES = {ch: i for i, ch in enumerate(ALPHABET)}
+_MAX_NUMBER = _BASE ** CODE_WIDTH - 1
+
+
+def _luhn_check_digit(values):
+    """Luhn mod 32 check digit for a sequence of digit values (most significant first)."""
+    total = 0
+    factor = 2
+    for value in reversed(values):
+        addend = factor * value
+        total += addend // _BASE + addend % _BASE
+        factor = 3 - factor
+    return (_BASE - total % _BASE) % _BASE
+
+
+def encode_booking_code(number):
+    if not 0 <= number <= _MAX_NUMBER:
+        raise ValueError(f"Booking number out of range: {number}")
+    values = [0] * CODE_WIDTH
+    for i in range(CODE_WIDTH - 1, -1, -1):
+        number, values[i] = divmod(number, _BASE)
+    check = _luhn_check_digit(values)
+    return CODE_PREFIX + "".join(ALPHABET[v] for v in values) + ALPHABET[check]
+
+
+def decode_booking_code(code):
+    """Return the booking number of a code, or raise ValueError if it is malformed."""
+    code = code.strip().upper()
+    if not code.startswith(CODE_PREFIX) or len(code) != len(CODE_PREFIX) + CODE_WIDTH + 1:
+        raise ValueError("Invalid booking code")
+    try:
+        values = [_DIGIT_VALUES[ch] for ch in code[len(CODE_PREFIX):]]
+    except KeyError:
+        raise ValueError("Invalid booking code")
+    if _luhn_check_digit(values[:-1]) != values[-1]:
+        raise ValueError("Invalid booking code checksum")
+    number = 0
+    for value in values[:-1]:
+        number = number * _BASE + value
+    return number
+
+
+def is_valid_booking_code(code):
+    try:
+        decode_booking_code(code)
+        return True
+    except ValueError:
+        return False
+
+
+def _reserve_block_from_sequence(session):
+    return session.execute(select(booking_code_seq.next_value())).scalar_one()
+
+
+class BookingCodeGenerator:
+    """Thread-safe hi/lo allocator of booking codes.
+
+    reserve_block(session) must return the first number of a fresh block of
+    block_size numbers that no other caller will ever receive.
+    """
+
+    def __init__(self, reserve_block=_reserve_block_from_sequence, block_size=BOOKING_CODE_BLOCK_SIZE):
+        self.reserve_block = reserve_block
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def next_number(self, session=None):
+        with self._lock:
+            if self._next >= self._end:
+                start = self.reserve_block(session)
+                self._next, self._end = start, start + self.block_size
+            number = self._next
+            self._next += 1
+            return number
+
+    def next_code(self, session=None):
+        return encode_booking_code(self.next_number(session))
+
+
+booking_code_generator = BookingCodeGenerator()
@@ -1,21 +1,34 @@
-from src.api.services.notification_service import notification_service
-from src.api.models.booking_model import Booking, BookingStatus
+from src.api.services.notification_service import NotificationType
+from src.api.services.outbox import enqueue_notification
+from src.api.models.booking_model import Booking, BookingStatus, BOOKING_OVERLAP_CONSTRAINT
 from src.api.models.room_model import Room, RoomStatus
 from src.api.models.user_model import User, UserRole
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from sqlalchemy import or_, not_
+from sqlalchemy import or_, not_, and_, true, func, values, column, select, update, insert, Integer, Date
 from datetime import datetime, date, timedelta, timezone
+from itertools import groupby
+from src.api.pagination import keyset_page
+from src.api.versioning import VersionConflictError, check_version
+from sqlalchemy.orm.exc import StaleDataError
+from src.api.services.booking_codes import booking_code_generator
+from src.api.services.lock_manager import lock_booking_dates, lock_room_dates
+from src.api.services.tx_retry import begin_serializable, retry_on_serialization_failure
 import logging
-import time
-import secrets
+import os
 
 logger = logging.getLogger(__name__)
 
+# Як одиночні бронювання (створення, зміна дат чи кімнати) захищаються від конкурентних
+# бронювань тієї ж кімнати:
+#   "constraint"   - лише exclusion constraint, вставки однієї кімнати не чекають одна одну
+#   "lock"         - advisory-лок (кімната, тиждень) + exclusion constraint
+#   "serializable" - транзакція SERIALIZABLE з повтором при serialization failure
+# Групове бронювання завжди бере advisory-локи всіх своїх кімнат.
+BOOKING_CONCURRENCY_MODE = os.getenv('BOOKING_CONCURRENCY_MODE', 'constraint').lower()
 
-def generate_booking_code():
-    timestamp = int(time.time() * 1000) % 1000000
-    random_part = secrets.randbelow(90000) + 10000
-    return f"BK{timestamp}{random_part}"
+
+def generate_booking_code(session):
+    return booking_code_generator.next_code(session)
 
 
 def _validate_dates(check_in, check_out):
@@ -53,6 +66,24 @@ def _resolve_user(session, user_id, email, data):
     raise ValueError("Either user_id or email must be provided")
 
 
+def _is_overlap_violation(error):
+    """True if an IntegrityError comes from the bookings date-range exclusion constraint."""
+    return BOOKING_OVERLAP_CONSTRAINT in str(getattr(error, 'orig', error))
+
+
+def _flush_booking_changes(session):
+    try:
+        session.flush()
+    except StaleDataError:
+        session.rollback()
+        raise VersionConflictError("Booking was modified by another request")
+    except IntegrityError as e:
+        session.rollback()
+        if _is_overlap_violation(e):
+            raise ValueError("Room is already booked")
+        raise
+
+
 def _get_room_or_error(session, room_id):
     try:
         room = session.query(Room).get(room_id)
@@ -65,7 +96,7 @@ def _get_room_or_error(session, room_id):
 
 def check_room_availability(session, room_id, check_in, check_out, exclude_booking_code=None):
     try:
-        room = session.query(Room).with_for_update().get(room_id)
+        room = session.query(Room).get(room_id)
         if not room or room.status != RoomStatus.AVAILABLE:
             raise ValueError(f"Room with ID {room_id} is not available")
 
@@ -101,42 +132,76 @@ def calculate_total_price(session, room_id, check_in, check_out):
         logger.error(f"Error calculating total price: {e}")
         raise
 
-def update_expired_bookings_status(session):
-    """Автоматично оновлює статус бронювань на COMPLETED після check_out_date"""
+def update_expired_bookings_status(session, chunk_size=1000):
+    """Автоматично оновлює статус бронювань на COMPLETED після check_out_date.
+
+    Працює set-based: кожен крок - один UPDATE ... RETURNING щонайбільше для
+    chunk_size рядків (уже заблоковані рядки пропускаються) з комітом після
+    кожного кроку, тож пам'ять не залежить від кількості застарілих бронювань.
+    Повертає (кількість оновлених бронювань, кількість порцій з оновленнями).
+    """
+    today = date.today()
+    total = 0
+    chunks = 0
     try:
-        today = date.today()
-        expired_bookings = session.query(Booking).filter(
-            Booking.status == BookingStatus.ACTIVE,
-            Booking.check_out_date < today
-        ).all()
-        
-        count = 0
-        for booking in expired_bookings:
-            booking.status = BookingStatus.COMPLETED
-            booking.updated_at = datetime.now(timezone.utc)
-            count += 1
-        
-        if count > 0:
+        while True:
+            # найстаріші спершу: порядок дає частковий індекс ix_bookings_active_check_out
+            expired_chunk = select(Booking.booking_code).where(
+                Booking.status == BookingStatus.ACTIVE,
+                Booking.check_out_date < today
+            ).order_by(Booking.check_out_date).limit(chunk_size).with_for_update(skip_locked=True).scalar_subquery()
+
+            updated = session.execute(
+                update(Booking)
+                .where(Booking.booking_code.in_(expired_chunk))
+                .values(
+                    status=BookingStatus.COMPLETED,
+                    updated_at=datetime.now(timezone.utc),
+                    version=Booking.version + 1
+                )
+                .returning(Booking.booking_code),
+                execution_options={"synchronize_session": False}
+            ).scalars().all()
             session.commit()
-            logger.info(f"Updated {count} expired bookings to COMPLETED status")
-        
-        return count
+
+            if not updated:
+                break
+            total += len(updated)
+            chunks += 1
+            if len(updated) < chunk_size:
+                break
+
+        if total > 0:
+            logger.info(f"Updated {total} expired bookings to COMPLETED status in {chunks} chunk(s)")
+
+        return total, chunks
     except SQLAlchemyError as e:
         session.rollback()
-        logger.error(f"Error updating expired bookings: {e}")
+        logger.error(f"Error updating expired bookings after {total} rows in {chunks} chunk(s): {e}")
         raise Exception(f"Database error: {e}")
 
 def get_all_bookings(session):
     try:
-        # Автоматично оновлюємо статус застарілих бронювань
-        update_expired_bookings_status(session)
-        
+        # Статус застарілих бронювань не оновлюється тут: читання лишається чистим
+        # SELECT, а COMPLETED відображає Booking.effective_status
         bookings = session.query(Booking).all()
         return bookings
     except SQLAlchemyError as e:
         logger.error(f"Database error fetching bookings: {e}")
         raise Exception(f"Database error: {e}")
 
+def get_bookings_page(session, limit, cursor=None):
+    """One keyset page of bookings, newest first. Returns (bookings, next_cursor)."""
+    try:
+        return keyset_page(
+            session.query(Booking),
+            [Booking.created_at, Booking.booking_code],
+            limit, cursor, descending=True
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Database error fetching bookings page: {e}")
+        raise Exception(f"Database error: {e}")
+
 def get_booking_by_code(session, booking_code):
     try:
         booking = session.query(Booking).get(booking_code)
@@ -147,9 +212,6 @@ def get_booking_by_code(session, booking_code):
 
 def get_user_bookings(session, user_id):
     try:
-        # Автоматично оновлюємо статус застарілих бронювань
-        update_expired_bookings_status(session)
-        
         bookings = session.query(Booking).filter_by(user_id=user_id).all()
         return bookings
     except SQLAlchemyError as e:
@@ -157,39 +219,48 @@ def get_user_bookings(session, user_id):
         raise Exception(f"Database error: {e}")
 
 def create_booking(session, data):
+    if BOOKING_CONCURRENCY_MODE == "serializable":
+        return _create_booking_serializable(session, data)
+    return _create_booking(session, data)
+
+
+@retry_on_serialization_failure()
+def _create_booking_serializable(session, data):
+    begin_serializable(session)
+    return _create_booking(session, data, serializable=True)
+
+
+def _create_booking(session, data, serializable=False):
     try:
         check_in = data.get('check_in_date')
         check_out = data.get('check_out_date')
         _validate_dates(check_in, check_out)
 
         room_id = data.get('room_id')
-        
-        # БЛОКУЄМО КІМНАТУ
-        room = session.query(Room).with_for_update().get(room_id)
+
+        room = session.query(Room).get(room_id)
         if not room:
             raise ValueError("Room not found")
         if room.status != RoomStatus.AVAILABLE:
             raise ValueError("Room is not available")
 
-        # Перевіряємо перекриття
-        overlapping = session.query(Booking).filter(
-            Booking.room_id == room_id,
-            Booking.status == BookingStatus.ACTIVE,
-            not_(or_(
-                check_out <= Booking.check_in_date,
-                check_in >= Booking.check_out_date
-            ))
-        ).count()
-        
-        if overlapping > 0:
-            raise ValueError("Room is already booked")
-
+        # Перекриття з іншими ACTIVE бронюваннями відхиляє exclusion constraint
+        # на bookings.stay_period під час INSERT, без блокування кімнати.
         user_id = _resolve_user(session, data.get('user_id'), data.get('email'), data)
         
         if not user_id:
             raise ValueError("Could not resolve user ID for booking.")
 
-        booking_code = generate_booking_code()
+        if serializable:
+            # Читання перекриттів стає частиною SSI-залежностей: конкурентна
+            # вставка в той самий проміжок закінчиться serialization failure і повтором
+            available, message = check_room_availability(session, room_id, check_in, check_out)
+            if not available:
+                raise ValueError(message)
+        elif BOOKING_CONCURRENCY_MODE == "lock":
+            # Advisory-лок (кімната, тиждень) береться лише перед самою вставкою
+            lock_room_dates(session, room_id, check_in, check_out)
+        booking_code = generate_booking_code(session)
 
         new_booking = Booking(
             booking_code=booking_code,
@@ -204,37 +275,29 @@ def create_booking(session, data):
         )
 
         session.add(new_booking)
-        session.commit()
-
-        try:
-            user = session.query(User).get(user_id)
-            if user:
-                nights = (check_out - check_in).days
-                total_price = float(room.base_price) * nights
 
-                booking_data = {
-                    'guest_name': f"{user.first_name} {user.last_name}",
-                    'booking_code': booking_code,
-                    'room_number': room.room_number,
-                    'check_in_date': check_in.strftime('%d.%m.%Y'),
-                    'check_out_date': check_out.strftime('%d.%m.%Y'),
-                    'nights': nights,
-                    'total_price': f"{total_price:.2f}"
-                }
+        # Лист відправить outbox worker після коміту - SMTP не тримає HTTP-запит
+        user = session.query(User).get(user_id)
+        nights = (check_out - check_in).days
+        enqueue_notification(session, NotificationType.BOOKING_CREATED, user.email, user.phone, {
+            'guest_name': f"{user.first_name} {user.last_name}",
+            'booking_code': booking_code,
+            'room_number': room.room_number,
+            'check_in_date': check_in.strftime('%d.%m.%Y'),
+            'check_out_date': check_out.strftime('%d.%m.%Y'),
+            'nights': nights,
+            'total_price': f"{float(room.base_price) * nights:.2f}"
+        })
+        session.commit()
 
-                if notification_service.notify_booking_created(user.email, user.phone, booking_data):
-                    logger.info(f"Email sent for {booking_code}")
-                else:
-                    logger.error(f"Email FAILED for {booking_code}")
-        except Exception as e:
-            logger.error(f"Email failed: {e}")
-        
         return new_booking
 
     except IntegrityError as e:
         session.rollback()  
         logger.error(f"Integrity error creating booking: {e}")
-        if "email" in str(e).lower():
+        if _is_overlap_violation(e):
+            raise ValueError("Room is already booked")
+        elif "email" in str(e).lower():
             raise ValueError("This email is already registered.")
         elif "booking_code" in str(e).lower():
             raise ValueError("System error - please try again")
@@ -245,13 +308,138 @@ def create_booking(session, data):
         logger.error(f"Error creating booking: {e}")
         raise
 
-def update_booking_partial(session, booking_code, data):
+
+def _find_conflicting_stays(session, stays):
+    """Indexes of stays that overlap an ACTIVE booking, answered by one VALUES join."""
+    stay_rows = values(
+        column('idx', Integer),
+        column('room_id', Integer),
+        column('check_in', Date),
+        column('check_out', Date),
+        name='stays'
+    ).data([(i, s['room_id'], s['check_in_date'], s['check_out_date']) for i, s in enumerate(stays)])
+
+    rows = session.query(stay_rows.c.idx).select_from(stay_rows).join(
+        Booking,
+        and_(
+            Booking.room_id == stay_rows.c.room_id,
+            Booking.status == BookingStatus.ACTIVE,
+            Booking.check_in_date < stay_rows.c.check_out,
+            Booking.check_out_date > stay_rows.c.check_in
+        )
+    ).distinct().all()
+    return sorted(idx for idx, in rows)
+
+
+def create_group_booking(session, data):
+    """Book several rooms for one guest, all or nothing.
+
+    data holds the guest fields accepted by create_booking plus "rooms": a list
+    of {"room_id", "check_in_date", "check_out_date", "special_requests"?}.
+    The (room, week) advisory locks of all stays are taken in sorted order so
+    concurrent group bookings cannot deadlock, every stay is checked against existing bookings in one query, the
+    bookings are written with one multi-row INSERT and one commit together with
+    a single summary email in the outbox. Returns the created bookings in request order.
+    """
+    stays = data.get('rooms') or []
+    if not stays:
+        raise ValueError("At least one room is required")
+
+    try:
+        for stay in stays:
+            _validate_dates(stay['check_in_date'], stay['check_out_date'])
+
+        # Перекриття всередині самого запиту (та сама кімната двічі на ті самі дати)
+        by_room = sorted(stays, key=lambda s: (s['room_id'], s['check_in_date']))
+        for prev, cur in zip(by_room, by_room[1:]):
+            if prev['room_id'] == cur['room_id'] and cur['check_in_date'] < prev['check_out_date']:
+                raise ValueError(f"Room {cur['room_id']} is requested twice for overlapping dates")
+
+        room_ids = sorted({s['room_id'] for s in stays})
+        rooms = {room.room_id: room for room in session.query(Room).filter(Room.room_id.in_(room_ids)).all()}
+        missing = [room_id for room_id in room_ids if room_id not in rooms]
+        if missing:
+            raise ValueError(f"Room not found: {', '.join(map(str, missing))}")
+        unavailable = [room_id for room_id in room_ids if rooms[room_id].status != RoomStatus.AVAILABLE]
+        if unavailable:
+            raise ValueError(f"Room is not available: {', '.join(map(str, unavailable))}")
+
+        lock_booking_dates(session, [(s['room_id'], s['check_in_date'], s['check_out_date']) for s in stays])
+        conflicts = _find_conflicting_stays(session, stays)
+        if conflicts:
+            rooms_taken = sorted({stays[i]['room_id'] for i in conflicts})
+            raise ValueError(f"Room is already booked: {', '.join(map(str, rooms_taken))}")
+
+        user_id = _resolve_user(session, data.get('user_id'), data.get('email'), data)
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                'booking_code': generate_booking_code(session),
+                'user_id': user_id,
+                'room_id': stay['room_id'],
+                'check_in_date': stay['check_in_date'],
+                'check_out_date': stay['check_out_date'],
+                'special_requests': stay.get('special_requests') or data.get('special_requests'),
+                'status': BookingStatus.ACTIVE,
+                'created_at': now,
+                'updated_at': now
+            }
+            for stay in stays
+        ]
+        # Вставка в порядку (room_id, check_in), як і блокування - без взаємних очікувань по колу
+        insert_order = sorted(rows, key=lambda r: (r['room_id'], r['check_in_date']))
+        session.execute(insert(Booking), insert_order)
+
+        user = session.query(User).get(user_id)
+        items = []
+        for row in rows:
+            room = rooms[row['room_id']]
+            nights = (row['check_out_date'] - row['check_in_date']).days
+            items.append({
+                'booking_code': row['booking_code'],
+                'room_number': room.room_number,
+                'check_in_date': row['check_in_date'].strftime('%d.%m.%Y'),
+                'check_out_date': row['check_out_date'].strftime('%d.%m.%Y'),
+                'nights': nights,
+                'total_price': f"{float(room.base_price) * nights:.2f}"
+            })
+        enqueue_notification(session, NotificationType.GROUP_BOOKING_CREATED, user.email, user.phone, {
+            'guest_name': f"{user.first_name} {user.last_name}",
+            'bookings': items,
+            'total_price': f"{sum(float(i['total_price']) for i in items):.2f}"
+        })
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        logger.error(f"Integrity error creating group booking: {e}")
+        if _is_overlap_violation(e):
+            raise ValueError("Room is already booked")
+        elif "email" in str(e).lower():
+            raise ValueError("This email is already registered.")
+        raise ValueError("Database error - please try again")
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error(f"Database error creating group booking: {e}")
+        raise Exception(f"Database error: {e}")
+    except Exception:
+        session.rollback()
+        raise
+
+    codes = [row['booking_code'] for row in rows]
+    created = {b.booking_code: b for b in session.query(Booking).filter(Booking.booking_code.in_(codes)).all()}
+    bookings = [created[code] for code in codes]
+
+    return bookings
+
+def update_booking_partial(session, booking_code, data, expected_version=None):
     try:
         booking = session.query(Booking).get(booking_code)
         if not booking:
             raise ValueError(f"Booking with ID {booking_code} not found")
+        check_version(booking, expected_version)
 
-        if booking.status in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
+        if booking.effective_status in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
             allowed_fields = {'status'}
             if set(data.keys()) - allowed_fields:
                 raise ValueError("Can only change status for completed/cancelled bookings")
@@ -261,6 +449,8 @@ def update_booking_partial(session, booking_code, data):
         room_id = data.get('room_id', booking.room_id)
 
         if 'check_in_date' in data or 'check_out_date' in data or 'room_id' in data:
+            if BOOKING_CONCURRENCY_MODE == "lock":
+                lock_room_dates(session, room_id, check_in, check_out)
             is_available, message = check_room_availability(
                 session, room_id, check_in, check_out, booking_code
             )
@@ -272,25 +462,29 @@ def update_booking_partial(session, booking_code, data):
                 setattr(booking, key, value)
 
         booking.updated_at = datetime.now(timezone.utc)
+        _flush_booking_changes(session)
         return booking
 
     except Exception as e:
         logger.error(f"Error updating booking {booking_code}: {e}")
         raise
 
-def update_booking_full(session, booking_code, data):
+def update_booking_full(session, booking_code, data, expected_version=None):
     try:
         booking = session.query(Booking).get(booking_code)
         if not booking:
             raise ValueError(f"Booking with ID {booking_code} not found")
+        check_version(booking, expected_version)
 
-        if booking.status in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
+        if booking.effective_status in [BookingStatus.COMPLETED, BookingStatus.CANCELLED]:
             raise ValueError("Cannot modify completed or cancelled bookings")
 
         check_in = data.get('check_in_date')
         check_out = data.get('check_out_date')
         room_id = data.get('room_id')
 
+        if BOOKING_CONCURRENCY_MODE == "lock":
+            lock_room_dates(session, room_id, check_in, check_out)
         is_available, message = check_room_availability(
             session, room_id, check_in, check_out, booking_code
         )
@@ -303,6 +497,7 @@ def update_booking_full(session, booking_code, data):
         booking.check_out_date = check_out
         booking.special_requests = data.get('special_requests')
         booking.updated_at = datetime.now(timezone.utc)
+        _flush_booking_changes(session)
 
         return booking
 
@@ -322,10 +517,10 @@ def cancel_booking(session, booking_code):
         booking.status = BookingStatus.CANCELLED
         booking.updated_at = datetime.now(timezone.utc)
 
+        # Лист про скасування комітиться разом зі скасуванням (коміт робить викликач)
         try:
             user = session.query(User).get(booking.user_id)
             room = session.query(Room).get(booking.room_id)
-
             if user and room:
                 from src.api.services.refund_service import calculate_refund_amount
                 nights = (booking.check_out_date - booking.check_in_date).days
@@ -337,20 +532,16 @@ def cancel_booking(session, booking_code):
                     total_price
                 )
 
-                booking_data = {
+                enqueue_notification(session, NotificationType.BOOKING_CANCELLED, user.email, user.phone, {
                     'guest_name': f"{user.first_name} {user.last_name}",
                     'booking_code': booking_code,
                     'room_number': room.room_number,
                     'check_in_date': booking.check_in_date.strftime('%d.%m.%Y'),
                     'check_out_date': booking.check_out_date.strftime('%d.%m.%Y'),
                     'refund_amount': f"{refund_amount:.2f}"
-                }
-
-                notification_service.notify_booking_cancelled(
-                    user.email, user.phone, booking_data
-                )
+                })
         except Exception as e:
-            logger.error(f"Cancellation email failed: {e}")
+            logger.error(f"Cancellation notification failed: {e}")
 
         return True
 
@@ -371,7 +562,7 @@ def search_bookings(session, user_id=None, room_id=None, status=None,
             query = query.filter(Booking.room_id == room_id)
 
         if status is not None:
-            query = query.filter(Booking.status == status)
+            query = query.filter(Booking.effective_status == status)
 
         if check_in_from:
             query = query.filter(Booking.check_in_date >= check_in_from)
@@ -449,4 +640,144 @@ def get_room_booked_ranges(session, room_id: int, start_date: date, end_date: da
         return ranges
     except SQLAlchemyError as e:
         logger.error(f"Database error fetching booked ranges for room {room_id}: {e}")
-        raise Exception(f"Database error: {e}")
\ No newline at end of file
+        raise Exception(f"Database error: {e}")
+
+
+def get_rooms_availability_matrix(session, room_ids, windows):
+    """Availability of each room in room_ids for each {"check_in", "check_out"} window.
+
+    Answers the whole rooms x windows matrix with one grouped query: the
+    requested windows are joined as a VALUES list to the rooms and LEFT JOINed to
+    overlapping non-cancelled bookings. Returns (rows, not_found), where rows are
+    {"room_id": id, "available": [bool per window]} in room_ids order. A room that
+    is not AVAILABLE is reported as unavailable for every window.
+    """
+    try:
+        window_rows = values(
+            column('idx', Integer),
+            column('check_in', Date),
+            column('check_out', Date),
+            name='windows'
+        ).data([(i, w['check_in'], w['check_out']) for i, w in enumerate(windows)])
+
+        matrix = session.query(
+            Room.room_id,
+            Room.status,
+            window_rows.c.idx,
+            func.count(Booking.booking_code)
+        ).select_from(Room).join(
+            window_rows, true()
+        ).outerjoin(
+            Booking,
+            and_(
+                Booking.room_id == Room.room_id,
+                Booking.status != BookingStatus.CANCELLED,
+                Booking.check_in_date < window_rows.c.check_out,
+                Booking.check_out_date > window_rows.c.check_in
+            )
+        ).filter(
+            Room.room_id.in_(set(room_ids))
+        ).group_by(
+            Room.room_id, Room.status, window_rows.c.idx
+        ).all()
+
+        available = {}
+        for room_id, status, idx, overlapping in matrix:
+            flags = available.setdefault(room_id, [False] * len(windows))
+            flags[idx] = status == RoomStatus.AVAILABLE and overlapping == 0
+
+        rows = []
+        not_found = []
+        for room_id in dict.fromkeys(room_ids):
+            if room_id in available:
+                rows.append({"room_id": room_id, "available": available[room_id]})
+            else:
+                not_found.append(room_id)
+        return rows, not_found
+    except SQLAlchemyError as e:
+        logger.error(f"Database error building availability matrix: {e}")
+        raise Exception(f"Database error: {e}")
+
+
+def iter_rooms_booked_ranges(session, start_date: date, end_date: date, batch_size=500):
+    """Yield (room_id, room_number, ranges) for every room, ordered by room_id.
+
+    Same range format as get_room_booked_ranges, but for the whole hotel from a
+    single query (rooms LEFT JOIN ACTIVE bookings overlapping the window),
+    read through a server-side cursor so rooms can be streamed one by one.
+    Rooms without bookings in the window get an empty list.
+
+    Only ACTIVE bookings hold a room (the same rule as the overlap constraint),
+    which is also the predicate of ix_bookings_active_room_dates: the join is
+    an index range scan per room instead of a scan of the booking history.
+    """
+    try:
+        rows = session.query(
+            Room.room_id,
+            Room.room_number,
+            Booking.check_in_date,
+            Booking.check_out_date
+        ).outerjoin(
+            Booking,
+            and_(
+                Booking.room_id == Room.room_id,
+                Booking.status == BookingStatus.ACTIVE,
+                Booking.check_in_date < end_date,
+                Booking.check_out_date > start_date
+            )
+        ).order_by(
+            Room.room_id, Booking.check_in_date
+        ).yield_per(batch_size)
+
+        for (room_id, room_number), room_rows in groupby(rows, key=lambda r: (r.room_id, r.room_number)):
+            ranges = [
+                {
+                    "start": max(row.check_in_date, start_date).isoformat(),
+                    "end": min(row.check_out_date, end_date).isoformat()
+                }
+                for row in room_rows if row.check_in_date is not None
+            ]
+            yield room_id, room_number, ranges
+    except SQLAlchemyError as e:
+        logger.error(f"Database error fetching hotel occupancy calendar: {e}")
+        raise Exception(f"Database error: {e}")
+
+
+EXPORT_COLUMNS = (
+    "booking_code", "user_id", "room_id", "room_number", "check_in_date",
+    "check_out_date", "status", "special_requests", "created_at", "updated_at"
+)
+
+
+def iter_bookings_for_export(session, date_from: date = None, date_to: date = None, batch_size=1000):
+    """Yield bookings as plain dicts keyed by EXPORT_COLUMNS, ordered by check-in.
+
+    date_from/date_to bound check_in_date as [date_from, date_to). Rows are read
+    as column tuples through a server-side cursor, so no ORM objects are built
+    and memory stays at one batch regardless of table size.
+    """
+    try:
+        query = session.query(
+            Booking.booking_code,
+            Booking.user_id,
+            Booking.room_id,
+            Room.room_number,
+            Booking.check_in_date,
+            Booking.check_out_date,
+            Booking.effective_status.label("status"),
+            Booking.special_requests,
+            Booking.created_at,
+            Booking.updated_at
+        ).join(Room, Room.room_id == Booking.room_id)
+
+        if date_from:
+            query = query.filter(Booking.check_in_date >= date_from)
+        if date_to:
+            query = query.filter(Booking.check_in_date < date_to)
+
+        rows = query.order_by(Booking.check_in_date, Booking.booking_code).yield_per(batch_size)
+        for row in rows:
+            yield dict(zip(EXPORT_COLUMNS, row))
+    except SQLAlchemyError as e:
+        logger.error(f"Database error exporting bookings: {e}")
+        raise Exception(f"Database error: {e}")
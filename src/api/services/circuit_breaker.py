@@ -0,0 +1,109 @@
+"""
+Circuit breaker for calls to an external service (the SMTP server).
+
+While the service works the breaker is CLOSED and every call goes through.
+After ``failure_threshold`` consecutive failures it OPENS: calls are refused
+at once instead of each waiting for a timeout, and callers defer their work.
+After ``reset_timeout`` seconds it becomes HALF_OPEN and lets a single trial
+call through. A success closes the breaker; a failure opens it for another
+cool-down.
+"""
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = 0.0
+            self._trial_in_flight = False
+            self.times_opened = 0
+            self.rejected = 0
+
+    def _current_state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def retry_after(self):
+        """Seconds until calls may be tried again; 0 unless the breaker is open"""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def allow(self):
+        """True if the caller may make the call now.
+
+        In HALF_OPEN only one trial call is let through until its outcome
+        is recorded.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """Forget a call that ended without an outcome for the service.
+
+        Neither a success nor a failure is counted; in HALF_OPEN the next
+        trial call may go through.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or (state == CLOSED and self._failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+                self.times_opened += 1
+
+    def snapshot(self):
+        with self._lock:
+            state = self._current_state()
+            retry_after = self.reset_timeout - (self._clock() - self._opened_at) if state == OPEN else 0.0
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout,
+                "retry_after_seconds": round(max(0.0, retry_after), 3),
+                "times_opened": self.times_opened,
+                "rejected": self.rejected
+            }
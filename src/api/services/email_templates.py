@@ -0,0 +1,65 @@
+"""
+HTML templates for guest emails.
+
+The templates live in src/templates/email/. Each one defines a ``render``
+macro that takes the booking data. All of them are compiled once, when this
+module is imported, and the macros are called directly. That skips building
+a fresh template context for every message, and ``render_many`` renders a
+whole batch (e.g. one chunk of daily reminders) with the same macro.
+
+The shared shell (styles, header, footer) is the same for every email. It is
+rendered once and split around the body, so wrapping a message is just
+string concatenation.
+"""
+import os
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from markupsafe import Markup
+
+EMAIL_TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'templates', 'email'
+)
+
+# Назви збігаються зі значеннями NotificationType
+TEMPLATE_NAMES = (
+    "booking_created",
+    "group_booking_created",
+    "booking_cancelled",
+    "checkin_reminder",
+    "checkout_reminder",
+)
+
+_BODY_MARK = "\x00body\x00"
+
+
+class EmailTemplates:
+    """Compiled email templates and the pre-rendered shell."""
+
+    def __init__(self, template_dir=EMAIL_TEMPLATE_DIR):
+        env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=True,
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False
+        )
+        self._macros = {name: env.get_template(f"{name}.html").module.render for name in TEMPLATE_NAMES}
+        shell = env.get_template("base.html").render(body=Markup(_BODY_MARK))
+        self._shell_head, self._shell_tail = shell.split(_BODY_MARK)
+
+    def render(self, name: str, data) -> str:
+        """Body of one email"""
+        return str(self._macros[name](data))
+
+    def render_many(self, name: str, items) -> list:
+        """Bodies of many emails of the same kind, in order"""
+        macro = self._macros[name]
+        return [str(macro(data)) for data in items]
+
+    def wrap(self, body: str) -> str:
+        """Full HTML document: the shell around an already rendered body"""
+        return self._shell_head + body + self._shell_tail
+
+
+email_templates = EmailTemplates()
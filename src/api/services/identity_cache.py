@@ -0,0 +1,181 @@
+"""
+Per-process cache of authenticated user identities.
+
+The auth decorators only need to know who the caller is: user id, role,
+whether the account is registered and the token_version its tokens must
+carry. ``identity_cache`` keeps that much for recently seen users (LRU, at
+most ``max_size`` entries, each for ``ttl`` seconds), so an authenticated
+request does not read the users table.
+
+``token_version_cache`` holds the same entries for the claims-only auth mode,
+which only needs the user's token_version. Its TTL (TOKEN_VERSION_CACHE_TTL,
+30 s) is kept separate from USER_CACHE_TTL and short: a polling dashboard
+reads the users table about twice a minute.
+
+Entries follow the database through SQLAlchemy session events, the same way
+the availability index does. Users flushed as changed or deleted by a session
+are dropped from both caches when that session commits. Bulk UPDATE/DELETE on
+users clears them. Changes made by other processes are picked up when the TTL
+runs out: a token made stale by a password, role or registration change in
+another process keeps working there for at most that many seconds.
+"""
+from collections import OrderedDict
+from itertools import chain
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.api.models.user_model import User, UserRole
+
+_PENDING_KEY = "identity_cache_pending"
+_CLEAR_KEY = "identity_cache_clear"
+
+
+class UserIdentity:
+    """Who the authenticated user is; safe to share between requests."""
+    __slots__ = ("user_id", "role", "is_registered", "token_version")
+
+    def __init__(self, user_id, role, is_registered, token_version=0):
+        self.user_id = user_id
+        self.role = role
+        self.is_registered = is_registered
+        self.token_version = token_version
+
+    @property
+    def is_admin(self):
+        return self.role == UserRole.ADMIN
+
+    @property
+    def is_staff(self):
+        return self.role in [UserRole.STAFF, UserRole.ADMIN]
+
+    @property
+    def is_guest(self):
+        return self.role == UserRole.GUEST
+
+    def __repr__(self):
+        return f"<UserIdentity {self.user_id} {self.role}>"
+
+
+class IdentityCache:
+    """Thread-safe TTL + LRU map of user_id to UserIdentity."""
+
+    def __init__(self, max_size=10000, ttl=60.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # змінюється при кожній інвалідації: значення, прочитане з БД до неї, не кешується
+        self._generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def get(self, user_id, load):
+        """Identity of user_id; load(user_id) returns the User row on a miss (or None)."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > self._clock():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        user = load(user_id)
+        if user is None:
+            return None
+        identity = UserIdentity(user_id, user.role, user.is_registered, getattr(user, "token_version", 0))
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[user_id] = (identity, self._clock() + self.ttl)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return identity
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+identity_cache = IdentityCache(
+    max_size=int(os.getenv('USER_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('USER_CACHE_TTL', '60'))
+)
+
+token_version_cache = IdentityCache(
+    max_size=int(os.getenv('USER_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('TOKEN_VERSION_CACHE_TTL', '30'))
+)
+
+_CACHES = (identity_cache, token_version_cache)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session, flush_context):
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, User) and obj.user_id is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(obj.user_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_user_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[_CLEAR_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_changed_users(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_CLEAR_KEY, False):
+        for cache in _CACHES:
+            cache.clear()
+        return
+    for user_id in pending or ():
+        for cache in _CACHES:
+            cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_CLEAR_KEY, None)
@@ -0,0 +1,120 @@
+"""
+Transaction-scoped Postgres advisory locks for booking writes.
+
+A booking locks ``(room_id, bucket)`` pairs, where a bucket is a run of
+``BOOKING_LOCK_BUCKET_DAYS`` consecutive days (a week by default), via the
+two-key form ``pg_advisory_xact_lock(room_id, bucket)``. Bookings of the same
+room in different weeks take different locks and proceed in parallel, and the
+``rooms`` row itself is never locked, so admin edits of a room do not wait for
+bookings. Locks are released by Postgres at commit or rollback.
+
+Keys are always acquired in sorted order, so two transactions locking
+overlapping sets of rooms (group bookings) cannot deadlock. The bookings
+exclusion constraint remains the source of truth for overlaps; the locks only
+serialize writers of the same room and week and make that contention visible in
+``lock_metrics``.
+
+Group bookings always take the locks. Single bookings take them only with
+``BOOKING_CONCURRENCY_MODE=lock``; by default they rely on the constraint alone.
+"""
+from datetime import date, timedelta
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+BOOKING_LOCK_BUCKET_DAYS = int(os.getenv('BOOKING_LOCK_BUCKET_DAYS', '7'))
+
+# Межі гістограми очікування, секунди
+WAIT_BUCKETS = (0.001, 0.01, 0.1, 1.0)
+
+_LOCK_SQL = text("SELECT pg_advisory_xact_lock(:room_id, :bucket)")
+
+
+class LockMetrics:
+    """Thread-safe counters of advisory lock waits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.acquired = 0
+            self.contended = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.histogram = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def record(self, wait):
+        with self._lock:
+            self.acquired += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if wait >= WAIT_BUCKETS[0]:
+                self.contended += 1
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if wait < bound:
+                    self.histogram[i] += 1
+                    break
+            else:
+                self.histogram[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"<{bound * 1000:g}ms" for bound in WAIT_BUCKETS] + [f">={WAIT_BUCKETS[-1] * 1000:g}ms"]
+            return {
+                "acquired": self.acquired,
+                "contended": self.contended,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "avg_wait_ms": round(self.total_wait * 1000 / self.acquired, 3) if self.acquired else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "wait_histogram": dict(zip(labels, self.histogram))
+            }
+
+
+lock_metrics = LockMetrics()
+
+
+def date_bucket(day: date):
+    return day.toordinal() // BOOKING_LOCK_BUCKET_DAYS
+
+
+def booking_lock_keys(stays):
+    """Sorted unique (room_id, bucket) keys covering each stay's nights.
+
+    stays are (room_id, check_in, check_out) tuples; the stay occupies the
+    nights [check_in, check_out).
+    """
+    keys = set()
+    for room_id, check_in, check_out in stays:
+        last_night = max(check_in, check_out - timedelta(days=1))
+        for bucket in range(date_bucket(check_in), date_bucket(last_night) + 1):
+            keys.add((room_id, bucket))
+    return sorted(keys)
+
+
+def lock_booking_dates(session, stays):
+    """Take the advisory locks for stays in the session's current transaction.
+
+    Returns the number of locks taken. Blocks until every lock is granted.
+    """
+    keys = booking_lock_keys(stays)
+    try:
+        for room_id, bucket in keys:
+            started = time.perf_counter()
+            session.execute(_LOCK_SQL, {"room_id": room_id, "bucket": bucket})
+            lock_metrics.record(time.perf_counter() - started)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error acquiring booking locks: {e}")
+        raise Exception(f"Database error: {e}")
+    return len(keys)
+
+
+def lock_room_dates(session, room_id, check_in, check_out):
+    return lock_booking_dates(session, [(room_id, check_in, check_out)])
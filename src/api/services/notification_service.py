@@ -6,15 +6,27 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
+import time
 from dotenv import load_dotenv
+from src.api.services.circuit_breaker import CircuitBreaker
+from src.api.services.email_templates import email_templates
+from src.api.services.smtp_pool import SMTPConnectionPool, MESSAGE_ERRORS
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+BOOKING_CREATED_SUBJECT = " Підтвердження бронювання - Готель 'Хрещатик'"
+GROUP_BOOKING_CREATED_SUBJECT = "Підтвердження групового бронювання ({count} номерів) - Готель 'Хрещатик'"
+BOOKING_CANCELLED_SUBJECT = "Скасування бронювання - Готель 'Хрещатик'"
+CHECKIN_REMINDER_SUBJECT = "Нагадування про заїзд завтра - Готель 'Хрещатик'"
+CHECKOUT_REMINDER_SUBJECT = " Нагадування про виїзд завтра - Готель 'Хрещатик'"
+
+
 class NotificationType(Enum):
     """Типи повідомлень"""
     BOOKING_CREATED = "booking_created"
+    GROUP_BOOKING_CREATED = "group_booking_created"
     BOOKING_CANCELLED = "booking_cancelled"
     CHECKIN_REMINDER = "checkin_reminder"
     CHECKOUT_REMINDER = "checkout_reminder"
@@ -31,9 +43,98 @@ class NotificationService:
         self.smtp_password = os.getenv('SMTP_PASSWORD', '')
         self.from_email = os.getenv('FROM_EMAIL', self.smtp_user)
         self.from_name = os.getenv('FROM_NAME', 'Готель Хрещатик')
+        # локальні SMTP-пастки (MailHog, Mailpit) не підтримують STARTTLS
+        self.smtp_starttls = os.getenv('SMTP_STARTTLS', 'True') == 'True'
+        # без timeout недоступний сервер блокує потік на хвилини
+        self.smtp_connect_timeout = float(os.getenv('SMTP_CONNECT_TIMEOUT', '10'))
+        self.smtp_send_timeout = float(os.getenv('SMTP_SEND_TIMEOUT', '30'))
 
         self.email_enabled = bool(self.smtp_user and self.smtp_password)
 
+        self.smtp_pool = SMTPConnectionPool(
+            self._open_smtp_connection,
+            max_size=int(os.getenv('SMTP_POOL_SIZE', '4')),
+            idle_timeout=float(os.getenv('SMTP_IDLE_TIMEOUT', '60')),
+            health_check_after=float(os.getenv('SMTP_HEALTH_CHECK_AFTER', '10'))
+        )
+        self.smtp_breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv('SMTP_BREAKER_THRESHOLD', '5')),
+            reset_timeout=float(os.getenv('SMTP_BREAKER_COOLDOWN', '60'))
+        )
+
+    def _open_smtp_connection(self):
+        """Нове автентифіковане SMTP-з'єднання для пулу"""
+        logger.info(f"Connecting to SMTP server {self.smtp_host}:{self.smtp_port}...")
+        if self.smtp_port == 465:
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=self.smtp_connect_timeout)
+        else:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=self.smtp_connect_timeout)
+        try:
+            if self.smtp_port != 465 and self.smtp_starttls:
+                server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+            if server.sock is not None:
+                # з'єднання встановлене - далі діє timeout відправки листа
+                server.sock.settimeout(self.smtp_send_timeout)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _build_message(self, to_email: str, subject: str, body: str) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        msg['Subject'] = subject
+
+        html_body = email_templates.wrap(body)
+        msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+        return msg
+
+    def _send_messages(self, messages) -> list:
+        """
+        Відправка листів через з'єднання з пулу
+
+        Усі листи йдуть одне за одним через одне з'єднання. Якщо воно обірвалося,
+        решта листів надсилається через нове (одна спроба перепідключення).
+        Якщо ж не вдалося встановити нове з'єднання, повтор лише знову чекав би
+        на timeout, тож листи одразу вважаються невідправленими.
+        Результат потрапляє в circuit breaker.
+
+        Returns:
+            list[bool]: результат для кожного листа
+        """
+        results = []
+        pending = list(messages)
+        reconnected = False
+        while pending:
+            connected = False
+            try:
+                with self.smtp_pool.connection() as server:
+                    connected = True
+                    while pending:
+                        msg = pending[0]
+                        try:
+                            server.send_message(msg)
+                            results.append(True)
+                            logger.info(f"Email successfully sent to {msg['To']}")
+                        except MESSAGE_ERRORS as e:
+                            logger.error(f"SMTP rejected email to {msg['To']}: {e}")
+                            results.append(False)
+                        pending.pop(0)
+            except smtplib.SMTPAuthenticationError:
+                raise
+            except (smtplib.SMTPException, OSError) as e:
+                if reconnected or not connected:
+                    logger.error(f"SMTP error, {len(pending)} emails not sent: {e}")
+                    results.extend([False] * len(pending))
+                    self.smtp_breaker.record_failure()
+                    return results
+                logger.warning(f"SMTP connection lost ({e}), reconnecting")
+                reconnected = True
+        self.smtp_breaker.record_success()
+        return results
+
     def send_email(self, to_email: str, subject: str, body: str) -> bool:
         """
         Відправка email повідомлення через SMTP
@@ -46,282 +147,90 @@ class NotificationService:
         Returns:
             bool: True якщо успішно відправлено
         """
+        return self.send_emails([(to_email, subject, body)])[0]
+
+    def send_emails(self, emails) -> list:
+        """
+        Відправка кількох листів через одне SMTP-з'єднання
+
+        Поки circuit breaker відкритий (SMTP-сервер недоступний), листи не
+        надсилаються і не чекають на timeout: усі результати False.
+
+        Args:
+            emails: список кортежів (to_email, subject, body)
+
+        Returns:
+            list[bool]: результат для кожного листа
+        """
+        emails = list(emails)
+        if not emails:
+            return []
         if not self.email_enabled:
-            logger.warning(f"Email disabled (no SMTP credentials). Would send to {to_email}: {subject}")
-            return False
+            for to_email, subject, _ in emails:
+                logger.warning(f"Email disabled (no SMTP credentials). Would send to {to_email}: {subject}")
+            return [False] * len(emails)
+
+        # листи будуються до circuit breaker: помилка шаблону - не збій SMTP
+        results = [False] * len(emails)
+        built = []
+        for position, (to_email, subject, body) in enumerate(emails):
+            try:
+                built.append((position, self._build_message(to_email, subject, body)))
+            except Exception as e:
+                logger.error(f"Failed to build email to {to_email}: {e}")
+        if not built:
+            return results
+
+        if not self.smtp_breaker.allow():
+            logger.warning(
+                f"SMTP circuit open, {len(emails)} emails deferred "
+                f"(retry in {self.smtp_breaker.retry_after():.0f}s)"
+            )
+            return results
 
         try:
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
-
-            html_body = f"""
-            <html>
-                <head>
-                    <style>
-                        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                        .header {{ background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }}
-                        .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 8px 8px; }}
-                        .details {{ background: white; padding: 20px; margin: 20px 0; border-left: 4px solid #B8963E; border-radius: 4px; }}
-                        .footer {{ text-align: center; margin-top: 30px; padding: 20px; color: #666; font-size: 14px; }}
-                        .separator {{ border-top: 2px solid #B8963E; margin: 20px 0; }}
-                        h1 {{ margin: 0; font-size: 28px; }}
-                        h2 {{ color: #2c3e50; margin-top: 0; }}
-                        .highlight {{ color: #B8963E; font-weight: bold; }}
-                        .info-row {{ display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid #e9ecef; }}
-                        .info-row:last-child {{ border-bottom: none; }}
-                        .label {{ color: #666; }}
-                        .value {{ font-weight: bold; color: #2c3e50; }}
-                    </style>
-                </head>
-                <body>
-                    <div class="container">
-                        <div class="header">
-                            <h1> ГОТЕЛЬ "ХРЕЩАТИК" </h1>
-                        </div>
-                        <div class="content">
-                            {body}
-                        </div>
-                        <div class="footer">
-                            <div class="separator"></div>
-                            <p><strong>Готель "Хрещатик"</strong></p>
-                            <p>📍 м. Київ, вул. Хрещатик, 5</p>
-                            <p>📞 +380 95 666 66 66 | 📧 info@kh.hotel.com</p>
-                            <p style="font-size: 12px; color: #999;">Це автоматичне повідомлення, не відповідайте на нього</p>
-                        </div>
-                    </div>
-                </body>
-            </html>
-            """
-
-            part_html = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(part_html)
-
-            logger.info(f"Connecting to SMTP server {self.smtp_host}:{self.smtp_port}...")
-
-            if self.smtp_port == 465:
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-
-            logger.info(f"Email successfully sent to {to_email}")
-            return True
+            sent = self._send_messages([msg for _, msg in built])
 
         except smtplib.SMTPAuthenticationError as e:
             logger.error(f"SMTP Authentication failed: {e}")
-            return False
-        except smtplib.SMTPException as e:
-            logger.error(f"SMTP error sending email to {to_email}: {e}")
-            return False
+            self.smtp_breaker.record_failure()
+            return results
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error(f"Failed to send {len(built)} emails: {e}")
+            self.smtp_breaker.record_failure()
+            return results
         except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {e}")
-            return False
+            # не відповідь SMTP-сервера: breaker лише звільняє пробний виклик
+            logger.error(f"Failed to send {len(built)} emails: {e}")
+            self.smtp_breaker.release()
+            return results
+
+        for (position, _), ok in zip(built, sent):
+            results[position] = ok
+        return results
 
     def _get_booking_created_template(self, booking_data: Dict[str, Any]) -> Dict[str, str]:
         """Шаблон для створення бронювання"""
-        subject = " Підтвердження бронювання - Готель 'Хрещатик'"
-
-        body = f"""
-        <h2>Вітаємо, {booking_data['guest_name']}!</h2>
-        <p style="font-size: 16px; color: #2c3e50;">Ваше бронювання успішно створено!</p>
-
-        <div class="details">
-            <h2 style="margin-top: 0;"> Деталі бронювання</h2>
-            <div class="info-row">
-                <span class="label">Код бронювання: </span>
-                <span class="value highlight">{booking_data['booking_code']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Номер кімнати: </span>
-                <span class="value">{booking_data['room_number']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Заїзд: </span>
-                <span class="value">{booking_data['check_in_date']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Виїзд: </span>
-                <span class="value">{booking_data['check_out_date']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Кількість ночей: </span>
-                <span class="value">{booking_data['nights']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Вартість: </span>
-                <span class="value highlight">{booking_data['total_price']} грн</span>
-            </div>
-        </div>
-
-        <div style="background: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0; border-radius: 4px;">
-            <h3 style="margin-top: 0; color: #856404;"> Важлива інформація</h3>
-            <ul style="margin: 0; padding-left: 20px;">
-                <li>Заселення після 14:00</li>
-                <li>Виселення до 12:00</li>
-                <li>Безкоштовне скасування за 24 години</li>
-                <li>При заселенні необхідний паспорт</li>
-            </ul>
-        </div>
-
-        <p style="font-size: 16px; margin-top: 30px;">
-            <strong>Дякуємо за вибір нашого готелю!</strong><br>
-            Чекаємо на вас з нетерпінням! :)
-        </p>
-        """
+        return {"subject": BOOKING_CREATED_SUBJECT, "body": email_templates.render("booking_created", booking_data)}
 
-        return {"subject": subject, "body": body}
+    def _get_group_booking_created_template(self, booking_data: Dict[str, Any]) -> Dict[str, str]:
+        """Шаблон підсумку групового бронювання"""
+        return {
+            "subject": GROUP_BOOKING_CREATED_SUBJECT.format(count=len(booking_data['bookings'])),
+            "body": email_templates.render("group_booking_created", booking_data)
+        }
 
     def _get_booking_cancelled_template(self, booking_data: Dict[str, Any]) -> Dict[str, str]:
         """Шаблон для скасування бронювання"""
-        subject = "Скасування бронювання - Готель 'Хрещатик'"
-
-        refund_html = ""
-        if booking_data.get('refund_amount'):
-            refund_html = f"""
-            <div class="info-row">
-                <span class="label"> Сума повернення: </span>
-                <span class="value highlight">{booking_data['refund_amount']} грн</span>
-            </div>
-            <div style="background: #d4edda; border-left: 4px solid #28a745; padding: 15px; margin: 20px 0; border-radius: 4px;">
-                <p style="margin: 0; color: #155724;">
-                    <strong>✓ Кошти будуть повернені протягом 3-5 робочих днів на картку, з якої проводилась оплата.</strong>
-                </p>
-            </div>
-            """
-
-        body = f"""
-        <h2>Вітаємо, {booking_data['guest_name']}</h2>
-        <p style="font-size: 16px; color: #2c3e50;">Ваше бронювання було успішно скасовано.</p>
-
-        <div class="details">
-            <h2 style="margin-top: 0;"> Деталі скасованого бронювання</h2>
-            <div class="info-row">
-                <span class="label">Код бронювання: </span>
-                <span class="value">{booking_data['booking_code']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Номер кімнати: </span>
-                <span class="value">{booking_data['room_number']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Період: </span>
-                <span class="value">{booking_data['check_in_date']} - {booking_data['check_out_date']}</span>
-            </div>
-            {refund_html}
-        </div>
-
-        <p style="font-size: 16px; margin-top: 30px;">
-            Сподіваємось побачити вас найближчим часом!<br>
-            Ми завжди раді гостям!
-        </p>
-        """
-
-        return {"subject": subject, "body": body}
+        return {"subject": BOOKING_CANCELLED_SUBJECT, "body": email_templates.render("booking_cancelled", booking_data)}
 
     def _get_checkin_reminder_template(self, booking_data: Dict[str, Any]) -> Dict[str, str]:
         """Шаблон нагадування про заїзд"""
-        subject = "Нагадування про заїзд завтра - Готель 'Хрещатик'"
-
-        body = f"""
-        <h2>Вітаємо, {booking_data['guest_name']}!</h2>
-        <p style="font-size: 18px; color: #2c3e50;"><strong>Нагадуємо, що завтра ваш заїзд до готелю!</strong></p>
-
-        <div class="details">
-            <h2 style="margin-top: 0;"> Деталі бронювання</h2>
-            <div class="info-row">
-                <span class="label">Код бронювання: </span>
-                <span class="value highlight">{booking_data['booking_code']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Номер кімнати: </span>
-                <span class="value">{booking_data['room_number']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Заїзд: </span>
-                <span class="value">{booking_data['check_in_date']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Час заселення: </span>
-                <span class="value">після 14:00</span>
-            </div>
-        </div>
-
-        <div style="background: #e7f3ff; border-left: 4px solid #0066cc; padding: 15px; margin: 20px 0; border-radius: 4px;">
-            <h3 style="margin-top: 0; color: #004085;"> Що потрібно мати при заселенні:</h3>
-            <ul style="margin: 0; padding-left: 20px; color: #004085;">
-                <li><strong>Паспорт</strong> або ID-картка</li>
-                <li>Код бронювання: <strong>{booking_data['booking_code']}</strong></li>
-                <li>Кредитна картка для депозиту</li>
-            </ul>
-        </div>
-
-        <div style="background: #f8f9fa; padding: 15px; margin: 20px 0; border-radius: 4px;">
-            <h3 style="margin-top: 0;">📍 Наша адреса:</h3>
-            <p style="margin: 0; font-size: 16px;"><strong>м. Київ, вул. Хрещатик, 5</strong></p>
-        </div>
-
-        <p style="font-size: 16px; margin-top: 30px;">
-            <strong>Чекаємо на вас!</strong><br>
-            До зустрічі завтра! :)
-        </p>
-        """
-
-        return {"subject": subject, "body": body}
+        return {"subject": CHECKIN_REMINDER_SUBJECT, "body": email_templates.render("checkin_reminder", booking_data)}
 
     def _get_checkout_reminder_template(self, booking_data: Dict[str, Any]) -> Dict[str, str]:
         """Шаблон нагадування про виїзд"""
-        subject = " Нагадування про виїзд завтра - Готель 'Хрещатик'"
-
-        body = f"""
-        <h2>Вітаємо, {booking_data['guest_name']}!</h2>
-        <p style="font-size: 18px; color: #2c3e50;"><strong>Нагадуємо, що завтра день вашого виїзду з готелю.</strong></p>
-
-        <div class="details">
-            <h2 style="margin-top: 0;"> Деталі</h2>
-            <div class="info-row">
-                <span class="label">Код бронювання: </span>
-                <span class="value">{booking_data['booking_code']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Номер кімнати: </span>
-                <span class="value">{booking_data['room_number']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Виїзд: </span>
-                <span class="value">{booking_data['check_out_date']}</span>
-            </div>
-            <div class="info-row">
-                <span class="label"> Час виселення: </span>
-                <span class="value">до 12:00</span>
-            </div>
-        </div>
-
-        <div style="background: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0; border-radius: 4px;">
-            <h3 style="margin-top: 0; color: #856404;"> Корисна інформація:</h3>
-            <ul style="margin: 0; padding-left: 20px; color: #856404;">
-                <li>Пізній виїзд можливий за домовленістю (зверніться на рецепцію)</li>
-                <li>Зберігання багажу - безкоштовно</li>
-                <li>Оплата при виселенні на рецепції</li>
-            </ul>
-        </div>
-
-        <div style="background: #d4edda; border-left: 4px solid #28a745; padding: 20px; margin: 20px 0; border-radius: 4px; text-align: center;">
-            <h3 style="margin-top: 0; color: #155724;"> Дякуємо, що обрали наш готель! </h3>
-            <p style="margin: 0; color: #155724; font-size: 16px;">
-                Будемо раді бачити вас знову!<br>
-                Не забудьте залишити відгук про ваші враження щодо наших номерів та обслуговування :)
-            </p>
-        </div>
-        """
-
-        return {"subject": subject, "body": body}
+        return {"subject": CHECKOUT_REMINDER_SUBJECT, "body": email_templates.render("checkout_reminder", booking_data)}
 
     def notify_booking_created(
             self,
@@ -332,6 +241,15 @@ class NotificationService:
         templates = self._get_booking_created_template(booking_data)
         return self.send_email(guest_email, templates['subject'], templates['body'])
 
+    def notify_group_booking_created(
+            self,
+            guest_email: str,
+            guest_phone: str,
+            booking_data: Dict[str, Any]
+    ) -> bool:
+        templates = self._get_group_booking_created_template(booking_data)
+        return self.send_email(guest_email, templates['subject'], templates['body'])
+
     def notify_booking_cancelled(
             self,
             guest_email: str,
@@ -362,65 +280,74 @@ class NotificationService:
 
 # SCHEDULER ДЛЯ НАГАДУВАНЬ
 
+# Підсумок останнього запуску send_daily_reminders (для /api/v1/metrics)
+last_reminder_run: Dict[str, Any] = {}
+
+
 def send_daily_reminders(session):
     """
     Функція для щоденної відправки нагадувань
     Має викликатись через cron або scheduler (напр. APScheduler)
+
+    Reminders go through the outbox like every other notification: one
+    INSERT ... SELECT per reminder type queues a message for each booking
+    that checks in or out tomorrow, with its guest and room joined in, and
+    the outbox worker delivers them with its retries and circuit-breaker
+    deferral. Nothing is loaded into Python, so the job's memory does not
+    depend on the number of bookings. Returns the run's counts and duration
+    (seconds).
     """
+    from sqlalchemy import select, func, literal
     from src.api.models.booking_model import Booking, BookingStatus
+    from src.api.models.room_model import Room
     from src.api.models.user_model import User
+    from src.api.services.outbox import enqueue_notifications_from
 
-    notification_service = NotificationService()
     tomorrow = date.today() + timedelta(days=1)
-
     logger.info(f"Running daily reminders for {tomorrow}")
-
-    checkin_bookings = session.query(Booking).filter(
-        Booking.status == BookingStatus.ACTIVE,
-        Booking.check_in_date == tomorrow
-    ).all()
-
-    checkout_bookings = session.query(Booking).filter(
-        Booking.status == BookingStatus.ACTIVE,
-        Booking.check_out_date == tomorrow
-    ).all()
-
-    for booking in checkin_bookings:
-        user = session.query(User).get(booking.user_id)
-        if not user:
-            continue
-
-        booking_data = {
-            'guest_name': f"{user.first_name} {user.last_name}",
-            'booking_code': booking.booking_code,
-            'room_number': booking.room.room_number,
-            'check_in_date': booking.check_in_date.strftime('%d.%m.%Y'),
-        }
-
-        notification_service.notify_checkin_reminder(
-            user.email,
-            user.phone,
-            booking_data
+    started = time.perf_counter()
+
+    def reminders(date_column, date_key):
+        # той самий payload, що й у notify_checkin_reminder / notify_checkout_reminder
+        return select(
+            User.email.label("recipient"),
+            User.phone.label("phone"),
+            func.jsonb_build_object(
+                literal("guest_name"), User.first_name + literal(" ") + User.last_name,
+                literal("booking_code"), Booking.booking_code,
+                literal("room_number"), Room.room_number,
+                literal(date_key), func.to_char(date_column, literal("DD.MM.YYYY"))
+            ).label("payload")
+        ).join(User, Booking.user_id == User.user_id).join(Room, Booking.room_id == Room.room_id).where(
+            Booking.status == BookingStatus.ACTIVE,
+            date_column == tomorrow
         )
 
-    for booking in checkout_bookings:
-        user = session.query(User).get(booking.user_id)
-        if not user:
-            continue
-
-        booking_data = {
-            'guest_name': f"{user.first_name} {user.last_name}",
-            'booking_code': booking.booking_code,
-            'room_number': booking.room.room_number,
-            'check_out_date': booking.check_out_date.strftime('%d.%m.%Y'),
-        }
-
-        notification_service.notify_checkout_reminder(
-            user.email,
-            user.phone,
-            booking_data
+    try:
+        checkin = enqueue_notifications_from(
+            session, NotificationType.CHECKIN_REMINDER, reminders(Booking.check_in_date, "check_in_date")
         )
-
-    logger.info(f"Sent {len(checkin_bookings)} check-in and {len(checkout_bookings)} check-out reminders")
+        checkout = enqueue_notifications_from(
+            session, NotificationType.CHECKOUT_REMINDER, reminders(Booking.check_out_date, "check_out_date")
+        )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    stats = {
+        "date": tomorrow.isoformat(),
+        "checkin": checkin,
+        "checkout": checkout,
+        "queued": checkin + checkout,
+        "total_seconds": time.perf_counter() - started,
+    }
+    last_reminder_run.clear()
+    last_reminder_run.update(stats)
+
+    logger.info(
+        f"Queued {checkin} check-in and {checkout} check-out reminders in {stats['total_seconds']:.2f}s"
+    )
+    return stats
 
 notification_service = NotificationService()
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""
+Transactional outbox for guest notifications.
+
+Booking writes do not talk to SMTP. ``enqueue_notification`` adds an
+``outbox`` row to the caller's session, so the notification is committed
+together with the booking (or rolled back with it). ``OutboxWorker`` runs
+in a background thread and drains the table with
+``SELECT ... FOR UPDATE SKIP LOCKED``. Several workers, in one process or
+many, each take a different batch without waiting for each other.
+
+A failed delivery is retried after an exponential backoff with jitter. After
+``OUTBOX_MAX_ATTEMPTS`` failures the message is marked FAILED. While the SMTP
+circuit breaker is open, messages are deferred until the cool-down ends
+without using up an attempt. Committing a
+session that enqueued something wakes the local worker, so a message usually
+goes out right after its booking is committed rather than at the next poll.
+"""
+from datetime import timedelta
+import logging
+import os
+import random
+import threading
+
+from sqlalchemy import event, func, insert, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.api.db import SessionLocal
+from src.api.models.outbox_model import OutboxMessage, OutboxStatus
+from src.api.services.notification_service import NotificationType, notification_service
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '20'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv('OUTBOX_RETRY_BASE_SECONDS', '30'))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv('OUTBOX_RETRY_MAX_SECONDS', '3600'))
+OUTBOX_POLL_SECONDS = float(os.getenv('OUTBOX_POLL_SECONDS', '5'))
+
+_ENQUEUED_KEY = "outbox_enqueued"
+
+# Метод NotificationService, що доставляє повідомлення кожного типу
+_SENDERS = {
+    NotificationType.BOOKING_CREATED: "notify_booking_created",
+    NotificationType.GROUP_BOOKING_CREATED: "notify_group_booking_created",
+    NotificationType.BOOKING_CANCELLED: "notify_booking_cancelled",
+    NotificationType.CHECKIN_REMINDER: "notify_checkin_reminder",
+    NotificationType.CHECKOUT_REMINDER: "notify_checkout_reminder",
+}
+
+
+def enqueue_notification(session, kind: NotificationType, recipient, phone, payload):
+    """Add a notification to the session's transaction; it is sent after commit."""
+    message = OutboxMessage(
+        kind=kind.value,
+        recipient=recipient,
+        phone=phone,
+        payload=payload,
+        status=OutboxStatus.PENDING,
+        attempts=0
+    )
+    session.add(message)
+    session.info[_ENQUEUED_KEY] = True
+    return message
+
+
+def enqueue_notifications_from(session, kind: NotificationType, rows):
+    """Add one notification of kind per row of rows, a select of (recipient, phone, payload).
+
+    The rows go to the outbox with a single INSERT ... SELECT in the caller's
+    transaction, so no row is loaded into Python. Returns how many were added.
+    """
+    rows = rows.subquery()
+    result = session.execute(insert(OutboxMessage).from_select(
+        ["kind", "recipient", "phone", "payload", "status", "attempts"],
+        select(
+            literal(kind.value, OutboxMessage.kind.type),
+            rows.c.recipient,
+            rows.c.phone,
+            rows.c.payload,
+            literal(OutboxStatus.PENDING, OutboxMessage.status.type),
+            literal(0, OutboxMessage.attempts.type)
+        )
+    ))
+    if result.rowcount:
+        session.info[_ENQUEUED_KEY] = True
+    return result.rowcount
+
+
+def retry_delay(attempts):
+    """Seconds before the next try after the given number of failed attempts."""
+    delay = min(OUTBOX_RETRY_MAX_SECONDS, OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _send(message):
+    sender = getattr(notification_service, _SENDERS[NotificationType(message.kind)])
+    return sender(message.recipient, message.phone, message.payload)
+
+
+def _deliver(message, max_attempts):
+    deferred_for = notification_service.smtp_breaker.retry_after()
+    if deferred_for and notification_service.email_enabled:
+        # SMTP-сервер недоступний: спробу не витрачаємо, чекаємо кінця cool-down
+        message.available_at = func.now() + timedelta(seconds=deferred_for)
+        message.last_error = "SMTP circuit open, delivery deferred"
+        return False
+
+    message.attempts += 1
+    try:
+        if not notification_service.email_enabled:
+            # без SMTP-облікових даних повтори нічого не змінять
+            message.status = OutboxStatus.FAILED
+            message.last_error = "Email disabled (no SMTP credentials)"
+            return False
+        sent = _send(message)
+        error = None if sent else "Notification service reported a failed delivery"
+    except Exception as e:
+        sent, error = False, str(e)
+
+    if sent:
+        message.status = OutboxStatus.SENT
+        message.sent_at = func.now()
+        message.last_error = None
+    elif message.attempts >= max_attempts:
+        message.status = OutboxStatus.FAILED
+        message.last_error = error
+        logger.error(f"Outbox message {message.id} ({message.kind}) failed after {message.attempts} attempts: {error}")
+    else:
+        message.available_at = func.now() + timedelta(seconds=retry_delay(message.attempts))
+        message.last_error = error
+        logger.warning(f"Outbox message {message.id} ({message.kind}) attempt {message.attempts} failed: {error}")
+    return sent
+
+
+def process_outbox_batch(session, batch_size=OUTBOX_BATCH_SIZE, max_attempts=OUTBOX_MAX_ATTEMPTS):
+    """Deliver up to batch_size due messages. Returns how many were taken.
+
+    The taken rows stay locked until the commit, so concurrent workers skip
+    them instead of sending the same email twice.
+    """
+    try:
+        messages = session.query(OutboxMessage).filter(
+            OutboxMessage.status == OutboxStatus.PENDING,
+            OutboxMessage.available_at <= func.now()
+        ).order_by(OutboxMessage.available_at, OutboxMessage.id).limit(batch_size).with_for_update(
+            skip_locked=True
+        ).all()
+
+        for message in messages:
+            _deliver(message, max_attempts)
+
+        session.commit()
+        return len(messages)
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error(f"Database error processing outbox: {e}")
+        raise Exception(f"Database error: {e}")
+
+
+class OutboxWorker:
+    """Background thread that keeps draining the outbox."""
+
+    def __init__(self, session_factory, poll_interval=OUTBOX_POLL_SECONDS, batch_size=OUTBOX_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+        self._thread.start()
+        logger.info("Outbox worker started")
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def wake(self):
+        self._wake.set()
+
+    def run_once(self):
+        session = self.session_factory()
+        try:
+            return process_outbox_batch(session, self.batch_size)
+        finally:
+            session.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # скидаємо до вибірки: wake() під час обробки не загубиться
+            self._wake.clear()
+            try:
+                taken = self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}")
+                taken = 0
+            if taken < self.batch_size:
+                # черга вичерпана - чекаємо нових повідомлень або наступного опитування
+                self._wake.wait(self.poll_interval)
+
+
+outbox_worker = OutboxWorker(SessionLocal)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_worker_on_commit(session):
+    if session.info.pop(_ENQUEUED_KEY, False):
+        outbox_worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session):
+    session.info.pop(_ENQUEUED_KEY, None)
@@ -0,0 +1,191 @@
+"""
+Password hashing off the request threads.
+
+``User.set_password`` and ``User.check_password`` go through
+``password_hasher``. It runs Werkzeug's ``generate_password_hash`` /
+``check_password_hash`` in a process pool of ``PASSWORD_HASH_WORKERS``
+processes. A burst of logins then queues for those processes instead of
+taking the CPU from every other request on the worker.
+
+The queue is bounded. When ``PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE``
+hashes are already in flight, the next one is refused at once with
+``PasswordHasherBusy`` (the app answers 503 with Retry-After) rather than
+waiting behind them. A hash stays in flight until the pool is done with it,
+even if its caller gave up after ``PASSWORD_HASH_TIMEOUT`` seconds. If a pool
+process dies, the call fails with ``PasswordHasherBusy`` and the next one
+starts a new pool.
+
+The hash method is ``PASSWORD_HASH_METHOD`` (any Werkzeug method string, e.g.
+``pbkdf2:sha256:600000`` or ``scrypt:32768:8:1``). ``needs_rehash`` tells
+whether a stored hash was made with other parameters; login then stores a
+new hash of the password it has just verified.
+
+``PASSWORD_HASH_WORKERS=0`` hashes in the calling thread (no pool).
+"""
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+PASSWORD_HASH_SALT_LENGTH = int(os.getenv('PASSWORD_HASH_SALT_LENGTH', '16'))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', str(4 * (os.cpu_count() or 1))))
+PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashes in flight; the request should be retried later"""
+
+    def __init__(self, message="Password hashing is busy", retry_after=1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def normalize_method(method):
+    """Werkzeug method string with its default parameters spelled out, as it appears in a stored hash"""
+    parts = method.split(':')
+    if parts[0] == 'pbkdf2':
+        hash_name = parts[1] if len(parts) > 1 else 'sha256'
+        iterations = parts[2] if len(parts) > 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    if method == 'scrypt':
+        return 'scrypt:32768:8:1'
+    return method
+
+
+# Виконуються в процесах пулу: лише функції модуля, без стану застосунку
+def _hash(password, method, salt_length):
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def _verify(stored, password):
+    return check_password_hash(stored, password)
+
+
+class PasswordHasher:
+    """Bounded process pool for password hashing and verification."""
+
+    def __init__(self, method=PASSWORD_HASH_METHOD, salt_length=PASSWORD_HASH_SALT_LENGTH,
+                 workers=PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE, timeout=PASSWORD_HASH_TIMEOUT):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.prefix = normalize_method(method)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def limit(self):
+        return self.workers + self.max_queue
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn: дочірні процеси не успадковують потоки і з'єднання процесу застосунку
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.limit:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+            executor = self._pool() if self.workers > 0 else None
+        started = time.perf_counter()
+        if executor is None:
+            try:
+                return fn(*args)
+            finally:
+                self._release(started, completed=True)
+
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._release(started, completed=False)
+            self._drop_pool(executor)
+            raise PasswordHasherBusy("Password hashing pool is restarting")
+        # місце звільняється, лише коли процес пулу справді закінчив (або завдання скасоване),
+        # тож workers + max_queue обмежує і внутрішню чергу пулу
+        future.add_done_callback(
+            lambda done: self._release(started, completed=not done.cancelled() and done.exception() is None)
+        )
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # ще в черзі - скасовується; якщо вже рахується, місце тримається до кінця
+            future.cancel()
+            raise PasswordHasherBusy("Password hashing timed out")
+        except BrokenProcessPool:
+            # процес пулу загинув - наступний виклик створить новий пул; хешувати
+            # в потоці запиту не можна, тому запит отримає 503
+            self._drop_pool(executor)
+            raise PasswordHasherBusy("Password hashing pool is restarting")
+
+    def _release(self, started, completed):
+        with self._lock:
+            self._in_flight -= 1
+            if completed:
+                self.completed += 1
+                self._busy_seconds += time.perf_counter() - started
+
+    def _drop_pool(self, executor):
+        logger.error("Password hashing pool is broken, recreating")
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def hash(self, password):
+        return self._run(_hash, password, self.method, self.salt_length)
+
+    def verify(self, stored, password):
+        return self._run(_verify, stored, password)
+
+    def record_rehash(self):
+        with self._lock:
+            self.rehashed += 1
+
+    def needs_rehash(self, stored):
+        """True if stored was hashed with a method or parameters other than the configured ones"""
+        if not isinstance(stored, str) or '$' not in stored:
+            return False
+        return stored.split('$', 1)[0] != self.prefix
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "method": self.prefix,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_ms": round(self._busy_seconds / self.completed * 1000, 2) if self.completed else 0.0
+            }
+
+
+password_hasher = PasswordHasher()
@@ -1,6 +1,7 @@
 from src.api.models.review_model import Review
 from src.api.models.user_model import User
 from datetime import datetime
+from src.api.pagination import keyset_page
 
 
 def get_all_reviews(db):
@@ -14,6 +15,15 @@ def get_all_reviews(db):
     return reviews
 
 
+def get_reviews_page(db, limit, cursor=None):
+    """Get one keyset page of approved reviews, newest first"""
+    return keyset_page(
+        db.query(Review).filter(Review.is_approved == True),
+        [Review.created_at, Review.review_id],
+        limit, cursor, descending=True
+    )
+
+
 def get_review_by_id(db, review_id):
     """Get a specific review by ID"""
     review = db.get(Review, review_id)
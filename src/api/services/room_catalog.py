@@ -0,0 +1,195 @@
+"""
+Per-process cache of the room catalog as ready-to-send JSON.
+
+Rooms change only when an admin edits them, yet every unfiltered
+``GET /api/v1/rooms/?all=true`` read the whole table and serialized it through
+``RoomOutSchema``, and so did every ``GET /api/v1/rooms/<id>``. ``room_catalog``
+loads all rooms with one query, serializes them once and keeps the bytes: the
+full list body, and a body plus ETag for each room. Until the next change the
+list is answered from memory without touching the database. A single room
+costs one primary-key lookup of its version: if the catalog has no such room,
+or has it with another version (created or changed by another process), the
+catalog is dropped and the room is served from its row, so the body and ETag
+are never older than the database.
+
+The bytes are what Flask's default JSON provider writes with DEBUG off (sorted
+keys, compact separators, trailing newline), so a cached response does not
+differ from a freshly serialized one.
+
+Invalidation is write-through, the same way the identity cache follows users:
+a session that flushes a new, changed or deleted Room (``create_room``,
+``update_room_partial``, ``update_room_full``, ``delete_room`` or any other
+code path) or runs a bulk INSERT/UPDATE/DELETE on rooms drops the catalog when
+it commits, and the next read reloads it. In the list, changes made by other
+processes are picked up after ``max_age`` seconds (``ROOM_CATALOG_MAX_AGE``)
+or as soon as a single-room read finds a newer version.
+"""
+from itertools import chain
+import json
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.api.models.room_model import Room
+from src.api.schemas.room_schema import RoomOutSchema
+from src.api.services.room_service import get_all_rooms
+from src.api.versioning import make_etag
+
+_CHANGED_KEY = "room_catalog_changed"
+
+
+def _to_json(data):
+    return (json.dumps(data, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class _Snapshot:
+    """Serialized catalog as loaded at one moment."""
+    __slots__ = ("list_body", "rooms", "loaded_at")
+
+    def __init__(self, list_body, rooms, loaded_at):
+        self.list_body = list_body
+        # room_id -> (body, ETag, version)
+        self.rooms = rooms
+        self.loaded_at = loaded_at
+
+
+class RoomCatalog:
+    """Thread-safe cache of the serialized room list and of each room."""
+
+    def __init__(self, max_age=60.0, clock=time.monotonic):
+        self.max_age = max_age
+        self._clock = clock
+        self._snapshot = None
+        self._lock = threading.Lock()
+        # завантажує один потік, решта чекають на його результат
+        self._load_lock = threading.Lock()
+        # змінюється при кожній інвалідації: каталог, прочитаний з БД до неї, не кешується
+        self._generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.loads = 0
+            self.invalidations = 0
+
+    def _fresh(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if self.max_age is not None and self._clock() - snapshot.loaded_at > self.max_age:
+            return None
+        return snapshot
+
+    def _get(self, session, load):
+        if session.info.get(_CHANGED_KEY):
+            # незакомічені зміни кімнат цієї сесії не мають потрапити в кеш
+            with self._lock:
+                self.misses += 1
+            return self._build(session, load)
+
+        with self._lock:
+            snapshot = self._fresh()
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+
+        with self._load_lock:
+            with self._lock:
+                snapshot = self._fresh()
+                if snapshot is not None:
+                    return snapshot
+                generation = self._generation
+            snapshot = self._build(session, load)
+            with self._lock:
+                self.loads += 1
+                if generation == self._generation:
+                    self._snapshot = snapshot
+        return snapshot
+
+    def _build(self, session, load):
+        schema = RoomOutSchema()
+        items = []
+        rooms = {}
+        for room in load(session):
+            item = schema.dump(room)
+            items.append(item)
+            rooms[room.room_id] = (_to_json(item), make_etag(room.version), room.version)
+        return _Snapshot(_to_json(items), rooms, self._clock())
+
+    def list_body(self, session, load=get_all_rooms):
+        """JSON body of the full room list; load(session) returns all rooms on a miss."""
+        return self._get(session, load).list_body
+
+    def room(self, session, room_id, load=get_all_rooms):
+        """(JSON body, ETag) of one room, or None if there is no such room."""
+        version = session.query(Room.version).filter(Room.room_id == room_id).scalar()
+        cached = self._get(session, load).rooms.get(room_id)
+        if cached is not None and cached[2] == version:
+            return cached[:2]
+
+        if cached is not None or version is not None:
+            # каталог відстав від змін іншого процесу
+            self.invalidate()
+        if version is None:
+            return None
+        # populate_existing: об'єкт з identity map сесії міг бути завантажений раніше
+        room = session.query(Room).populate_existing().get(room_id)
+        if room is None:
+            return None
+        return _to_json(RoomOutSchema().dump(room)), make_etag(room.version)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+            self.invalidations += 1
+
+    def snapshot(self):
+        with self._lock:
+            catalog = self._snapshot
+            lookups = self.hits + self.misses
+            return {
+                "rooms": len(catalog.rooms) if catalog else 0,
+                "list_bytes": len(catalog.list_body) if catalog else 0,
+                "age_seconds": round(self._clock() - catalog.loaded_at, 1) if catalog else None,
+                "max_age_seconds": self.max_age,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "loads": self.loads,
+                "invalidations": self.invalidations
+            }
+
+
+room_catalog = RoomCatalog(max_age=float(os.getenv('ROOM_CATALOG_MAX_AGE', '60')))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_room_changes(session, flush_context):
+    if any(isinstance(obj, Room) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_room_writes(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(mapper.class_ is Room for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_room_catalog(session):
+    if session.info.pop(_CHANGED_KEY, False):
+        room_catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_room_changes(session):
+    session.info.pop(_CHANGED_KEY, None)
@@ -1,5 +1,8 @@
 from src.api.models.room_model import Room, Amenity, RoomAmenity, RoomType, RoomStatus
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.exc import StaleDataError
+from src.api.versioning import VersionConflictError, check_version
 import logging
 
 logger = logging.getLogger(__name__)
@@ -85,11 +88,12 @@ def create_room(session, data):
         raise
 
 
-def update_room_partial(session, room_id, data):
+def update_room_partial(session, room_id, data, expected_version=None):
     try:
         room = session.query(Room).get(room_id)
         if not room:
             raise ValueError(f"Room with ID {room_id} not found")
+        check_version(room, expected_version)
 
         if 'room_number' in data and data['room_number'] != room.room_number:
             existing = get_room_by_number(session, data['room_number'])
@@ -127,6 +131,8 @@ def update_room_partial(session, room_id, data):
                     )
                     session.add(room_amenity)
 
+        # UPDATE рядка rooms навіть якщо змінились лише amenities: версія перевіряється й зростає
+        flag_modified(room, 'room_number')
         session.commit()
         logger.info(f"Updated room {room_id}")
         return room
@@ -138,6 +144,9 @@ def update_room_partial(session, room_id, data):
     except ValueError:
         session.rollback()
         raise
+    except StaleDataError:
+        session.rollback()
+        raise VersionConflictError(f"Room {room_id} was modified by another request")
     except SQLAlchemyError as e:
         session.rollback()
         logger.error(f"Database error updating room {room_id}: {e}")
@@ -148,11 +157,12 @@ def update_room_partial(session, room_id, data):
         raise
 
 
-def update_room_full(session, room_id, data):
+def update_room_full(session, room_id, data, expected_version=None):
     try:
         room = session.query(Room).get(room_id)
         if not room:
             raise ValueError(f"Room with ID {room_id} not found")
+        check_version(room, expected_version)
 
         if data.get('room_number') != room.room_number:
             existing = get_room_by_number(session, data.get('room_number'))
@@ -197,6 +207,7 @@ def update_room_full(session, room_id, data):
                 )
                 session.add(room_amenity)
 
+        flag_modified(room, 'room_number')
         session.commit()
         logger.info(f"Fully updated room {room_id}")
         return room
@@ -208,6 +219,9 @@ def update_room_full(session, room_id, data):
     except ValueError:
         session.rollback()
         raise
+    except StaleDataError:
+        session.rollback()
+        raise VersionConflictError(f"Room {room_id} was modified by another request")
     except SQLAlchemyError as e:
         session.rollback()
         logger.error(f"Database error updating room {room_id}: {e}")
@@ -0,0 +1,117 @@
+"""
+Pool of authenticated SMTP connections.
+
+Opening an SMTP session costs a TCP connect, EHLO, STARTTLS (a TLS handshake)
+and AUTH before the first message. The pool keeps sessions open and hands them
+out again, so a burst of mail pays that price once per connection instead of
+once per message.
+
+A connection that sat idle longer than ``idle_timeout`` is closed rather than
+reused, because servers drop idle clients after a while. One idle longer than
+``health_check_after`` is probed with NOOP before reuse. A connection that
+fails while checked out is discarded, and the caller reconnects through the
+pool.
+"""
+from contextlib import contextmanager
+import logging
+import smtplib
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Помилки конкретного листа: з'єднання після них придатне до подальшої роботи
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+def _connection_survives(error):
+    return isinstance(error, MESSAGE_ERRORS) and getattr(error, "smtp_code", None) != 421
+
+
+class SMTPConnectionPool:
+    """Thread-safe LIFO pool of at most max_size SMTP connections.
+
+    connect is a callable returning a ready (connected and logged in) client.
+    """
+
+    def __init__(self, connect, max_size=4, idle_timeout=60.0, health_check_after=10.0):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"opened": 0, "reused": 0, "closed_idle": 0, "failed_health_checks": 0, "discarded": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the with block."""
+        self._slots.acquire()
+        server = None
+        try:
+            server = self._checkout()
+            yield server
+        except Exception as e:
+            if server is not None and not _connection_survives(e):
+                self._count("discarded")
+                self._close(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                with self._lock:
+                    self._idle.append((server, time.monotonic()))
+            self._slots.release()
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                server, last_used = self._idle.pop() if self._idle else (None, None)
+            if server is None:
+                server = self._connect()
+                self._count("opened")
+                return server
+
+            idle = time.monotonic() - last_used
+            if idle >= self.idle_timeout:
+                self._count("closed_idle")
+                self._close(server)
+                continue
+            if idle >= self.health_check_after and not self._healthy(server):
+                self._count("failed_health_checks")
+                self._close(server)
+                continue
+            self._count("reused")
+            return server
+
+    @staticmethod
+    def _healthy(server):
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
@@ -0,0 +1,273 @@
+"""
+Revocation of JWTs before their expiry.
+
+Revoked tokens are rows of ``revoked_tokens`` keyed by the token's ``jti``
+claim. ``revoke_token`` adds the row to the caller's session, so the
+revocation commits together with the change that caused it (e.g. a new
+password).
+
+Checking a token must not cost a query, so every process mirrors the table
+in ``revocation_list``:
+
+* a Bloom filter over all unexpired revoked jtis - a negative answer, the
+  usual one, is final;
+* an exact set of the most recently revoked jtis (bounded), which answers
+  most positives;
+* the database, asked only when the Bloom filter says "maybe" and the exact
+  set does not know the jti. Answers to such lookups are remembered.
+
+The mirror is refreshed incrementally: at most every
+``REVOCATION_REFRESH_SECONDS`` the next check reads rows revoked since the
+previous refresh (with ``REVOCATION_REFRESH_OVERLAP_SECONDS`` of overlap for
+transactions that committed late). Revocations committed by this process
+are added at once by a session listener. The filter is rebuilt from the
+table when it holds more entries than it was sized for, which also drops
+expired tokens.
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
+from sqlalchemy import event, select, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.api.db import SessionLocal
+from src.api.models.revoked_token_model import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_BLOOM_CAPACITY = int(os.getenv('REVOCATION_BLOOM_CAPACITY', '100000'))
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv('REVOCATION_BLOOM_ERROR_RATE', '0.001'))
+REVOCATION_EXACT_SIZE = int(os.getenv('REVOCATION_EXACT_SIZE', '10000'))
+REVOCATION_REFRESH_SECONDS = float(os.getenv('REVOCATION_REFRESH_SECONDS', '5'))
+REVOCATION_REFRESH_OVERLAP_SECONDS = float(os.getenv('REVOCATION_REFRESH_OVERLAP_SECONDS', '30'))
+
+_REVOKED_KEY = "revoked_tokens_pending"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on SHA-256)."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """Per-process mirror of revoked_tokens; see the module docstring."""
+
+    def __init__(self, session_factory, capacity=REVOCATION_BLOOM_CAPACITY, error_rate=REVOCATION_BLOOM_ERROR_RATE,
+                 exact_size=REVOCATION_EXACT_SIZE, refresh_interval=REVOCATION_REFRESH_SECONDS,
+                 overlap=REVOCATION_REFRESH_OVERLAP_SECONDS, clock=time.monotonic):
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact_size = exact_size
+        self.refresh_interval = refresh_interval
+        self.overlap = timedelta(seconds=overlap)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+            self._exact = OrderedDict()
+            # jti, на які Bloom-фільтр помилково відповів "можливо"
+            self._not_revoked = OrderedDict()
+            # None - список ще не завантажено з БД
+            self._since = None
+            self._refreshed_at = None
+            self.checks = 0
+            self.bloom_negatives = 0
+            self.db_lookups = 0
+            self.false_positives = 0
+            self.refreshes = 0
+            self.rebuilds = 0
+
+    def _remember(self, entries, jti, value):
+        entries[jti] = value
+        entries.move_to_end(jti)
+        while len(entries) > self.exact_size:
+            entries.popitem(last=False)
+
+    def add(self, jti, expires_at=None):
+        with self._lock:
+            self._add(jti, expires_at)
+
+    def _add(self, jti, expires_at):
+        if jti not in self._exact:
+            self._bloom.add(jti)
+        self._not_revoked.pop(jti, None)
+        self._remember(self._exact, jti, expires_at)
+
+    def is_revoked(self, jti):
+        """True if the token with this jti was revoked."""
+        if not jti:
+            return False
+        self.maybe_refresh()
+        with self._lock:
+            self.checks += 1
+            if jti not in self._bloom:
+                self.bloom_negatives += 1
+                return False
+            if jti in self._exact:
+                return True
+            if jti in self._not_revoked:
+                return False
+            self.db_lookups += 1
+
+        revoked = self._lookup(jti)
+        with self._lock:
+            if revoked:
+                self._remember(self._exact, jti, None)
+            else:
+                self.false_positives += 1
+                self._remember(self._not_revoked, jti, True)
+        return revoked
+
+    def _lookup(self, jti):
+        session = self.session_factory()
+        try:
+            return session.execute(select(RevokedToken.id).where(RevokedToken.jti == jti)).first() is not None
+        except SQLAlchemyError as e:
+            # БД недоступна: токен пройшов Bloom-фільтр, тож вважаємо його відкликаним
+            logger.error(f"Revocation lookup failed: {e}")
+            return True
+        finally:
+            session.close()
+
+    def maybe_refresh(self):
+        """Refresh from the table if the last refresh is older than refresh_interval."""
+        refreshed_at = self._refreshed_at
+        if refreshed_at is not None and self._clock() - refreshed_at < self.refresh_interval:
+            return
+        # оновлює один потік; решта перевіряють за поточною копією
+        if not self._refresh_lock.acquire(blocking=refreshed_at is None):
+            return
+        try:
+            session = self.session_factory()
+            try:
+                self.refresh(session)
+            finally:
+                session.close()
+        except SQLAlchemyError as e:
+            logger.error(f"Revocation list refresh failed: {e}")
+            # не повторюємо на кожному запиті, поки БД недоступна
+            self._refreshed_at = self._clock()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self, session):
+        """Load revocations since the previous refresh; the first call (or a full filter) loads all."""
+        started = datetime.now(timezone.utc)
+        with self._lock:
+            since = self._since
+            rebuild = since is None or self._bloom.count > self._bloom.capacity
+
+        # за revoked_at: у точній множині лишаються найновіші
+        query = select(RevokedToken.jti, RevokedToken.expires_at).order_by(RevokedToken.revoked_at)
+        if rebuild:
+            query = query.where(RevokedToken.expires_at > started)
+        else:
+            query = query.where(RevokedToken.revoked_at >= since - self.overlap)
+        rows = session.execute(query).all()
+
+        with self._lock:
+            if rebuild:
+                self._bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+                self._exact.clear()
+                self._not_revoked.clear()
+                self.rebuilds += 1
+            for jti, expires_at in rows:
+                self._add(jti, expires_at)
+            self._since = started
+            self._refreshed_at = self._clock()
+            self.refreshes += 1
+        return len(rows)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "bloom_entries": self._bloom.count,
+                "bloom_bits": self._bloom.num_bits,
+                "bloom_hashes": self._bloom.num_hashes,
+                "exact_entries": len(self._exact),
+                "checks": self.checks,
+                "bloom_negatives": self.bloom_negatives,
+                "db_lookups": self.db_lookups,
+                "false_positives": self.false_positives,
+                "refreshes": self.refreshes,
+                "rebuilds": self.rebuilds
+            }
+
+
+revocation_list = RevocationList(SessionLocal)
+
+
+def revoke_token(session, claims, reason):
+    """Add a revocation of the token with these claims to the session's transaction."""
+    jti = claims.get('jti')
+    if not jti:
+        # токени, видані до появи jti, відкликати неможливо - вони спливуть самі
+        return None
+    expires_at = datetime.fromtimestamp(claims['exp'], tz=timezone.utc)
+    revoked = RevokedToken(jti=jti, user_id=claims.get('user_id'), reason=reason, expires_at=expires_at)
+    session.add(revoked)
+    session.info.setdefault(_REVOKED_KEY, []).append((jti, expires_at))
+    return revoked
+
+
+def is_token_revoked(claims):
+    return revocation_list.is_revoked(claims.get('jti'))
+
+
+def prune_expired_revocations(session):
+    """Delete revocations of tokens that have expired anyway."""
+    try:
+        result = session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc))
+        )
+        session.commit()
+        return result.rowcount
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error(f"Error pruning revoked tokens: {e}")
+        raise Exception(f"Database error: {e}")
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_revocations(session):
+    for jti, expires_at in session.info.pop(_REVOKED_KEY, ()):
+        revocation_list.add(jti, expires_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_revocations(session):
+    session.info.pop(_REVOKED_KEY, None)
@@ -0,0 +1,131 @@
+"""
+SERIALIZABLE transactions with automatic retry.
+
+Under SERIALIZABLE isolation Postgres aborts one of two transactions whose
+reads and writes could not have happened in some serial order, with SQLSTATE
+40001 (serialization_failure); 40P01 (deadlock_detected) is handled the same
+way. Such a transaction has done nothing and can simply be run again, which is
+what ``retry_on_serialization_failure`` does: it rolls the session back, sleeps
+a random "full jitter" backoff so that the colliding transactions do not retry
+in lockstep, and calls the function again.
+"""
+from functools import wraps
+import logging
+import random
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_SQLSTATES = ("40001", "40P01")
+_FLUSHED_KEY = "tx_retry_flushed"
+
+
+class RetryMetrics:
+    """Thread-safe counters of retried transactions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.attempts = 0
+            self.retries = 0
+            self.exhausted = 0
+
+    def record(self, attempts, exhausted=False):
+        with self._lock:
+            self.calls += 1
+            self.attempts += attempts
+            self.retries += attempts - 1
+            if exhausted:
+                self.exhausted += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "retry_rate": round(self.retries / self.attempts, 4) if self.attempts else 0.0
+            }
+
+
+retry_metrics = RetryMetrics()
+
+
+class RetriesExhaustedError(ValueError):
+    """A serializable transaction kept failing after every retry."""
+
+
+def is_serialization_failure(error):
+    orig = getattr(error, "orig", None)
+    return isinstance(error, DBAPIError) and getattr(orig, "pgcode", None) in RETRYABLE_SQLSTATES
+
+
+def begin_serializable(session):
+    """Start a new SERIALIZABLE transaction on session.
+
+    The isolation level can only be chosen before a transaction's first
+    statement, so a transaction the session already has open is rolled back
+    first. That is only done for a read-only transaction: if the session holds
+    changes, flushed or not, RuntimeError is raised instead of committing or
+    discarding them outside the retried transaction.
+    """
+    if session.new or session.dirty or session.deleted or session.info.get(_FLUSHED_KEY):
+        raise RuntimeError("begin_serializable: the session has uncommitted changes")
+    session.rollback()
+    session.connection(execution_options={"isolation_level": "SERIALIZABLE"})
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session, flush_context):
+    session.info[_FLUSHED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_flushed_on_commit(session):
+    session.info.pop(_FLUSHED_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_flushed_on_rollback(session):
+    session.info.pop(_FLUSHED_KEY, None)
+
+
+def retry_on_serialization_failure(max_attempts=5, base_delay=0.005, max_delay=0.2, metrics=retry_metrics):
+    """Retry a function(session, ...) while it fails with a serialization failure.
+
+    The n-th retry sleeps uniform(0, min(max_delay, base_delay * 2**n)) seconds.
+    After max_attempts failures RetriesExhaustedError is raised.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(session, *args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    result = fn(session, *args, **kwargs)
+                    metrics.record(attempt)
+                    return result
+                except DBAPIError as e:
+                    if not is_serialization_failure(e):
+                        raise
+                    session.rollback()
+                    if attempt == max_attempts:
+                        metrics.record(attempt, exhausted=True)
+                        logger.error(f"{fn.__name__} gave up after {attempt} serialization failures")
+                        raise RetriesExhaustedError(
+                            "Room is not available right now due to concurrent bookings - please try again"
+                        )
+                    delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+                    logger.info(f"{fn.__name__}: serialization failure, retry {attempt} in {delay * 1000:.1f} ms")
+                    time.sleep(delay)
+        return wrapper
+    return decorator
@@ -1,6 +1,8 @@
 from src.api.models.user_model import User, UserRole
 import datetime
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from src.api.pagination import keyset_page
+from src.api.services.password_hasher import password_hasher, PasswordHasherBusy
 
 
 def get_all_users(session):
@@ -64,27 +66,47 @@ def create_user(session, data, via_booking=False):
         raise e
 
 
-def search_users(session, role: str = None, last_name: str = None):
-    try:
-        query = session.query(User)
+def _users_query(session, role: str = None, last_name: str = None):
+    """Users filtered by role/last_name, or None if the role is unknown."""
+    query = session.query(User)
 
-        if role:
-            try:
-                role_enum = UserRole[role]
-                query = query.filter(User.role == role_enum)
-            except KeyError:
-                return []
+    if role:
+        try:
+            role_enum = UserRole[role]
+            query = query.filter(User.role == role_enum)
+        except KeyError:
+            return None
 
-        if last_name:
-            like_value = f"%{last_name}%"
-            query = query.filter(User.last_name.ilike(like_value))
+    if last_name:
+        like_value = f"%{last_name}%"
+        query = query.filter(User.last_name.ilike(like_value))
 
+    return query
+
+
+def search_users(session, role: str = None, last_name: str = None):
+    try:
+        query = _users_query(session, role=role, last_name=last_name)
+        if query is None:
+            return []
         return query.all()
     except SQLAlchemyError as e:
         print(f"Database error searching users: {e}")
         raise
 
 
+def get_users_page(session, limit, cursor=None, role: str = None, last_name: str = None):
+    """One keyset page of users ordered by user_id. Returns (users, next_cursor)."""
+    try:
+        query = _users_query(session, role=role, last_name=last_name)
+        if query is None:
+            return [], None
+        return keyset_page(query, [User.user_id], limit, cursor)
+    except SQLAlchemyError as e:
+        print(f"Database error fetching users page: {e}")
+        raise
+
+
 def get_user_by_id(session, user_id):
     try:
         return session.query(User).get(user_id)
@@ -101,6 +123,36 @@ def get_user_by_email(session, email):
         return None
 
 
+def rehash_password(session, user, password):
+    """Re-hash a just verified password if its stored hash uses other parameters than configured.
+
+    A plain UPDATE guarded by the old hash: a password changed meanwhile is
+    not overwritten, and token_version stays as is - the password is the same.
+    """
+    if not password_hasher.needs_rehash(user.password):
+        return False
+    users = User.__table__
+    old_hash = user.password
+    try:
+        new_hash = password_hasher.hash(password)
+        result = session.execute(
+            users.update()
+            .where(users.c.user_id == user.user_id, users.c.password == old_hash)
+            .values(password=new_hash)
+        )
+        session.commit()
+    except PasswordHasherBusy:
+        # оновимо при наступному вході
+        return False
+    except SQLAlchemyError as e:
+        session.rollback()
+        print(f"Database error rehashing password of user {user.user_id}: {e}")
+        return False
+    if result.rowcount:
+        password_hasher.record_rehash()
+    return bool(result.rowcount)
+
+
 def update_user_partial(session, user_id, data):
     user = session.query(User).get(user_id)
     if not user:
@@ -0,0 +1,49 @@
+"""
+Optimistic concurrency for versioned resources (ETag / If-Match).
+
+Booking and Room carry a ``version`` column mapped as SQLAlchemy's
+``version_id_col``: every UPDATE is issued as
+``UPDATE ... WHERE pk = :pk AND version = :loaded_version`` and increments the
+version, so a write based on a stale read matches no row and fails with
+StaleDataError instead of silently overwriting someone else's change.
+
+The version is exposed as a strong ETag ``"<version>"``. PATCH and PUT accept
+``If-Match``; a mismatch is rejected with 412 before anything is written, so a
+client holding an ETag can write without re-reading first.
+"""
+
+
+class VersionConflictError(ValueError):
+    """The resource was modified since the version the client based its write on."""
+
+
+def make_etag(version):
+    return f'"{version}"'
+
+
+def parse_if_match(header):
+    """Version expected by an If-Match header, or None if there is no precondition.
+
+    Only a single ETag produced by make_etag is accepted; "*" means "any
+    version" and is treated as no precondition.
+    """
+    if header is None:
+        return None
+    header = header.strip()
+    if header in ("", "*"):
+        return None
+    if header.startswith("W/"):
+        # If-Match вимагає сильного порівняння - слабкий тег ніколи не збігається
+        raise VersionConflictError("Weak ETags cannot be used with If-Match")
+    try:
+        return int(header.strip('"'))
+    except ValueError:
+        raise VersionConflictError(f"Unrecognized ETag: {header}")
+
+
+def check_version(obj, expected_version):
+    if expected_version is not None and obj.version != expected_version:
+        raise VersionConflictError(
+            f"Version mismatch: expected {expected_version}, current is {obj.version}"
+        )
+
@@ -199,6 +199,14 @@ class AuthManager {
     }
 
     logout() {
+        if (this.token) {
+            // відкликаємо токен на сервері; локальний вихід від відповіді не залежить
+            fetch('/api/v1/auth/logout', {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${this.token}` },
+                keepalive: true
+            }).catch(() => {});
+        }
         this.token = null;
         this.user = null;
         localStorage.removeItem('user');
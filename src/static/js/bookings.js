@@ -33,7 +33,7 @@ async function loadBookings(filterStatus = bookingsState.status) {
     try {
         container.innerHTML = '<div class="loading">Завантаження бронювань...</div>';
         
-        const response = await fetch('/api/v1/bookings/');
+        const response = await fetch('/api/v1/bookings/?all=true');
         if (!response.ok) throw new Error('Помилка завантаження');
 
         let bookings = await response.json();
@@ -380,7 +380,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function loadAvailableRooms() {
         try {
-            const res = await fetch('/api/v1/rooms/');
+            const res = await fetch('/api/v1/rooms/?all=true');
             if (!res.ok) throw new Error('Помилка завантаження кімнат');
             const rooms = await res.json();
 
@@ -511,7 +511,7 @@ globalThis.openEditBooking = function(booking) {
     (async () => {
         await (async function(target){
             try {
-                const res = await fetch('/api/v1/rooms/');
+                const res = await fetch('/api/v1/rooms/?all=true');
                 if (!res.ok) throw new Error('Помилка завантаження кімнат');
                 const rooms = await res.json();
                 target.innerHTML = `
@@ -16,7 +16,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
 async function loadRooms() {
     try {
-        const response = await fetch('/api/v1/rooms/');
+        const response = await fetch('/api/v1/rooms/?all=true');
         if (response.ok) {
             const rooms = await response.json();
             console.log('Loaded rooms:', rooms);
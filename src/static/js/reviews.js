@@ -10,7 +10,7 @@ async function loadReviews() {
     const emptyState = document.getElementById('empty-state');
     
     try {
-        const response = await fetch('/api/v1/reviews/');
+        const response = await fetch('/api/v1/reviews/?all=true');
         
         if (!response.ok) {
             throw new Error('Помилка завантаження відгуків');
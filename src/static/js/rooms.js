@@ -22,6 +22,7 @@ async function loadRooms(params = {}) {
     
     try {
         const url = new URL('/api/v1/rooms/', window.location.origin);
+        url.searchParams.set('all', 'true');
         Object.entries(params).forEach(([k, v]) => {
             if (v !== undefined && v !== null && v !== '') {
                 url.searchParams.set(k, v);
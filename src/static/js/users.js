@@ -63,8 +63,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
             if (roleVal) params.set('role', roleVal);
             if (lastNameVal) params.set('last_name', lastNameVal);
+            params.set('all', 'true');
 
-            const url = params.toString() ? `/api/v1/users/?${params.toString()}` : '/api/v1/users/';
+            const url = `/api/v1/users/?${params.toString()}`;
             const response = await authManager.makeAuthenticatedRequest(url);
             const users = await response.json();
             usersTableBody.innerHTML = '';
@@ -1,16 +1,50 @@
+import os
+
+# Тести самі викликають process_outbox_batch - фоновий worker лише заважав би
+os.environ.setdefault("OUTBOX_WORKER_ENABLED", "false")
+
 import pytest
+import socket
+import socketserver
+import threading
+import time
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.api.app import app as flask_app
+from src.api.auth import token_claims_cache
 from src.api.db import Base, get_db
 from src.api.config import TestingConfig
-import os
 from src.api.models.booking_model import Booking
 from src.api.models.room_model import RoomAmenity, Room, Amenity
 from src.api.models.user_model import User
+from src.api.models.outbox_model import OutboxMessage
+from src.api.models.revoked_token_model import RevokedToken
+from src.api.services.availability_index import availability_index
+from src.api.services.identity_cache import identity_cache, token_version_cache
+from src.api.services.notification_service import notification_service
+from src.api.services.room_catalog import room_catalog
+from src.api.services.token_revocation import revocation_list
 
 TEST_DATABASE_URL = os.getenv("DATABASE_URL", TestingConfig.DATABASE_URL)
 
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", default=False,
+                     help="run the load benchmarks marked with @pytest.mark.benchmark")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: long load benchmark, runs only with --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
 engine = create_engine(TEST_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -19,6 +53,7 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 def prepare_database():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    availability_index.invalidate()
     yield
     Base.metadata.drop_all(bind=engine)
     engine.dispose()
@@ -57,13 +92,109 @@ def client(app):
     return app.test_client()
 
 
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Локальний SMTP-сервер для тестів: приймає будь-який AUTH і рахує листи.
+
+    connect_delay імітує вартість встановлення сесії (TCP + TLS + AUTH),
+    data_delay - сервер, що "зависає" після отримання листа.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_delay=0.0):
+        super().__init__(("127.0.0.1", 0), _SMTPSinkHandler)
+        self.host, self.port = self.server_address
+        self.connect_delay = connect_delay
+        self.data_delay = 0.0
+        self.connections = 0
+        self.messages = []
+        self._sockets = set()
+        self._lock = threading.Lock()
+
+    def disconnect_all(self):
+        """Розірвати всі відкриті сесії, як сервер, що закриває неактивних клієнтів"""
+        with self._lock:
+            sockets, self._sockets = self._sockets, set()
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        sink = self.server
+        time.sleep(sink.connect_delay)
+        with sink._lock:
+            sink.connections += 1
+            sink._sockets.add(self.connection)
+        self._reply("220 sink ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode(errors="replace").strip()[:4].upper()
+            if verb == "EHLO":
+                # одним записом: інакше Nagle + delayed ACK додають ~40 мс
+                self._reply("250-sink\r\n250 AUTH PLAIN LOGIN")
+            elif verb == "AUTH":
+                self._reply("235 Authentication successful")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data_line in iter(self.rfile.readline, b""):
+                    if data_line == b".\r\n":
+                        break
+                    lines.append(data_line)
+                time.sleep(sink.data_delay)
+                with sink._lock:
+                    sink.messages.append(b"".join(lines))
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            else:
+                self._reply("502 Command not implemented")
+
+
+@pytest.fixture
+def smtp_sink():
+    sink = SMTPSink()
+    thread = threading.Thread(target=sink.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield sink
+    sink.shutdown()
+    sink.disconnect_all()
+    sink.server_close()
+
+
 @pytest.fixture(autouse=True)
 def cleanup_data():
 
     yield
 
+    # відкритий тестом SMTP circuit breaker не повинен впливати на наступні тести
+    notification_service.smtp_breaker.reset()
+    # тести підміняють auth.db - закешовані ними користувачі не мають пережити тест
+    for cache in (identity_cache, token_version_cache):
+        cache.clear()
+        cache.reset_stats()
+    token_claims_cache.clear()
+    revocation_list.clear()
+    room_catalog.invalidate()
+    room_catalog.reset_stats()
+
     session = TestingSessionLocal()
     try:
+        session.query(OutboxMessage).delete(synchronize_session=False)
+        session.query(RevokedToken).delete(synchronize_session=False)
         session.query(Booking).delete(synchronize_session=False)
         session.query(RoomAmenity).delete(synchronize_session=False)
         session.query(Room).delete(synchronize_session=False)
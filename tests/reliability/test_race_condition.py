@@ -1,10 +1,28 @@
 import pytest
+import random
 import threading
+import time
 from datetime import date, timedelta
 import uuid
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 
 from src.api.models.room_model import Room, RoomType, RoomStatus
-from src.api.models.booking_model import Booking
+from src.api.models.booking_model import Booking, BookingStatus, BOOKING_OVERLAP_CONSTRAINT
+from src.api.models.user_model import User, UserRole
+from src.api.services import booking_service
+from src.api.services.tx_retry import retry_metrics
+
+CONCURRENCY_MODES = ("constraint", "lock", "serializable")
+
+
+@pytest.fixture(params=CONCURRENCY_MODES)
+def concurrency_mode(request, monkeypatch):
+    monkeypatch.setattr(booking_service, "BOOKING_CONCURRENCY_MODE", request.param)
+    retry_metrics.reset()
+    return request.param
+
 
 @pytest.fixture(scope="function")
 def race_room(db_session):
@@ -53,9 +71,9 @@ def book_room_task(client, room_id, check_in, check_out, results_list):
         results_list.append(str(e))
 
 
-def test_booking_race_condition(client, db_session, race_room):
+def test_booking_race_condition(client, db_session, race_room, concurrency_mode):
     """
-    Перевіряє race condition при бронюванні.
+    Перевіряє race condition при бронюванні (в обох режимах).
     Запускає 5 одночасних запитів на бронювання однієї кімнати.
     """
     num_threads = 5
@@ -86,4 +104,159 @@ def test_booking_race_condition(client, db_session, race_room):
 
     assert success_count == 1
     assert conflict_count == num_threads - 1
-    assert final_bookings_in_db == 1
\ No newline at end of file
+    assert final_bookings_in_db == 1
+
+@pytest.fixture
+def bench_rooms(db_session):
+    rooms = [
+        Room(
+            room_number=f"BN{uuid.uuid4().hex[:6]}",
+            room_type=RoomType.STANDARD,
+            max_guest=2,
+            base_price=1000.0,
+            status=RoomStatus.AVAILABLE,
+            floor=1,
+            description="Room for contention benchmark"
+        )
+        for _ in range(4)
+    ]
+    db_session.add_all(rooms)
+    db_session.commit()
+    room_ids = [room.room_id for room in rooms]
+    yield rooms
+
+    # бронювання і гості створені запитами клієнтів, поза сесією тесту
+    bookings = db_session.query(Booking).filter(Booking.room_id.in_(room_ids))
+    guest_ids = {booking.user_id for booking in bookings}
+    bookings.delete(synchronize_session=False)
+    db_session.query(User).filter(User.user_id.in_(guest_ids)).delete(synchronize_session=False)
+    db_session.query(Room).filter(Room.room_id.in_(room_ids)).delete(synchronize_session=False)
+    db_session.commit()
+
+
+def _timed_booking_client(client, stays, latencies, statuses):
+    for room_id, check_in, check_out in stays:
+        started = time.perf_counter()
+        book_room_task(client, room_id, check_in, check_out, statuses)
+        latencies.append(time.perf_counter() - started)
+
+
+def _p99(samples):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("num_clients", [1, 8, 32, 128])
+def test_booking_contention_benchmark(client, db_session, bench_rooms, concurrency_mode, num_clients):
+    """
+    Бенчмарк constraint vs lock vs serializable: клієнти бронюють 4 кімнати на 8 тижнів
+    (перетинні заїзди всередині тижня), друкує bookings/sec, p99 і частку повторів.
+    """
+    requests_per_client = 2
+    rng = random.Random(num_clients)
+    base = date.today() + timedelta(days=60)
+
+    def random_stay():
+        check_in = base + timedelta(days=7 * rng.randrange(8) + rng.randrange(4))
+        return rng.choice(bench_rooms).room_id, check_in, check_in + timedelta(days=rng.randint(2, 3))
+
+    latencies, statuses = [], []
+    threads = [
+        threading.Thread(target=_timed_booking_client, args=(
+            client, [random_stay() for _ in range(requests_per_client)], latencies, statuses
+        ))
+        for _ in range(num_clients)
+    ]
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    booked = statuses.count(201)
+    retries = retry_metrics.snapshot()
+    print(f"\n[{concurrency_mode:>12}] clients={num_clients:<3} requests={len(statuses):<4} "
+          f"booked={booked:<3} conflicts={statuses.count(409):<4} "
+          f"{booked / elapsed:7.1f} bookings/sec  p99={_p99(latencies) * 1000:7.1f} ms  "
+          f"retry_rate={retries['retry_rate']:.3f}")
+
+    assert set(statuses) <= {201, 409}
+    assert len(statuses) == num_clients * requests_per_client
+
+    room_ids = [room.room_id for room in bench_rooms]
+    stored = db_session.query(Booking).filter(Booking.room_id.in_(room_ids)).count()
+    other = aliased(Booking)
+    overlapping = db_session.query(func.count()).select_from(Booking).join(
+        other,
+        (other.room_id == Booking.room_id)
+        & (other.booking_code < Booking.booking_code)
+        & other.stay_period.op("&&")(Booking.stay_period)
+    ).filter(Booking.room_id.in_(room_ids)).scalar()
+    assert stored == booked
+    assert overlapping == 0
+    if concurrency_mode != "serializable":
+        assert retries["retries"] == 0
+
+
+def test_booking_throughput_for_disjoint_stays(client, db_session, race_room):
+    """
+    Пропускна здатність: потоки бронюють ту саму кімнату на різні тижні.
+    Без блокування рядка кімнати вони не чекають один на одного.
+    """
+    num_threads = 8
+    threads = []
+    results = []
+    base = date.today() + timedelta(days=30)
+
+    started = time.perf_counter()
+    for i in range(num_threads):
+        check_in = base + timedelta(days=7 * i)
+        t = threading.Thread(
+            target=book_room_task,
+            args=(client, race_room.room_id, check_in, check_in + timedelta(days=3), results)
+        )
+        threads.append(t)
+        t.start()
+
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{num_threads} disjoint bookings in {elapsed:.3f}s "
+          f"({num_threads / elapsed:.1f} bookings/sec)")
+
+    assert results.count(201) == num_threads
+    assert db_session.query(Booking).filter_by(room_id=race_room.room_id).count() == num_threads
+
+
+def test_exclusion_constraint_rejects_overlapping_insert(db_session, race_room):
+    """Навіть в обхід сервісу БД не дає зберегти два перетинних ACTIVE бронювання."""
+    user = User(
+        email=f"ex{uuid.uuid4().hex[:10]}@gmail.com",
+        first_name="Race",
+        last_name="Testenko",
+        phone=f"+38098{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.GUEST
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    check_in = date.today() + timedelta(days=50)
+    for code, offset in (("EXA", 0), ("EXB", 2)):
+        db_session.add(Booking(
+            booking_code=f"{code}{uuid.uuid4().hex[:8]}",
+            user_id=user.user_id,
+            room_id=race_room.room_id,
+            check_in_date=check_in + timedelta(days=offset),
+            check_out_date=check_in + timedelta(days=offset + 3),
+            status=BookingStatus.ACTIVE
+        ))
+        if code == "EXA":
+            db_session.commit()
+
+    with pytest.raises(IntegrityError, match=BOOKING_OVERLAP_CONSTRAINT):
+        db_session.commit()
+    db_session.rollback()
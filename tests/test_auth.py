@@ -96,10 +96,11 @@ def test_token_required_user_not_found(monkeypatch, app, client):
    assert resp.status_code == 401
 
 
-def test_admin_required_forbidden(app, client):
+def test_admin_required_forbidden(app, client, monkeypatch):
    class _User:
        def __init__(self):
            self.role = UserRole.GUEST
+           self.is_registered = True
 
 
    def _fake_decode(*args, **kwargs):
@@ -118,8 +119,8 @@ def test_admin_required_forbidden(app, client):
 
    import src.api.auth as auth_module
    import src.api.auth as auth
-   auth.jwt.decode = _fake_decode
-   auth_module.db = _DB()
+   monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+   monkeypatch.setattr(auth_module, "db", _DB())
 
 
    def decorated():
@@ -135,13 +136,14 @@ def test_admin_required_forbidden(app, client):
    assert resp.status_code == 403
 
 
-def test_admin_required_allowed(app, client):
+def test_admin_required_allowed(app, client, monkeypatch):
    admin_id = 12345
 
 
    class _User:
        def __init__(self):
            self.role = UserRole.ADMIN
+           self.is_registered = True
 
 
    def _fake_decode(*args, **kwargs):
@@ -164,8 +166,8 @@ def test_admin_required_allowed(app, client):
 
    import src.api.auth as auth_module
    import src.api.auth as auth
-   auth.jwt.decode = _fake_decode
-   auth_module.db = _DB()
+   monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+   monkeypatch.setattr(auth_module, "db", _DB())
 
 
    view = token_required(admin_required(decorated))
@@ -177,10 +179,11 @@ def test_admin_required_allowed(app, client):
    assert resp.status_code == 200
 
 
-def test_staff_required_forbidden_for_guest(app, client):
+def test_staff_required_forbidden_for_guest(app, client, monkeypatch):
    class _User:
        def __init__(self):
            self.role = UserRole.GUEST
+           self.is_registered = True
 
 
    def _fake_decode(*args, **kwargs):
@@ -199,8 +202,8 @@ def test_staff_required_forbidden_for_guest(app, client):
 
    import src.api.auth as auth_module
    import src.api.auth as auth
-   auth.jwt.decode = _fake_decode
-   auth_module.db = _DB()
+   monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+   monkeypatch.setattr(auth_module, "db", _DB())
 
 
    def decorated():
@@ -216,10 +219,11 @@ def test_staff_required_forbidden_for_guest(app, client):
    assert resp.status_code == 403
 
 
-def test_staff_required_allowed_for_staff(app, client):
+def test_staff_required_allowed_for_staff(app, client, monkeypatch):
    class _User:
        def __init__(self):
            self.role = UserRole.STAFF
+           self.is_registered = True
 
 
    def _fake_decode(*args, **kwargs):
@@ -238,8 +242,8 @@ def test_staff_required_allowed_for_staff(app, client):
 
    import src.api.auth as auth_module
    import src.api.auth as auth
-   auth.jwt.decode = _fake_decode
-   auth_module.db = _DB()
+   monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+   monkeypatch.setattr(auth_module, "db", _DB())
 
 
    def decorated():
@@ -255,10 +259,11 @@ def test_staff_required_allowed_for_staff(app, client):
    assert resp.status_code == 200
 
 
-def test_role_required_only_staff_allowed(app, client):
+def test_role_required_only_staff_allowed(app, client, monkeypatch):
    class _User:
        def __init__(self):
            self.role = UserRole.ADMIN
+           self.is_registered = True
 
 
    def _fake_decode(*args, **kwargs):
@@ -277,8 +282,8 @@ def test_role_required_only_staff_allowed(app, client):
 
    import src.api.auth as auth_module
    import src.api.auth as auth
-   auth.jwt.decode = _fake_decode
-   auth_module.db = _DB()
+   monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+   monkeypatch.setattr(auth_module, "db", _DB())
 
 
    def decorated():
@@ -294,10 +299,11 @@ def test_role_required_only_staff_allowed(app, client):
    assert resp.status_code == 403
 
 
-def test_role_required_staff_or_admin_allowed(app, client):
+def test_role_required_staff_or_admin_allowed(app, client, monkeypatch):
    class _User:
        def __init__(self):
            self.role = UserRole.ADMIN
+           self.is_registered = True
 
 
    def _fake_decode(*args, **kwargs):
@@ -316,8 +322,8 @@ def test_role_required_staff_or_admin_allowed(app, client):
 
    import src.api.auth as auth_module
    import src.api.auth as auth
-   auth.jwt.decode = _fake_decode
-   auth_module.db = _DB()
+   monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+   monkeypatch.setattr(auth_module, "db", _DB())
 
 
    def decorated():
@@ -438,7 +444,9 @@ def test_verify_auth_token_success(monkeypatch):
     
     result = auth.verify_auth_token("valid_token")
     
-    assert result == mock_user
+    # повертається кешована ідентичність користувача, а не рядок з БД
+    assert result.user_id == 1
+    assert result.role == mock_user.role
 
 
 def test_verify_auth_token_invalid_token(monkeypatch):
@@ -528,6 +536,7 @@ def test_login_required_web_with_bearer_token(app, client, monkeypatch):
         def __init__(self):
             self.user_id = 2
             self.role = UserRole.STAFF
+            self.is_registered = True
     
     def _fake_decode(token, secret, algorithms=None):
         return {"user_id": 2, "is_admin": False}
@@ -602,6 +611,7 @@ def test_token_optional_with_valid_token(app, client, monkeypatch):
         def __init__(self):
             self.user_id = 1
             self.role = UserRole.GUEST
+            self.is_registered = True
     
     def _fake_decode(token, secret, algorithms=None):
         return {"user_id": 1, "is_admin": False}
@@ -712,7 +722,7 @@ def test_generate_auth_token_for_user(monkeypatch):
     mock_user.user_id = 1
     mock_user.role = UserRole.ADMIN
     
-    def mock_create_token(user_id, role=None, is_admin=False):
+    def mock_create_token(user_id, role=None, is_admin=False, token_version=None):
         return f"token_for_{user_id}"
     
     monkeypatch.setattr(auth, "create_token", mock_create_token)
@@ -731,7 +741,7 @@ def test_generate_auth_token_for_user_no_role(monkeypatch):
     mock_user.user_id = 2
     mock_user.role = None
     
-    def mock_create_token(user_id, role=None, is_admin=False):
+    def mock_create_token(user_id, role=None, is_admin=False, token_version=None):
         assert role == 'GUEST'  # Повинно бути 'GUEST' якщо роль None
         return f"token_for_{user_id}"
     
@@ -742,7 +752,7 @@ def test_generate_auth_token_for_user_no_role(monkeypatch):
     assert token == "token_for_2"
 
 
-def test_staff_required_with_role_string(app, client):
+def test_staff_required_with_role_string(app, client, monkeypatch):
     """Тест staff_required коли role є string, а не enum"""
     from src.api.auth import staff_required, token_required
     from unittest.mock import MagicMock
@@ -750,6 +760,7 @@ def test_staff_required_with_role_string(app, client):
     class _User:
         def __init__(self):
             self.role = 'STAFF'  # String замість enum
+            self.is_registered = True
     
     def _fake_decode(*args, **kwargs):
         return {"user_id": 1, "is_admin": False}
@@ -764,8 +775,8 @@ def test_staff_required_with_role_string(app, client):
     
     import src.api.auth as auth_module
     import src.api.auth as auth
-    auth.jwt.decode = _fake_decode
-    auth_module.db = _DB()
+    monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+    monkeypatch.setattr(auth_module, "db", _DB())
     
     def decorated():
         return ("ok", 200)
@@ -778,13 +789,14 @@ def test_staff_required_with_role_string(app, client):
     assert resp.status_code == 200
 
 
-def test_role_required_with_role_string(app, client):
+def test_role_required_with_role_string(app, client, monkeypatch):
     """Тест role_required коли role є string, а не enum"""
     from src.api.auth import role_required, token_required
     
     class _User:
         def __init__(self):
             self.role = 'ADMIN'  # String замість enum
+            self.is_registered = True
     
     def _fake_decode(*args, **kwargs):
         return {"user_id": 1, "is_admin": True}
@@ -799,8 +811,8 @@ def test_role_required_with_role_string(app, client):
     
     import src.api.auth as auth_module
     import src.api.auth as auth
-    auth.jwt.decode = _fake_decode
-    auth_module.db = _DB()
+    monkeypatch.setattr(auth.jwt, "decode", _fake_decode)
+    monkeypatch.setattr(auth_module, "db", _DB())
     
     def decorated():
         return ("ok", 200)
@@ -69,6 +69,7 @@ def test_login_success(client, monkeypatch):
     mock_user.first_name = "Jane"
     mock_user.last_name = "Doe"
     mock_user.role = UserRole.GUEST
+    mock_user.token_version = 0
     mock_user.check_password = lambda pwd: pwd == "goodpass"
     mock_user.generate_auth_token_for_user = lambda: "mock_login_token"
     mock_query = MagicMock()
@@ -201,7 +202,7 @@ def test_refresh_success(client, monkeypatch):
     monkeypatch.setattr(auth_module.jwt, "decode", _fake_decode)
     monkeypatch.setattr(auth_module, "db", MagicMock(query=lambda x: mock_query))
     import src.api.routes.auth_routes as auth_routes_module
-    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False: "new_token")
+    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False, token_version=None: "new_token")
     resp = client.get("/api/v1/auth/refresh", headers={"Authorization": "Bearer valid_token"})
     assert resp.status_code == 200
     data = resp.get_json()
@@ -224,7 +225,7 @@ def test_refresh_has_token_type(client, monkeypatch):
     monkeypatch.setattr(auth_module.jwt, "decode", _fake_decode)
     monkeypatch.setattr(auth_module, "db", MagicMock(query=lambda x: mock_query))
     import src.api.routes.auth_routes as auth_routes_module
-    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False: "new_token")
+    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False, token_version=None: "new_token")
     resp = client.get("/api/v1/auth/refresh", headers={"Authorization": "Bearer valid_token"})
     assert resp.status_code == 200
     data = resp.get_json()
@@ -247,7 +248,7 @@ def test_refresh_has_expires_in(client, monkeypatch):
     monkeypatch.setattr(auth_module.jwt, "decode", _fake_decode)
     monkeypatch.setattr(auth_module, "db", MagicMock(query=lambda x: mock_query))
     import src.api.routes.auth_routes as auth_routes_module
-    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False: "new_token")
+    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False, token_version=None: "new_token")
     resp = client.get("/api/v1/auth/refresh", headers={"Authorization": "Bearer valid_token"})
     assert resp.status_code == 200
     data = resp.get_json()
@@ -270,7 +271,7 @@ def test_refresh_echoes_role(client, monkeypatch):
     monkeypatch.setattr(auth_module.jwt, "decode", _fake_decode)
     monkeypatch.setattr(auth_module, "db", MagicMock(query=lambda x: mock_query))
     import src.api.routes.auth_routes as auth_routes_module
-    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False: "new_token")
+    monkeypatch.setattr(auth_routes_module, "create_token", lambda user_id, role=None, is_admin=False, token_version=None: "new_token")
     resp = client.get("/api/v1/auth/refresh", headers={"Authorization": "Bearer valid_token"})
     assert resp.status_code == 200
     data = resp.get_json()
@@ -466,6 +467,7 @@ def test_create_admin_forbidden_non_admin(client, monkeypatch):
 def test_create_admin_missing_json(client, monkeypatch):
     mock_user = MagicMock()
     mock_user.is_admin = True
+    mock_user.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -485,6 +487,7 @@ def test_create_admin_missing_json(client, monkeypatch):
 def test_create_admin_missing_fields(client, monkeypatch):
     mock_user = MagicMock()
     mock_user.is_admin = True
+    mock_user.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -506,6 +509,7 @@ def test_create_admin_missing_fields(client, monkeypatch):
 def test_create_admin_email_exists(client, monkeypatch):
     mock_admin = MagicMock()
     mock_admin.is_admin = True
+    mock_admin.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -540,6 +544,7 @@ def test_create_admin_email_exists(client, monkeypatch):
 def test_create_admin_success(client, monkeypatch):
     mock_admin = MagicMock()
     mock_admin.is_admin = True
+    mock_admin.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -573,6 +578,7 @@ def test_create_admin_success(client, monkeypatch):
 def test_create_admin_database_error(client, monkeypatch):
     mock_admin = MagicMock()
     mock_admin.is_admin = True
+    mock_admin.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -632,6 +638,7 @@ def test_create_staff_forbidden_non_admin(client, monkeypatch):
 def test_create_staff_missing_fields(client, monkeypatch):
     mock_admin = MagicMock()
     mock_admin.is_admin = True
+    mock_admin.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -653,6 +660,7 @@ def test_create_staff_missing_fields(client, monkeypatch):
 def test_create_staff_email_exists(client, monkeypatch):
     mock_admin = MagicMock()
     mock_admin.is_admin = True
+    mock_admin.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -686,6 +694,7 @@ def test_create_staff_email_exists(client, monkeypatch):
 def test_create_staff_success(client, monkeypatch):
     mock_admin = MagicMock()
     mock_admin.is_admin = True
+    mock_admin.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -718,6 +727,7 @@ def test_create_staff_success(client, monkeypatch):
 def test_create_staff_database_error(client, monkeypatch):
     mock_admin = MagicMock()
     mock_admin.is_admin = True
+    mock_admin.role = UserRole.ADMIN
     
     def mock_jwt_decode(token, secret, algorithms=None):
         return {"user_id": 1, "role": "ADMIN", "is_admin": True}
@@ -0,0 +1,185 @@
+import pytest
+import time
+import uuid
+from datetime import date, timedelta
+from src.api.services.availability_index import AvailabilityIndex, availability_index
+from src.api.services.booking_service import create_booking, cancel_booking, update_booking_partial
+from src.api.models.booking_model import Booking, BookingStatus
+from src.api.models.room_model import Room, RoomType, RoomStatus
+from src.api.models.user_model import User, UserRole
+
+
+@pytest.fixture
+def index_rooms(db_session):
+    rooms = []
+    for _ in range(2):
+        room = Room(
+            room_number=f"AI{uuid.uuid4().hex[:6]}",
+            room_type=RoomType.STANDARD,
+            max_guest=2,
+            base_price=1000.0,
+            status=RoomStatus.AVAILABLE,
+            floor=1,
+            description="Room for availability index"
+        )
+        db_session.add(room)
+        rooms.append(room)
+    db_session.commit()
+    return rooms
+
+
+def _guest_booking(room_id, check_in, check_out):
+    return {
+        "room_id": room_id,
+        "check_in_date": check_in,
+        "check_out_date": check_out,
+        "email": f"ai{uuid.uuid4().hex[:10]}@example.com",
+        "first_name": "Index",
+        "last_name": "Guest",
+        "phone": f"+38067{uuid.uuid4().int % 10000000:07d}"
+    }
+
+
+def test_overlap_detection_is_half_open():
+    index = AvailabilityIndex()
+    index._stale = False
+    index._built_at = 0
+    index._since = date.today()
+    d = date(2030, 1, 10)
+    index.apply("BK1", 1, d, d + timedelta(days=3), BookingStatus.ACTIVE)
+
+    free = lambda ci, co: index.free_room_ids(None, [1], ci, co) == {1}
+    assert free(d - timedelta(days=2), d)
+    assert free(d + timedelta(days=3), d + timedelta(days=5))
+    assert not free(d + timedelta(days=2), d + timedelta(days=4))
+    assert not free(d - timedelta(days=1), d + timedelta(days=10))
+
+
+def test_long_earlier_booking_still_blocks():
+    index = AvailabilityIndex()
+    index._stale = False
+    index._built_at = 0
+    index._since = date.today()
+    d = date(2030, 1, 1)
+    index.apply("LONG", 1, d, d + timedelta(days=30), BookingStatus.ACTIVE)
+    index.apply("SHORT", 1, d + timedelta(days=2), d + timedelta(days=3), BookingStatus.ACTIVE)
+
+    assert index.free_room_ids(None, [1], d + timedelta(days=20), d + timedelta(days=21)) == set()
+
+    index.apply("LONG", 1, d, d + timedelta(days=30), BookingStatus.CANCELLED)
+    assert index.free_room_ids(None, [1], d + timedelta(days=20), d + timedelta(days=21)) == {1}
+
+
+def test_rebuild_loads_non_cancelled_bookings(db_session, index_rooms):
+    room_a, room_b = index_rooms
+    check_in = date.today() + timedelta(days=10)
+    create_booking(db_session, _guest_booking(room_a.room_id, check_in, check_in + timedelta(days=2)))
+    cancelled = create_booking(db_session, _guest_booking(room_b.room_id, check_in, check_in + timedelta(days=2)))
+    cancelled.status = BookingStatus.CANCELLED
+    db_session.commit()
+
+    index = AvailabilityIndex()
+    assert index.rebuild(db_session) == 1
+    assert index.free_room_ids(
+        db_session, [room_a.room_id, room_b.room_id], check_in, check_in + timedelta(days=1)
+    ) == {room_b.room_id}
+
+
+def test_ended_stays_are_not_held(db_session, index_rooms):
+    room = index_rooms[0]
+    today = date.today()
+    guest = User(email=f"ai{uuid.uuid4().hex[:10]}@example.com", first_name="Index", last_name="Guest",
+                 phone=f"+38067{uuid.uuid4().int % 10000000:07d}", role=UserRole.GUEST)
+    db_session.add(guest)
+    db_session.flush()
+    db_session.add_all([
+        Booking(booking_code=f"BKPAST{uuid.uuid4().hex[:6]}", user_id=guest.user_id, room_id=room.room_id,
+                check_in_date=today - timedelta(days=10), check_out_date=today - timedelta(days=7),
+                status=BookingStatus.COMPLETED),
+        Booking(booking_code=f"BKNOW{uuid.uuid4().hex[:6]}", user_id=guest.user_id, room_id=room.room_id,
+                check_in_date=today - timedelta(days=1), check_out_date=today + timedelta(days=2),
+                status=BookingStatus.ACTIVE),
+    ])
+    db_session.commit()
+
+    index = AvailabilityIndex()
+    assert index.rebuild(db_session) == 1
+    assert index.free_room_ids(db_session, [room.room_id], today, today + timedelta(days=1)) == set()
+    # вікно в минулому відповідає запит до БД
+    past = today - timedelta(days=9)
+    assert index.free_room_ids(db_session, [room.room_id], past, past + timedelta(days=1)) == set()
+    assert index.free_room_ids(db_session, [room.room_id], past - timedelta(days=5), past - timedelta(days=3)) \
+        == {room.room_id}
+
+
+def test_index_is_rebuilt_when_the_date_changes():
+    index = AvailabilityIndex()
+    index._stale = False
+    index._built_at = time.monotonic()
+    index._since = date.today()
+    assert not index.is_stale()
+    index._since = date.today() - timedelta(days=1)
+    assert index.is_stale()
+
+
+def test_index_follows_create_update_and_cancel(db_session, index_rooms):
+    room_a, room_b = index_rooms
+    room_ids = [room_a.room_id, room_b.room_id]
+    check_in = date.today() + timedelta(days=15)
+    check_out = check_in + timedelta(days=3)
+    availability_index.rebuild(db_session)
+
+    booking = create_booking(db_session, _guest_booking(room_a.room_id, check_in, check_out))
+    assert availability_index.free_room_ids(db_session, room_ids, check_in, check_out) == {room_b.room_id}
+
+    update_booking_partial(db_session, booking.booking_code, {"room_id": room_b.room_id})
+    db_session.commit()
+    assert availability_index.free_room_ids(db_session, room_ids, check_in, check_out) == {room_a.room_id}
+
+    cancel_booking(db_session, booking.booking_code)
+    db_session.commit()
+    assert availability_index.free_room_ids(db_session, room_ids, check_in, check_out) == set(room_ids)
+    assert not availability_index.is_stale()
+
+
+def test_rollback_does_not_touch_index(db_session, index_rooms):
+    room = index_rooms[0]
+    check_in = date.today() + timedelta(days=40)
+    availability_index.rebuild(db_session)
+
+    db_session.add(Booking(
+        booking_code=f"BKRB{uuid.uuid4().hex[:8]}",
+        user_id=None,
+        room_id=room.room_id,
+        check_in_date=check_in,
+        check_out_date=check_in + timedelta(days=1),
+        status=BookingStatus.ACTIVE
+    ))
+    with pytest.raises(Exception):
+        db_session.commit()
+    db_session.rollback()
+
+    assert availability_index.free_room_ids(
+        db_session, [room.room_id], check_in, check_in + timedelta(days=1)
+    ) == {room.room_id}
+
+
+def test_bulk_delete_marks_index_stale(db_session, index_rooms):
+    availability_index.rebuild(db_session)
+    db_session.query(Booking).filter(Booking.room_id == index_rooms[0].room_id).delete(synchronize_session=False)
+    assert not availability_index.is_stale()
+    db_session.commit()
+    assert availability_index.is_stale()
+
+
+def test_api_date_search_excludes_booked_room(client, db_session, index_rooms):
+    room_a, room_b = index_rooms
+    check_in = date.today() + timedelta(days=60)
+    check_out = check_in + timedelta(days=2)
+    create_booking(db_session, _guest_booking(room_a.room_id, check_in, check_out))
+
+    response = client.get(f"/api/v1/rooms/?check_in={check_in.isoformat()}&check_out={check_out.isoformat()}&all=true")
+    assert response.status_code == 200
+    ids = {room["id"] for room in response.get_json()}
+    assert room_b.room_id in ids
+    assert room_a.room_id not in ids
@@ -69,10 +69,11 @@ def test_expired_booking_auto_completes(db_session, seed_user, seed_room):
     assert past_booking.status == BookingStatus.ACTIVE
     
     # Викликаємо функцію оновлення
-    count = update_expired_bookings_status(db_session)
+    count, chunks = update_expired_bookings_status(db_session)
     
-    # Перевіряємо що оновилось 1 бронювання
+    # Перевіряємо що оновилось 1 бронювання однією порцією
     assert count == 1
+    assert chunks == 1
     
     # Перевіряємо що статус змінився на COMPLETED
     db_session.refresh(past_booking)
@@ -91,18 +92,19 @@ def test_active_booking_not_auto_completed(db_session, seed_user, seed_room):
     })
     
     # Викликаємо функцію оновлення
-    count = update_expired_bookings_status(db_session)
+    count, chunks = update_expired_bookings_status(db_session)
     
     # Перевіряємо що нічого не оновилось
     assert count == 0
+    assert chunks == 0
     
     # Перевіряємо що статус залишився ACTIVE
     db_session.refresh(future_booking)
     assert future_booking.status == BookingStatus.ACTIVE
 
 
-def test_get_all_bookings_auto_updates(db_session, seed_user, seed_room):
-    """Тест що get_all_bookings автоматично оновлює статуси"""
+def test_get_all_bookings_reports_expired_as_completed(db_session, seed_user, seed_room):
+    """Тест що get_all_bookings показує застарілі бронювання як COMPLETED, нічого не записуючи"""
     from src.api.models.booking_model import Booking
     from datetime import datetime, timezone
     
@@ -121,9 +123,76 @@ def test_get_all_bookings_auto_updates(db_session, seed_user, seed_room):
     db_session.add(old_booking)
     db_session.commit()
     
-    # Отримуємо всі бронювання (має автоматично оновити статус)
     bookings = get_all_bookings(db_session)
-    
-    # Перевіряємо що бронювання має статус COMPLETED
+
+    # Для читача бронювання завершене, а в БД статус оновить нічна задача
     assert len(bookings) == 1
-    assert bookings[0].status == BookingStatus.COMPLETED
+    assert bookings[0].effective_status == BookingStatus.COMPLETED
+    assert bookings[0].status == BookingStatus.ACTIVE
+    assert db_session.query(Booking).filter(
+        Booking.effective_status == BookingStatus.COMPLETED
+    ).count() == 1
+
+
+def test_bookings_list_is_read_only(client, db_session, seed_user, seed_room):
+    """GET /bookings/ виконує лише SELECT, навіть коли є застарілі бронювання"""
+    from sqlalchemy import event
+    from src.api.db import engine
+    from src.api.models.booking_model import Booking
+    import time
+
+    for i in range(50):
+        db_session.add(Booking(
+            booking_code=f"BK_TEST_READ_{i:03d}",
+            user_id=seed_user.user_id,
+            room_id=seed_room.room_id,
+            check_in_date=date.today() - timedelta(days=200 - 3 * i),
+            check_out_date=date.today() - timedelta(days=198 - 3 * i),
+            status=BookingStatus.ACTIVE
+        ))
+    db_session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        started = time.perf_counter()
+        for _ in range(20):
+            response = client.get("/api/v1/bookings/?all=true")
+            assert response.status_code == 200
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    print(f"\nGET /bookings/ with 50 expired bookings: {elapsed / 20 * 1000:.2f} ms/request")
+    assert set(statements) == {"SELECT"}
+    assert all(b["status"] == "COMPLETED" for b in response.get_json())
+    assert db_session.query(Booking).filter_by(status=BookingStatus.ACTIVE).count() == 50
+
+
+def test_expired_bookings_updated_in_chunks(db_session, seed_user, seed_room, caplog):
+    """Тест що оновлення йде порціями з комітом після кожної"""
+    import logging
+    from src.api.models.booking_model import Booking
+
+    for i in range(5):
+        db_session.add(Booking(
+            booking_code=f"BK_TEST_CHUNK_{i}",
+            user_id=seed_user.user_id,
+            room_id=seed_room.room_id,
+            check_in_date=date.today() - timedelta(days=30 - 3 * i),
+            check_out_date=date.today() - timedelta(days=28 - 3 * i),
+            status=BookingStatus.ACTIVE
+        ))
+    db_session.commit()
+
+    with caplog.at_level(logging.INFO, logger="src.api.services.booking_service"):
+        count, chunks = update_expired_bookings_status(db_session, chunk_size=2)
+
+    assert (count, chunks) == (5, 3)
+    assert "in 3 chunk(s)" in caplog.text
+    assert db_session.query(Booking).filter_by(status=BookingStatus.COMPLETED).count() == 5
+    assert update_expired_bookings_status(db_session, chunk_size=2) == (0, 0)
@@ -0,0 +1,133 @@
+import pytest
+import itertools
+import threading
+from src.api.services.booking_codes import (
+    BookingCodeGenerator,
+    encode_booking_code,
+    decode_booking_code,
+    is_valid_booking_code,
+    ALPHABET
+)
+from src.api.models.booking_model import BOOKING_CODE_BLOCK_SIZE
+
+
+def _local_blocks(block_size=BOOKING_CODE_BLOCK_SIZE):
+    """Імітація sequence з increment=block_size без бази даних"""
+    counter = itertools.count(1, block_size)
+    return lambda session: next(counter)
+
+
+def test_encode_decode_round_trip():
+    for number in (0, 1, 31, 32, 123456789, 32 ** 10 - 1):
+        code = encode_booking_code(number)
+        assert code.startswith("BK")
+        assert len(code) == 13
+        assert decode_booking_code(code) == number
+        assert decode_booking_code(code.lower()) == number
+
+
+def test_encode_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        encode_booking_code(-1)
+    with pytest.raises(ValueError):
+        encode_booking_code(32 ** 10)
+
+
+def test_checksum_catches_single_character_typos():
+    code = encode_booking_code(987654321)
+    for position in range(2, len(code)):
+        for replacement in ALPHABET:
+            if replacement == code[position]:
+                continue
+            typo = code[:position] + replacement + code[position + 1:]
+            assert not is_valid_booking_code(typo), typo
+
+
+def test_checksum_catches_adjacent_transpositions():
+    code = encode_booking_code(555123987)
+    for position in range(2, len(code) - 1):
+        a, b = code[position], code[position + 1]
+        if a == b:
+            continue
+        swapped = code[:position] + b + a + code[position + 2:]
+        assert not is_valid_booking_code(swapped), swapped
+
+
+@pytest.mark.parametrize("code", ["", "BK", "XX0000000001Y", "BK0000000001", "BK00000000I1Y", "BK12345678901"])
+def test_malformed_codes_are_invalid(code):
+    assert not is_valid_booking_code(code)
+
+
+def test_generator_reserves_one_block_per_block_size_codes():
+    calls = []
+    blocks = _local_blocks(block_size=10)
+
+    def reserve(session):
+        calls.append(session)
+        return blocks(session)
+
+    generator = BookingCodeGenerator(reserve, block_size=10)
+    codes = [generator.next_code("s") for _ in range(25)]
+
+    assert len(calls) == 3
+    assert [decode_booking_code(c) for c in codes] == list(range(1, 26))
+
+
+def test_generator_is_thread_safe():
+    generator = BookingCodeGenerator(_local_blocks())
+    results = [[] for _ in range(8)]
+
+    def worker(out):
+        for _ in range(5000):
+            out.append(generator.next_code())
+
+    threads = [threading.Thread(target=worker, args=(out,)) for out in results]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    codes = [code for out in results for code in out]
+    assert len(set(codes)) == len(codes) == 40000
+    for out in results:
+        assert out == sorted(out)
+
+
+def test_generator_codes_are_unique_and_valid():
+    generator = BookingCodeGenerator(_local_blocks())
+    codes = [generator.next_code() for _ in range(10_000)]
+
+    assert len(set(codes)) == len(codes)
+    assert codes == sorted(codes)
+    assert all(is_valid_booking_code(code) for code in codes)
+    assert decode_booking_code(codes[-1]) == len(codes)
+
+
+@pytest.mark.benchmark
+def test_generator_millions_of_codes():
+    """2 млн кодів: без колізій і строго зростають (отже й унікальні)"""
+    generator = BookingCodeGenerator(_local_blocks())
+    total = 2_000_000
+
+    previous = generator.next_code()
+    for _ in range(total - 1):
+        code = generator.next_code()
+        assert code > previous
+        previous = code
+
+    assert decode_booking_code(previous) == total
+
+
+def test_sequence_blocks_do_not_overlap_between_processes(db_session):
+    # два генератори = два воркери, що ділять одну sequence
+    first = BookingCodeGenerator()
+    second = BookingCodeGenerator()
+
+    codes_first = [first.next_code(db_session) for _ in range(BOOKING_CODE_BLOCK_SIZE + 5)]
+    codes_second = [second.next_code(db_session) for _ in range(BOOKING_CODE_BLOCK_SIZE + 5)]
+    db_session.commit()
+
+    assert not set(codes_first) & set(codes_second)
+    assert all(is_valid_booking_code(code) for code in codes_first + codes_second)
+    assert codes_first == sorted(codes_first)
+    assert codes_second == sorted(codes_second)
@@ -0,0 +1,133 @@
+import pytest
+import csv
+import io
+import json
+import uuid
+from datetime import date, timedelta
+from werkzeug.security import generate_password_hash
+import secrets
+from src.api.auth import create_token
+from src.api.services.booking_service import iter_bookings_for_export, EXPORT_COLUMNS
+from src.api.models.booking_model import Booking, BookingStatus
+from src.api.models.user_model import User, UserRole
+from src.api.models.room_model import Room, RoomType, RoomStatus
+
+
+def _user_headers(db_session, role):
+    user = User(
+        first_name="Export",
+        last_name=role.value.title(),
+        email=f"export_{uuid.uuid4().hex[:8]}@example.com",
+        phone=f"+38063{uuid.uuid4().int % 10000000:07d}",
+        role=role,
+        is_registered=True,
+        password=generate_password_hash(secrets.token_urlsafe(16))
+    )
+    db_session.add(user)
+    db_session.commit()
+    is_admin = role == UserRole.ADMIN
+    token = create_token(user.user_id, role=role.value, is_admin=is_admin)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def admin_headers(db_session):
+    return _user_headers(db_session, UserRole.ADMIN)
+
+
+@pytest.fixture
+def export_bookings(db_session):
+    user = User(
+        first_name="Export",
+        last_name="Guest",
+        email=f"export_{uuid.uuid4().hex[:8]}@example.com",
+        phone=f"+38063{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.GUEST,
+        is_registered=True,
+        password=generate_password_hash(secrets.token_urlsafe(16))
+    )
+    room = Room(
+        room_number=f"EX{uuid.uuid4().hex[:6]}",
+        room_type=RoomType.STANDARD,
+        max_guest=2,
+        base_price=1200.0,
+        status=RoomStatus.AVAILABLE,
+        floor=1
+    )
+    db_session.add_all([user, room])
+    db_session.commit()
+
+    start = date(2030, 3, 1)
+    bookings = []
+    for i in range(6):
+        booking = Booking(
+            booking_code=f"BKEX{i:02d}{uuid.uuid4().hex[:6]}",
+            user_id=user.user_id,
+            room_id=room.room_id,
+            check_in_date=start + timedelta(days=5 * i),
+            check_out_date=start + timedelta(days=5 * i + 2),
+            special_requests="Late check-in, \"quiet\" room" if i == 0 else None,
+            status=BookingStatus.CANCELLED if i == 5 else BookingStatus.ACTIVE
+        )
+        db_session.add(booking)
+        bookings.append(booking)
+    db_session.commit()
+    return bookings
+
+
+def test_iter_bookings_for_export_filters_by_check_in(db_session, export_bookings):
+    rows = list(iter_bookings_for_export(db_session, date(2030, 3, 6), date(2030, 3, 16), batch_size=2))
+
+    assert [row["booking_code"] for row in rows] == [b.booking_code for b in export_bookings[1:3]]
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert rows[0]["room_number"].startswith("EX")
+
+
+def test_export_ndjson(client, admin_headers, export_bookings):
+    response = client.get("/api/v1/bookings/export?format=ndjson", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["booking_code"] for row in rows] == [b.booking_code for b in export_bookings]
+    assert rows[0]["check_in_date"] == "2030-03-01"
+    assert rows[-1]["status"] == "CANCELLED"
+    assert rows[1]["special_requests"] is None
+
+
+def test_export_csv(client, admin_headers, export_bookings):
+    response = client.get("/api/v1/bookings/export?format=csv&from=2030-03-01&to=2030-03-02", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert "attachment" in response.headers["Content-Disposition"]
+
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert len(rows) == 2
+    assert rows[1][EXPORT_COLUMNS.index("special_requests")] == "Late check-in, \"quiet\" room"
+
+
+def test_export_csv_empty_has_header(client, admin_headers):
+    response = client.get("/api/v1/bookings/export?format=csv", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).strip() == ",".join(EXPORT_COLUMNS)
+
+
+@pytest.mark.parametrize("query", [
+    "format=xml",
+    "from=2030-13-01",
+    "from=2030-03-10&to=2030-03-01"
+])
+def test_export_invalid_params(client, admin_headers, query):
+    response = client.get(f"/api/v1/bookings/export?{query}", headers=admin_headers)
+    assert response.status_code == 400
+
+
+def test_export_requires_admin(client, db_session, export_bookings):
+    assert client.get("/api/v1/bookings/export").status_code == 401
+
+    guest_headers = _user_headers(db_session, UserRole.GUEST)
+    response = client.get("/api/v1/bookings/export", headers=guest_headers)
+    assert response.status_code == 403
+    assert export_bookings[0].booking_code not in response.get_data(as_text=True)
@@ -0,0 +1,208 @@
+import os
+import pytest
+from contextlib import contextmanager
+from datetime import date, timedelta
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, insert, inspect, text
+from src.api.models.booking_model import Booking, BookingStatus
+from src.api.models.room_model import Room, RoomType, RoomStatus
+from src.api.models.user_model import User, UserRole
+from src.api.services.booking_service import (
+    check_room_availability,
+    get_user_bookings,
+    get_upcoming_checkins,
+    iter_rooms_booked_ranges,
+    update_expired_bookings_status,
+    _find_conflicting_stays
+)
+from src.api.services.notification_service import send_daily_reminders
+
+HOT_QUERY_INDEXES = {
+    "ix_bookings_active_room_dates",
+    "ix_bookings_active_check_in",
+    "ix_bookings_active_check_out",
+    "ix_bookings_user_room_status",
+}
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+ROOMS, USERS, STAYS_PER_ROOM = 30, 200, 100
+
+
+@pytest.fixture
+def booking_history(db_session):
+    """Рік бронювань 30 кімнат: переважно COMPLETED у минулому, ACTIVE попереду.
+
+    Після ANALYZE планувальник бачить реалістичну статистику замість
+    порожньої таблиці, на якій усі плани коштують однаково.
+    """
+    rooms = db_session.execute(insert(Room).returning(Room.room_id), [
+        {"room_number": f"IX{i:03d}", "room_type": RoomType.STANDARD, "max_guest": 2,
+         "base_price": 1000.0, "status": RoomStatus.AVAILABLE, "floor": 1}
+        for i in range(ROOMS)
+    ]).scalars().all()
+    users = db_session.execute(insert(User).returning(User.user_id), [
+        {"email": f"ix{i}@example.com", "first_name": "Index", "last_name": "Guest",
+         "phone": f"+38050{i:07d}", "role": UserRole.GUEST}
+        for i in range(USERS)
+    ]).scalars().all()
+
+    today = date.today()
+    rows = []
+    for r, room_id in enumerate(rooms):
+        for n in range(STAYS_PER_ROOM):
+            check_in = today + timedelta(days=4 * n - 300 + r % 4)
+            check_out = check_in + timedelta(days=3)
+            if n % 20 == 7:
+                status = BookingStatus.CANCELLED
+            elif check_out < today:
+                status = BookingStatus.COMPLETED
+            else:
+                status = BookingStatus.ACTIVE
+            rows.append({"booking_code": f"IX{r:03d}{n:04d}", "user_id": users[(r * STAYS_PER_ROOM + n) % USERS],
+                         "room_id": room_id, "check_in_date": check_in, "check_out_date": check_out,
+                         "status": status})
+    db_session.execute(insert(Booking), rows)
+    db_session.commit()
+    with db_session.get_bind().connect() as conn:
+        conn.exec_driver_sql("ANALYZE bookings")
+        conn.commit()
+    return {"rooms": rooms, "users": users}
+
+
+@contextmanager
+def _captured_booking_queries(session):
+    """Збирає SQL-запити до bookings, виконані сесією всередині блоку"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM bookings" in statement or "JOIN bookings" in statement or "UPDATE bookings" in statement:
+            captured.append((statement, parameters))
+
+    bind = session.get_bind()
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+
+
+def _plans(session, queries):
+    plans = []
+    with session.get_bind().connect() as conn:
+        for statement, parameters in queries:
+            rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+            plans.append("\n".join(row[0] for row in rows))
+        conn.rollback()
+    return plans
+
+
+def _assert_uses_index(session, queries, index_name):
+    assert queries, "no bookings query was captured"
+    for plan in _plans(session, queries):
+        assert index_name in plan, plan
+
+
+def test_model_declares_hot_query_indexes():
+    declared = {index.name: index for index in Booking.__table__.indexes}
+    assert HOT_QUERY_INDEXES <= set(declared)
+    for name in ("ix_bookings_active_room_dates", "ix_bookings_active_check_in", "ix_bookings_active_check_out"):
+        assert str(declared[name].dialect_options["postgresql"]["where"]) == "status = 'ACTIVE'"
+
+
+def test_overlap_check_uses_active_room_dates_index(db_session, booking_history):
+    room_id = booking_history["rooms"][0]
+    with _captured_booking_queries(db_session) as queries:
+        check_room_availability(db_session, room_id, date.today() + timedelta(days=30), date.today() + timedelta(days=32))
+    _assert_uses_index(db_session, queries, "ix_bookings_active_room_dates")
+
+
+def test_group_overlap_check_uses_active_room_dates_index(db_session, booking_history):
+    check_in = date.today() + timedelta(days=30)
+    stays = [{"room_id": room_id, "check_in_date": check_in, "check_out_date": check_in + timedelta(days=2)}
+             for room_id in booking_history["rooms"][:3]]
+    with _captured_booking_queries(db_session) as queries:
+        _find_conflicting_stays(db_session, stays)
+    _assert_uses_index(db_session, queries, "ix_bookings_active_room_dates")
+
+
+def test_hotel_calendar_uses_active_booking_indexes(db_session, booking_history):
+    start = date.today() + timedelta(days=10)
+    with _captured_booking_queries(db_session) as queries:
+        calendar = list(iter_rooms_booked_ranges(db_session, start, start + timedelta(days=30)))
+    assert len(calendar) == ROOMS
+    # фільтр збігається з предикатом часткових ACTIVE-індексів: історія бронювань не читається
+    [plan] = _plans(db_session, queries)
+    assert "Seq Scan on bookings" not in plan, plan
+    assert "ix_bookings_active_" in plan, plan
+
+
+def test_user_listing_uses_user_index(db_session, booking_history):
+    with _captured_booking_queries(db_session) as queries:
+        get_user_bookings(db_session, booking_history["users"][0])
+    _assert_uses_index(db_session, queries, "ix_bookings_user_room_status")
+
+
+def test_review_approval_check_uses_user_index(db_session, booking_history):
+    with _captured_booking_queries(db_session) as queries:
+        db_session.query(Booking).filter(
+            Booking.user_id == booking_history["users"][0],
+            Booking.room_id == booking_history["rooms"][0],
+            Booking.status != BookingStatus.CANCELLED
+        ).first()
+    _assert_uses_index(db_session, queries, "ix_bookings_user_room_status")
+
+
+def test_upcoming_checkins_use_active_check_in_index(db_session, booking_history):
+    with _captured_booking_queries(db_session) as queries:
+        get_upcoming_checkins(db_session)
+    _assert_uses_index(db_session, queries, "ix_bookings_active_check_in")
+
+
+def test_daily_reminders_use_active_date_indexes(db_session, booking_history):
+    with _captured_booking_queries(db_session) as queries:
+        send_daily_reminders(db_session)
+    # один INSERT ... SELECT у outbox на тип нагадування, кожен - через свій частковий індекс
+    checkin_plan, checkout_plan = _plans(db_session, queries)
+    assert "ix_bookings_active_check_in" in checkin_plan, checkin_plan
+    assert "ix_bookings_active_check_out" in checkout_plan, checkout_plan
+
+
+def test_expiry_sweep_uses_active_check_out_index(db_session, booking_history):
+    # планувальник вважає status і check_out_date незалежними й переоцінює кількість
+    # прострочених ACTIVE; порядок індексу виграє, коли порція менша за оцінку,
+    # як на реальній таблиці з порцією 1000
+    with _captured_booking_queries(db_session) as queries:
+        update_expired_bookings_status(db_session, chunk_size=100)
+    _assert_uses_index(db_session, queries, "ix_bookings_active_check_out")
+
+
+def test_migration_round_trip(db_session):
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    bind = db_session.get_bind()
+    # тестова БД, навіть якщо якийсь тест перезавантажив src.api.db
+    config.set_main_option("sqlalchemy.url", bind.url.render_as_string(hide_password=False).replace("%", "%%"))
+
+    def booking_indexes():
+        return {index["name"] for index in inspect(bind).get_indexes("bookings")}
+
+    def has_outbox():
+        return "outbox" in inspect(bind).get_table_names()
+
+    try:
+        # таблиці вже створені з моделей - як у init_db
+        command.upgrade(config, "head")
+        assert HOT_QUERY_INDEXES <= booking_indexes()
+
+        command.downgrade(config, "base")
+        assert not HOT_QUERY_INDEXES & booking_indexes()
+        assert not has_outbox()
+
+        command.upgrade(config, "head")
+        assert HOT_QUERY_INDEXES <= booking_indexes()
+        assert has_outbox()
+    finally:
+        with bind.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
@@ -694,8 +694,8 @@ def test_update_expired_bookings_multiple(db_session, test_user_registered, test
             booking_code=f"EXP{i}",
             user_id=test_user_registered.user_id,
             room_id=test_room.room_id,
-            check_in_date=date.today() - timedelta(days=10+i),
-            check_out_date=date.today() - timedelta(days=8+i),
+            check_in_date=date.today() - timedelta(days=10+3*i),
+            check_out_date=date.today() - timedelta(days=8+3*i),
             status=BookingStatus.ACTIVE,
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc)
@@ -703,13 +703,15 @@ def test_update_expired_bookings_multiple(db_session, test_user_registered, test
         db_session.add(expired)
     db_session.commit()
     
-    count = update_expired_bookings_status(db_session)
+    count, chunks = update_expired_bookings_status(db_session)
     
     assert count >= 3
+    assert chunks >= 1
 
 def test_update_expired_bookings_no_expired(db_session):
-    count = update_expired_bookings_status(db_session)
+    count, chunks = update_expired_bookings_status(db_session)
     assert count == 0
+    assert chunks == 0
 
 def test_create_booking_room_not_found(db_session, test_user_registered):
     booking_data = {
@@ -866,7 +868,7 @@ def test_update_booking_full_completed(db_session, test_booking):
 
 def test_get_all_bookings_route(client, db_session, test_booking):
     """Тест GET /api/v1/bookings/ - успішне отримання всіх бронювань"""
-    resp = client.get("/api/v1/bookings/")
+    resp = client.get("/api/v1/bookings/?all=true")
     assert resp.status_code == 200
     data = resp.get_json()
     assert isinstance(data, list)
@@ -984,7 +986,7 @@ def test_patch_booking_not_found(client, monkeypatch):
     """Тест PATCH /api/v1/bookings/<code> - бронювання не знайдено"""
     import src.api.routes.bookings as booking_routes_module
     
-    def mock_update_partial(db, code, data):
+    def mock_update_partial(db, code, data, expected_version=None):
         return None
     
     monkeypatch.setattr(booking_routes_module, "update_booking_partial", mock_update_partial)
@@ -999,7 +1001,7 @@ def test_patch_booking_cannot_modify_error(client, monkeypatch):
     
     mock_db = MagicMock()
     
-    def mock_update_partial(db, code, data):
+    def mock_update_partial(db, code, data, expected_version=None):
         raise ValueError("Cannot modify completed booking")
     
     monkeypatch.setattr(booking_routes_module, "update_booking_partial", mock_update_partial)
@@ -1015,7 +1017,7 @@ def test_patch_booking_not_available_error(client, monkeypatch):
     
     mock_db = MagicMock()
     
-    def mock_update_partial(db, code, data):
+    def mock_update_partial(db, code, data, expected_version=None):
         raise ValueError("Room not available for new dates")
     
     monkeypatch.setattr(booking_routes_module, "update_booking_partial", mock_update_partial)
@@ -1031,7 +1033,7 @@ def test_patch_booking_generic_value_error(client, monkeypatch):
     
     mock_db = MagicMock()
     
-    def mock_update_partial(db, code, data):
+    def mock_update_partial(db, code, data, expected_version=None):
         raise ValueError("Invalid data provided")
     
     monkeypatch.setattr(booking_routes_module, "update_booking_partial", mock_update_partial)
@@ -1045,7 +1047,7 @@ def test_put_booking_not_found(client, monkeypatch):
     """Тест PUT /api/v1/bookings/<code> - бронювання не знайдено"""
     import src.api.routes.bookings as booking_routes_module
     
-    def mock_update_full(db, code, data):
+    def mock_update_full(db, code, data, expected_version=None):
         return None
     
     monkeypatch.setattr(booking_routes_module, "update_booking_full", mock_update_full)
@@ -1067,7 +1069,7 @@ def test_put_booking_cannot_modify_error(client, monkeypatch):
     
     mock_db = MagicMock()
     
-    def mock_update_full(db, code, data):
+    def mock_update_full(db, code, data, expected_version=None):
         raise ValueError("Cannot modify cancelled booking")
     
     monkeypatch.setattr(booking_routes_module, "update_booking_full", mock_update_full)
@@ -1090,7 +1092,7 @@ def test_put_booking_not_available_error(client, monkeypatch):
     
     mock_db = MagicMock()
     
-    def mock_update_full(db, code, data):
+    def mock_update_full(db, code, data, expected_version=None):
         raise ValueError("Room not available for these dates")
     
     monkeypatch.setattr(booking_routes_module, "update_booking_full", mock_update_full)
@@ -1113,7 +1115,7 @@ def test_put_booking_generic_value_error(client, monkeypatch):
     
     mock_db = MagicMock()
     
-    def mock_update_full(db, code, data):
+    def mock_update_full(db, code, data, expected_version=None):
         raise ValueError("Invalid booking data")
     
     monkeypatch.setattr(booking_routes_module, "update_booking_full", mock_update_full)
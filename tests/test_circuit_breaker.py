@@ -0,0 +1,108 @@
+import pytest
+from src.api.services.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_retry_after_counts_down_cool_down(breaker, clock):
+    assert breaker.retry_after() == 0
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.retry_after() == 30
+
+    clock.now += 20
+    assert breaker.retry_after() == 10
+
+
+def test_half_open_lets_one_trial_through(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    # поки пробний виклик триває, інші відхиляються
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_for_another_cool_down(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == 30
+    assert breaker.snapshot()["times_opened"] == 2
+
+
+def test_released_trial_lets_the_next_one_through(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_snapshot(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 5
+
+    assert breaker.snapshot() == {
+        "state": OPEN,
+        "consecutive_failures": 3,
+        "failure_threshold": 3,
+        "reset_timeout_seconds": 30,
+        "retry_after_seconds": 25.0,
+        "times_opened": 1,
+        "rejected": 0
+    }
+
+    breaker.reset()
+    assert breaker.snapshot()["state"] == CLOSED
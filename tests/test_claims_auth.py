@@ -0,0 +1,139 @@
+import jwt as pyjwt
+import pytest
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import src.api.auth as auth
+from src.api.auth import create_token, generate_auth_token_for_user
+from src.api.models.user_model import User, UserRole
+from src.api.services.identity_cache import identity_cache, token_version_cache
+from src.api.services.user_service import update_user_partial
+
+
+@pytest.fixture
+def claims_only(monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_CLAIMS_ONLY", True)
+
+
+@pytest.fixture
+def staff(db_session):
+    user = User(
+        email=f"claims_{uuid.uuid4().hex[:8]}@example.com",
+        first_name="Claims",
+        last_name="Staff",
+        phone=f"+38066{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.STAFF,
+        is_registered=True
+    )
+    user.set_password("Password1!")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def users_queries():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", capture)
+
+
+def _headers(user):
+    return {"Authorization": f"Bearer {generate_auth_token_for_user(user)}"}
+
+
+def test_version_changes_only_with_role_password_or_registration(db_session, staff):
+    assert staff.token_version == 0
+
+    staff.first_name = "Renamed"
+    db_session.commit()
+    assert staff.token_version == 0
+
+    staff.role = UserRole.ADMIN
+    db_session.commit()
+    assert staff.token_version == 1
+
+    staff.set_password("Password2!")
+    db_session.commit()
+    assert staff.token_version == 2
+
+
+def test_tokens_carry_version_and_configured_lifetime(staff, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_LIFETIME_MINUTES", 15)
+    claims = pyjwt.decode(generate_auth_token_for_user(staff), auth.SECRET_KEY, algorithms=["HS256"])
+
+    assert claims["token_version"] == 0
+    lifetime = claims["exp"] - datetime.now(timezone.utc).timestamp()
+    assert 14 * 60 < lifetime <= 15 * 60
+
+
+def test_polling_dashboard_reads_users_once_per_token(client, staff, claims_only, users_queries):
+    headers = _headers(staff)
+    for _ in range(5):
+        assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 200
+        # TTL кешу ідентичності минув - claims-only запитам це байдуже
+        identity_cache.clear()
+
+    assert len(users_queries) == 1
+    assert token_version_cache.snapshot()["hits"] == 4
+
+
+def test_role_change_revokes_claims(client, db_session, staff, claims_only):
+    headers = _headers(staff)
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 200
+
+    update_user_partial(db_session, staff.user_id, {"role": "GUEST"})
+    resp = client.get("/api/v1/reviews/pending", headers=headers)
+    assert resp.status_code == 401
+    assert resp.get_json()["message"] == "Token has been revoked"
+
+    fresh = generate_auth_token_for_user(db_session.get(User, staff.user_id))
+    resp = client.get("/api/v1/reviews/pending", headers={"Authorization": f"Bearer {fresh}"})
+    assert resp.status_code == 403
+
+
+def test_password_change_revokes_claims(client, db_session, staff, claims_only):
+    headers = _headers(staff)
+    update_user_partial(db_session, staff.user_id, {"password": "Password2!"})
+
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 401
+
+
+def test_refreshed_token_keeps_claims_path(client, staff, claims_only):
+    resp = client.get("/api/v1/auth/refresh", headers=_headers(staff))
+    claims = pyjwt.decode(resp.get_json()["token"], auth.SECRET_KEY, algorithms=["HS256"])
+    assert claims["token_version"] == 0
+
+
+def test_tokens_without_version_use_identity_lookup(client, staff, claims_only):
+    headers = {"Authorization": f"Bearer {create_token(staff.user_id, role='STAFF')}"}
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 200
+    assert identity_cache.snapshot()["misses"] == 1
+    assert token_version_cache.snapshot()["misses"] == 0
+
+
+def test_writes_authorize_against_current_identity(client, staff, claims_only):
+    client.get("/api/v1/reviews/pending", headers=_headers(staff))
+    assert identity_cache.snapshot()["misses"] == 0
+
+    client.post("/api/v1/reviews/1/approve", headers=_headers(staff))
+    assert identity_cache.snapshot()["misses"] == 1
+
+
+def test_default_mode_rejects_stale_token_version(client, db_session, staff):
+    headers = _headers(staff)
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 200
+
+    update_user_partial(db_session, staff.user_id, {"first_name": "Still", "password": "Password2!"})
+    resp = client.get("/api/v1/reviews/pending", headers=headers)
+    assert resp.status_code == 401
+    assert resp.get_json()["message"] == "Token has been revoked"
+    assert client.get("/api/v1/reviews/pending", headers=_headers(staff)).status_code == 200
@@ -0,0 +1,140 @@
+import pytest
+import time
+from email import message_from_bytes
+from datetime import date, timedelta
+from sqlalchemy import event, insert
+from src.api.models.outbox_model import OutboxMessage, OutboxStatus
+from src.api.models.booking_model import Booking, BookingStatus
+from src.api.models.room_model import Room, RoomType, RoomStatus
+from src.api.models.user_model import User, UserRole
+from src.api.services import notification_service as notifications
+from src.api.services.notification_service import NotificationType, send_daily_reminders, notification_service
+from src.api.services.outbox import process_outbox_batch
+
+
+@pytest.fixture
+def sink_mailer(smtp_sink, monkeypatch):
+    """Модульний notification_service, що надсилає у локальний SMTP sink"""
+    monkeypatch.setattr(notification_service, "smtp_host", smtp_sink.host)
+    monkeypatch.setattr(notification_service, "smtp_port", smtp_sink.port)
+    monkeypatch.setattr(notification_service, "smtp_user", "hotel@example.com")
+    monkeypatch.setattr(notification_service, "smtp_password", "secret")
+    monkeypatch.setattr(notification_service, "smtp_starttls", False)
+    monkeypatch.setattr(notification_service, "email_enabled", True)
+    notification_service.smtp_pool.close_all()
+    yield smtp_sink
+    notification_service.smtp_pool.close_all()
+
+
+def _seed_reminders(session, rooms):
+    """На кожну кімнату: виїзд завтра і заїзд завтра (2 * rooms нагадувань) плюс стороннє бронювання"""
+    room_ids = session.execute(insert(Room).returning(Room.room_id), [
+        {"room_number": f"RM{i:05d}", "room_type": RoomType.STANDARD, "max_guest": 2,
+         "base_price": 1000.0, "status": RoomStatus.AVAILABLE, "floor": 1}
+        for i in range(rooms)
+    ]).scalars().all()
+    user_ids = session.execute(insert(User).returning(User.user_id), [
+        {"email": f"rm{i}@example.com", "first_name": "Reminder", "last_name": f"Guest{i}",
+         "phone": f"+38067{i:07d}", "role": UserRole.GUEST}
+        for i in range(100)
+    ]).scalars().all()
+
+    tomorrow = date.today() + timedelta(days=1)
+    rows = []
+    for r, room_id in enumerate(room_ids):
+        stays = [
+            (tomorrow - timedelta(days=2), tomorrow, BookingStatus.ACTIVE),
+            (tomorrow, tomorrow + timedelta(days=3), BookingStatus.ACTIVE),
+            (tomorrow + timedelta(days=5), tomorrow + timedelta(days=7), BookingStatus.ACTIVE),
+            (tomorrow + timedelta(days=10), tomorrow + timedelta(days=12), BookingStatus.CANCELLED),
+        ]
+        for n, (check_in, check_out, status) in enumerate(stays):
+            rows.append({"booking_code": f"RM{r:05d}{n}", "user_id": user_ids[(r + n) % len(user_ids)],
+                         "room_id": room_id, "check_in_date": check_in, "check_out_date": check_out,
+                         "status": status})
+    session.execute(insert(Booking), rows)
+    session.commit()
+
+
+def _deliver_all(session, batch_size=20):
+    """Прогоняє outbox, доки є готові до відправки повідомлення"""
+    while process_outbox_batch(session, batch_size=batch_size):
+        pass
+    return session.query(OutboxMessage).order_by(OutboxMessage.id).all()
+
+
+def test_reminders_are_queued_with_one_statement_per_type(db_session, monkeypatch):
+    _seed_reminders(db_session, 20)
+    sent = []
+    monkeypatch.setattr(notification_service, "send_emails", lambda emails: sent.extend(emails) or [True] * len(emails))
+
+    statements = []
+    bind = db_session.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        stats = send_daily_reminders(db_session)
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+
+    # без N+1 і без рядків у Python: по одному INSERT ... SELECT на тип нагадування
+    assert len([s for s in statements if "FROM bookings" in s]) == 2
+    assert all(s.lstrip().upper().startswith("INSERT INTO OUTBOX") for s in statements if "FROM bookings" in s)
+    assert (stats["checkin"], stats["checkout"], stats["queued"]) == (20, 20, 40)
+    assert sent == []
+    kinds = [kind for (kind,) in db_session.query(OutboxMessage.kind)]
+    assert kinds.count(NotificationType.CHECKIN_REMINDER.value) == 20
+    assert kinds.count(NotificationType.CHECKOUT_REMINDER.value) == 20
+
+
+def test_queued_reminders_are_delivered_by_the_outbox(db_session, sink_mailer):
+    _seed_reminders(db_session, 5)
+
+    stats = send_daily_reminders(db_session)
+    messages = _deliver_all(db_session)
+
+    assert stats["queued"] == 10
+    assert notifications.last_reminder_run == stats
+    assert [m.status for m in messages] == [OutboxStatus.SENT] * 10
+    assert len(sink_mailer.messages) == 10
+    payload = messages[0].payload
+    assert set(payload) >= {"guest_name", "booking_code", "room_number"}
+    bodies = [
+        part.get_payload(decode=True).decode()
+        for raw in sink_mailer.messages
+        for part in message_from_bytes(raw).walk() if not part.is_multipart()
+    ]
+    assert any(payload["booking_code"] in body for body in bodies)
+
+
+def test_reminders_wait_in_the_outbox_while_smtp_is_down(db_session, sink_mailer):
+    _seed_reminders(db_session, 5)
+    breaker = notification_service.smtp_breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    send_daily_reminders(db_session)
+    messages = _deliver_all(db_session)
+
+    # circuit відкритий: нагадування відкладені, а не втрачені
+    assert [(m.status, m.attempts) for m in messages] == [(OutboxStatus.PENDING, 0)] * 10
+    assert sink_mailer.messages == []
+
+
+@pytest.mark.benchmark
+def test_ten_thousand_reminders_benchmark(db_session, sink_mailer):
+    """10 000 нагадувань у outbox і через локальний SMTP: секунди, а не хвилини."""
+    _seed_reminders(db_session, 5000)
+
+    stats = send_daily_reminders(db_session)
+    started = time.perf_counter()
+    messages = _deliver_all(db_session, batch_size=500)
+
+    assert stats["queued"] == 10000
+    assert stats["total_seconds"] < 5
+    assert all(m.status == OutboxStatus.SENT for m in messages)
+    assert len(sink_mailer.messages) == 10000
+    assert time.perf_counter() - started < 60
@@ -0,0 +1,126 @@
+import os
+import pytest
+import time
+from jinja2 import Environment, UndefinedError
+from src.api.services.email_templates import EmailTemplates, EMAIL_TEMPLATE_DIR, TEMPLATE_NAMES, email_templates
+from src.api.services.notification_service import NotificationService, NotificationType
+
+
+def _booking(i=0):
+    return {
+        'guest_name': f'Іван Петренко {i}',
+        'booking_code': f'BK{i:08d}',
+        'room_number': str(100 + i % 50),
+        'check_in_date': '15.01.2025',
+        'check_out_date': '18.01.2025',
+        'nights': 3,
+        'total_price': '3600.00',
+        'refund_amount': '3600.00',
+        'bookings': [
+            {'booking_code': f'BK{i:08d}', 'room_number': '101', 'check_in_date': '15.01.2025',
+             'check_out_date': '18.01.2025', 'nights': 3, 'total_price': '3600.00'},
+            {'booking_code': f'BK{i + 1:08d}', 'room_number': '102', 'check_in_date': '15.01.2025',
+             'check_out_date': '18.01.2025', 'nights': 3, 'total_price': '3600.00'},
+        ],
+    }
+
+
+def test_template_names_cover_notification_types():
+    assert set(TEMPLATE_NAMES) == {kind.value for kind in NotificationType}
+
+
+@pytest.mark.parametrize("name", TEMPLATE_NAMES)
+def test_every_template_renders_booking_data(name):
+    body = email_templates.render(name, _booking())
+    assert 'Іван Петренко 0' in body
+    assert 'BK00000000' in body
+
+
+def test_guest_input_is_escaped():
+    body = email_templates.render("booking_created", {**_booking(), 'guest_name': '<script>x</script>'})
+    assert '<script>' not in body
+    assert '&lt;script&gt;' in body
+
+
+def test_missing_field_raises_instead_of_rendering_blank():
+    data = _booking()
+    del data['booking_code']
+    with pytest.raises(UndefinedError):
+        email_templates.render("checkin_reminder", data)
+
+
+def test_refund_block_only_with_refund():
+    assert 'Сума повернення' in email_templates.render("booking_cancelled", _booking())
+    assert 'Сума повернення' not in email_templates.render("booking_cancelled", {**_booking(), 'refund_amount': None})
+
+
+def test_group_template_lists_every_room():
+    service = NotificationService()
+    template = service._get_group_booking_created_template(_booking())
+    assert '(2 номерів)' in template['subject']
+    assert 'BK00000000 · кімната 101' in template['body']
+    assert 'BK00000001 · кімната 102' in template['body']
+
+
+def test_render_many_matches_single_renders():
+    items = [_booking(i) for i in range(5)]
+    assert email_templates.render_many("checkout_reminder", items) == [
+        email_templates.render("checkout_reminder", item) for item in items
+    ]
+
+
+def test_shell_is_rendered_once_around_body():
+    html = email_templates.wrap('<p>BODY</p>')
+    assert html.startswith('<html>')
+    assert html.rstrip().endswith('</html>')
+    assert html.count('<p>BODY</p>') == 1
+    assert html.index('class="content"') < html.index('<p>BODY</p>') < html.index('class="footer"')
+
+
+def test_message_uses_wrapped_body():
+    service = NotificationService()
+    msg = service._build_message('guest@example.com', 'Subject', '<p>BODY</p>')
+    html = msg.get_payload()[0].get_payload(decode=True).decode()
+    assert html == email_templates.wrap('<p>BODY</p>')
+
+
+def test_templates_are_not_reloaded_per_render(monkeypatch):
+    templates = EmailTemplates()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("template source loaded again")
+
+    monkeypatch.setattr("jinja2.loaders.FileSystemLoader.get_source", fail)
+    assert 'BK00000000' in templates.render("checkin_reminder", _booking())
+
+
+def test_render_cost_benchmark():
+    """Мкс на лист: компіляція шаблону щоразу vs скомпільований макрос vs пакетний рендер."""
+    items = [_booking(i) for i in range(500)]
+    with open(os.path.join(EMAIL_TEMPLATE_DIR, "checkin_reminder.html"), encoding="utf-8") as f:
+        source = f.read()
+
+    def per_message(label, render):
+        started = time.perf_counter()
+        bodies = render()
+        micros = (time.perf_counter() - started) / len(items) * 1e6
+        print(f"\n{label:<32} {micros:8.1f} us/message")
+        assert len(bodies) == len(items)
+        return micros
+
+    env = Environment(autoescape=True)
+    compiled_each_time = per_message(
+        "compile per message", lambda: [str(env.from_string(source).module.render(item)) for item in items]
+    )
+    cached = per_message(
+        "cached macro", lambda: [email_templates.render("checkin_reminder", item) for item in items]
+    )
+    batched = per_message("render_many", lambda: email_templates.render_many("checkin_reminder", items))
+    per_message("render_many + shell", lambda: [
+        email_templates.wrap(body) for body in email_templates.render_many("checkin_reminder", items)
+    ])
+    for name in ("booking_created", "group_booking_created", "booking_cancelled", "checkout_reminder"):
+        per_message(name, lambda: email_templates.render_many(name, items))
+
+    assert cached * 5 < compiled_each_time
+    assert batched < compiled_each_time
@@ -0,0 +1,181 @@
+import pytest
+import uuid
+from datetime import date, timedelta
+from sqlalchemy import event
+from src.api.services.booking_service import create_booking, create_group_booking
+from src.api.services.availability_index import availability_index
+from src.api.services.notification_service import notification_service
+from src.api.services.outbox import process_outbox_batch
+from src.api.models.booking_model import Booking, BookingStatus
+from src.api.models.room_model import Room, RoomType, RoomStatus
+
+
+@pytest.fixture
+def group_rooms(db_session):
+    rooms = []
+    for _ in range(4):
+        room = Room(
+            room_number=f"GR{uuid.uuid4().hex[:6]}",
+            room_type=RoomType.STANDARD,
+            max_guest=2,
+            base_price=1000.0,
+            status=RoomStatus.AVAILABLE,
+            floor=1
+        )
+        db_session.add(room)
+        rooms.append(room)
+    db_session.commit()
+    return rooms
+
+
+@pytest.fixture
+def sent_summaries(monkeypatch):
+    sent = []
+
+    def fake_notify(guest_email, guest_phone, booking_data):
+        sent.append((guest_email, booking_data))
+        return True
+
+    monkeypatch.setattr(notification_service, "notify_group_booking_created", fake_notify)
+    monkeypatch.setattr(notification_service, "email_enabled", True)
+    return sent
+
+
+def _guest(**extra):
+    data = {
+        "email": f"group{uuid.uuid4().hex[:10]}@example.com",
+        "first_name": "Tour",
+        "last_name": "Leader",
+        "phone": f"+38066{uuid.uuid4().int % 10000000:07d}"
+    }
+    data.update(extra)
+    return data
+
+
+def _stays(rooms, check_in, nights=2):
+    return [
+        {"room_id": room.room_id, "check_in_date": check_in, "check_out_date": check_in + timedelta(days=nights)}
+        for room in rooms
+    ]
+
+
+def test_group_booking_creates_all_rooms_with_one_insert(db_session, group_rooms, sent_summaries):
+    check_in = date.today() + timedelta(days=20)
+    # порядок запиту навмисно не збігається з порядком room_id
+    stays = _stays(list(reversed(group_rooms)), check_in)
+
+    inserts = []
+    engine = db_session.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("INSERT INTO BOOKINGS"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        bookings = create_group_booking(db_session, _guest(rooms=stays, special_requests="Group"))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(inserts) == 1
+    assert [b.room_id for b in bookings] == [s["room_id"] for s in stays]
+    assert all(b.status == BookingStatus.ACTIVE for b in bookings)
+    assert all(b.special_requests == "Group" for b in bookings)
+    assert len({b.user_id for b in bookings}) == 1
+
+    # лист іде через outbox, а не під час запиту
+    assert sent_summaries == []
+    process_outbox_batch(db_session)
+    assert len(sent_summaries) == 1
+    summary = sent_summaries[0][1]
+    assert [item["booking_code"] for item in summary["bookings"]] == [b.booking_code for b in bookings]
+    assert summary["total_price"] == "8000.00"
+
+
+def test_group_booking_is_all_or_nothing(db_session, group_rooms, sent_summaries):
+    check_in = date.today() + timedelta(days=30)
+    taken = group_rooms[2]
+    create_booking(db_session, {
+        "room_id": taken.room_id,
+        "check_in_date": check_in + timedelta(days=1),
+        "check_out_date": check_in + timedelta(days=3),
+        **_guest()
+    })
+    before = db_session.query(Booking).count()
+
+    with pytest.raises(ValueError, match=f"Room is already booked: {taken.room_id}"):
+        create_group_booking(db_session, _guest(rooms=_stays(group_rooms, check_in)))
+
+    assert db_session.query(Booking).count() == before
+    process_outbox_batch(db_session)
+    assert sent_summaries == []
+
+
+def test_group_booking_rejects_overlapping_stays_in_request(db_session, group_rooms):
+    room = group_rooms[0]
+    check_in = date.today() + timedelta(days=10)
+    stays = [
+        {"room_id": room.room_id, "check_in_date": check_in, "check_out_date": check_in + timedelta(days=3)},
+        {"room_id": room.room_id, "check_in_date": check_in + timedelta(days=2), "check_out_date": check_in + timedelta(days=4)},
+    ]
+    with pytest.raises(ValueError, match="requested twice"):
+        create_group_booking(db_session, _guest(rooms=stays))
+
+
+def test_group_booking_allows_back_to_back_stays_of_one_room(db_session, group_rooms, sent_summaries):
+    room = group_rooms[0]
+    check_in = date.today() + timedelta(days=10)
+    stays = [
+        {"room_id": room.room_id, "check_in_date": check_in, "check_out_date": check_in + timedelta(days=2)},
+        {"room_id": room.room_id, "check_in_date": check_in + timedelta(days=2), "check_out_date": check_in + timedelta(days=4)},
+    ]
+    assert len(create_group_booking(db_session, _guest(rooms=stays))) == 2
+
+
+def test_group_booking_updates_availability_index(db_session, group_rooms, sent_summaries):
+    check_in = date.today() + timedelta(days=50)
+    room_ids = [room.room_id for room in group_rooms]
+    availability_index.rebuild(db_session)
+
+    create_group_booking(db_session, _guest(rooms=_stays(group_rooms[:2], check_in)))
+
+    assert not availability_index.is_stale()
+    assert availability_index.free_room_ids(
+        db_session, room_ids, check_in, check_in + timedelta(days=1)
+    ) == set(room_ids[2:])
+
+
+def test_api_group_booking_created(client, group_rooms, sent_summaries):
+    check_in = date.today() + timedelta(days=40)
+    payload = _guest(rooms=[
+        {"room_id": s["room_id"], "check_in_date": s["check_in_date"].isoformat(),
+         "check_out_date": s["check_out_date"].isoformat()}
+        for s in _stays(group_rooms, check_in)
+    ])
+    response = client.post("/api/v1/bookings/group", json=payload)
+
+    assert response.status_code == 201
+    bookings = response.get_json()["bookings"]
+    assert len(bookings) == len(group_rooms)
+    assert len({b["booking_code"] for b in bookings}) == len(group_rooms)
+
+
+def test_api_group_booking_conflict_and_missing_room(client, db_session, group_rooms, sent_summaries):
+    check_in = date.today() + timedelta(days=45)
+    stays = [{"room_id": group_rooms[0].room_id, "check_in_date": check_in.isoformat(),
+              "check_out_date": (check_in + timedelta(days=2)).isoformat()}]
+
+    assert client.post("/api/v1/bookings/group", json=_guest(rooms=stays)).status_code == 201
+    assert client.post("/api/v1/bookings/group", json=_guest(rooms=stays)).status_code == 409
+
+    missing = [dict(stays[0], room_id=999999)]
+    assert client.post("/api/v1/bookings/group", json=_guest(rooms=missing)).status_code == 404
+
+
+def test_api_group_booking_validation(client, group_rooms):
+    assert client.post("/api/v1/bookings/group", json=_guest(rooms=[])).status_code == 422
+
+    check_in = date.today() + timedelta(days=5)
+    bad_dates = [{"room_id": group_rooms[0].room_id, "check_in_date": check_in.isoformat(),
+                  "check_out_date": check_in.isoformat()}]
+    assert client.post("/api/v1/bookings/group", json=_guest(rooms=bad_dates)).status_code == 422
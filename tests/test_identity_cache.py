@@ -0,0 +1,173 @@
+import pytest
+import uuid
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.api.auth import create_token
+from src.api.models.user_model import User, UserRole
+from src.api.services.identity_cache import IdentityCache, identity_cache
+from src.api.services.user_service import update_user_partial, update_user_full, delete_user
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Row:
+    def __init__(self, role=UserRole.GUEST, is_registered=True):
+        self.role = role
+        self.is_registered = is_registered
+
+
+@pytest.fixture
+def loads():
+    calls = []
+
+    def load(user_id):
+        calls.append(user_id)
+        return _Row() if user_id < 100 else None
+    load.calls = calls
+    return load
+
+
+def test_second_lookup_is_a_hit(loads):
+    cache = IdentityCache()
+    first = cache.get(1, loads)
+    assert cache.get(1, loads) is first
+    assert loads.calls == [1]
+    assert (first.user_id, first.role, first.is_registered) == (1, UserRole.GUEST, True)
+    assert cache.snapshot()["hit_rate"] == 0.5
+
+
+def test_entries_expire_after_ttl(loads):
+    clock = FakeClock()
+    cache = IdentityCache(ttl=30, clock=clock)
+    cache.get(1, loads)
+    clock.now = 29
+    cache.get(1, loads)
+    clock.now = 31
+    cache.get(1, loads)
+    assert loads.calls == [1, 1]
+
+
+def test_least_recently_used_is_evicted(loads):
+    cache = IdentityCache(max_size=2)
+    cache.get(1, loads)
+    cache.get(2, loads)
+    cache.get(1, loads)
+    cache.get(3, loads)
+
+    assert len(cache) == 2
+    cache.get(1, loads)
+    cache.get(2, loads)
+    assert loads.calls == [1, 2, 3, 2]
+    assert cache.snapshot()["evictions"] == 2
+
+
+def test_unknown_user_is_not_cached(loads):
+    cache = IdentityCache()
+    assert cache.get(404, loads) is None
+    assert cache.get(404, loads) is None
+    assert loads.calls == [404, 404]
+
+
+def test_value_loaded_before_invalidation_is_not_stored():
+    cache = IdentityCache()
+
+    def load_racing_with_update(user_id):
+        # інший потік змінив користувача, поки ми читали старий рядок
+        cache.invalidate(user_id)
+        return _Row(role=UserRole.GUEST)
+
+    assert cache.get(1, load_racing_with_update).role == UserRole.GUEST
+    assert len(cache) == 0
+
+
+def test_identity_role_helpers():
+    cache = IdentityCache()
+    admin = cache.get(1, lambda _: _Row(role=UserRole.ADMIN))
+    staff = cache.get(2, lambda _: _Row(role=UserRole.STAFF))
+    assert admin.is_admin and admin.is_staff and not admin.is_guest
+    assert staff.is_staff and not staff.is_admin
+
+
+@pytest.fixture
+def guest(db_session):
+    user = User(
+        email=f"cache_{uuid.uuid4().hex[:8]}@example.com",
+        first_name="Cache",
+        last_name="Guest",
+        phone=f"+38093{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.GUEST,
+        is_registered=True
+    )
+    user.set_password("Password1!")
+    db_session.add(user)
+    db_session.commit()
+    token = create_token(user.user_id, role="GUEST", is_admin=False)
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def users_queries():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", capture)
+
+
+def test_authenticated_requests_skip_users_table(client, guest, users_queries):
+    _, headers = guest
+    assert client.get("/api/v1/auth/refresh", headers=headers).status_code == 200
+    assert len(users_queries) == 1
+
+    for _ in range(5):
+        assert client.get("/api/v1/auth/refresh", headers=headers).status_code == 200
+    assert len(users_queries) == 1
+
+
+def test_partial_update_of_role_is_seen_at_once(client, db_session, guest):
+    user, headers = guest
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 403
+
+    update_user_partial(db_session, user.user_id, {"role": "STAFF"})
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 200
+
+
+def test_full_update_of_role_is_seen_at_once(client, db_session, guest):
+    user, headers = guest
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 403
+
+    update_user_full(db_session, user.user_id, {
+        "email": user.email, "first_name": "Cache", "last_name": "Staff", "phone": user.phone, "role": "STAFF"
+    })
+    assert client.get("/api/v1/reviews/pending", headers=headers).status_code == 200
+
+
+def test_deleted_user_loses_access(client, db_session, guest):
+    user, headers = guest
+    assert client.get("/api/v1/auth/refresh", headers=headers).status_code == 200
+
+    delete_user(db_session, user.user_id)
+    assert client.get("/api/v1/auth/refresh", headers=headers).status_code == 401
+
+
+def test_rolled_back_change_keeps_cached_identity(db_session, guest):
+    user, _ = guest
+    identity_cache.get(user.user_id, lambda _: user)
+    invalidations = identity_cache.snapshot()["invalidations"]
+
+    user.role = UserRole.ADMIN
+    db_session.flush()
+    db_session.rollback()
+
+    assert identity_cache.snapshot()["invalidations"] == invalidations
+    assert len(identity_cache) == 1
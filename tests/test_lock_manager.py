@@ -0,0 +1,204 @@
+import pytest
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+from src.api.auth import create_token
+from src.api.services.lock_manager import (
+    LockMetrics,
+    booking_lock_keys,
+    date_bucket,
+    lock_room_dates,
+    lock_metrics,
+    BOOKING_LOCK_BUCKET_DAYS
+)
+from src.api.services import booking_service
+from src.api.services.booking_service import create_booking, create_group_booking, update_booking_partial
+from src.api.services.room_service import update_room_partial
+from src.api.models.room_model import Room, RoomType, RoomStatus
+from src.api.models.user_model import User, UserRole
+
+
+@pytest.fixture
+def lock_room(db_session):
+    room = Room(
+        room_number=f"LK{uuid.uuid4().hex[:6]}",
+        room_type=RoomType.STANDARD,
+        max_guest=2,
+        base_price=1000.0,
+        status=RoomStatus.AVAILABLE,
+        floor=1
+    )
+    db_session.add(room)
+    db_session.commit()
+    return room
+
+
+def _week_start(offset_weeks=0):
+    """Перший день бакету, щоб тести не залежали від дня тижня"""
+    bucket = date_bucket(date.today()) + 10 + offset_weeks
+    return date.fromordinal(bucket * BOOKING_LOCK_BUCKET_DAYS)
+
+
+def _hold_lock_in_thread(bind, room_id, check_in, check_out, result):
+    session = Session(bind=bind)
+    try:
+        started = time.perf_counter()
+        lock_room_dates(session, room_id, check_in, check_out)
+        result["wait"] = time.perf_counter() - started
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_lock_keys_cover_nights_per_bucket():
+    start = _week_start()
+    # ніч перед check_out належить тому ж тижню - один ключ
+    assert booking_lock_keys([(5, start, start + timedelta(days=BOOKING_LOCK_BUCKET_DAYS))]) == [
+        (5, date_bucket(start))
+    ]
+    # перетин межі тижня - два ключі
+    keys = booking_lock_keys([(5, start + timedelta(days=BOOKING_LOCK_BUCKET_DAYS - 1),
+                                start + timedelta(days=BOOKING_LOCK_BUCKET_DAYS + 1))])
+    assert keys == [(5, date_bucket(start)), (5, date_bucket(start) + 1)]
+
+
+def test_lock_keys_sorted_and_unique():
+    start = _week_start()
+    stays = [(9, start, start + timedelta(days=2)), (3, start, start + timedelta(days=2)),
+             (9, start + timedelta(days=1), start + timedelta(days=3))]
+    assert booking_lock_keys(stays) == [(3, date_bucket(start)), (9, date_bucket(start))]
+
+
+def test_lock_metrics_histogram():
+    metrics = LockMetrics()
+    for wait in (0.0001, 0.005, 0.05, 0.5, 2.0):
+        metrics.record(wait)
+    snapshot = metrics.snapshot()
+
+    assert snapshot["acquired"] == 5
+    assert snapshot["contended"] == 4
+    assert snapshot["max_wait_ms"] == 2000.0
+    assert list(snapshot["wait_histogram"].values()) == [1, 1, 1, 1, 1]
+
+
+def test_same_room_same_week_waits_for_commit(db_session, lock_room):
+    start = _week_start()
+    lock_room_dates(db_session, lock_room.room_id, start, start + timedelta(days=2))
+
+    result = {}
+    other = threading.Thread(target=_hold_lock_in_thread, args=(
+        db_session.get_bind(), lock_room.room_id, start + timedelta(days=3), start + timedelta(days=5), result
+    ))
+    other.start()
+    time.sleep(0.3)
+    assert other.is_alive()
+
+    db_session.commit()
+    other.join(timeout=5)
+    assert result["wait"] >= 0.3
+
+
+def test_other_week_and_room_edits_do_not_wait(db_session, lock_room):
+    start = _week_start()
+    lock_room_dates(db_session, lock_room.room_id, start, start + timedelta(days=2))
+
+    try:
+        result = {}
+        other = threading.Thread(target=_hold_lock_in_thread, args=(
+            db_session.get_bind(), lock_room.room_id,
+            start + timedelta(days=BOOKING_LOCK_BUCKET_DAYS), start + timedelta(days=BOOKING_LOCK_BUCKET_DAYS + 2), result
+        ))
+        other.start()
+        other.join(timeout=5)
+        assert not other.is_alive()
+        assert result["wait"] < 0.3
+
+        # адмін-редагування кімнати не чекає на бронювання
+        admin_session = Session(bind=db_session.get_bind())
+        try:
+            started = time.perf_counter()
+            update_room_partial(admin_session, lock_room.room_id, {"description": "Renovated"})
+            admin_session.commit()
+            assert time.perf_counter() - started < 0.3
+        finally:
+            admin_session.close()
+    finally:
+        db_session.commit()
+
+
+def test_metrics_endpoint_reports_lock_waits(client, db_session, lock_room):
+    admin = User(
+        email=f"admin_{uuid.uuid4().hex[:6]}@test.com",
+        first_name="Admin",
+        last_name="User",
+        role=UserRole.ADMIN,
+        phone=f"+38012{uuid.uuid4().int % 10000000:07d}",
+        is_registered=True
+    )
+    admin.set_password("adminpass")
+    db_session.add(admin)
+    db_session.commit()
+    token = create_token(admin.user_id, role="ADMIN", is_admin=True)
+
+    before = lock_metrics.snapshot()["acquired"]
+    start = _week_start()
+    lock_room_dates(db_session, lock_room.room_id, start, start + timedelta(days=2))
+    db_session.commit()
+
+    response = client.get("/api/v1/metrics/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    locks = response.get_json()["booking_locks"]
+    assert locks["acquired"] == before + 1
+    assert set(locks) >= {"contended", "avg_wait_ms", "max_wait_ms", "wait_histogram"}
+    assert "retry_rate" in response.get_json()["serializable_retries"]
+    assert "daily_reminders" in response.get_json()
+    assert response.get_json()["smtp_circuit"]["state"] == "closed"
+    assert "hit_rate" in response.get_json()["user_identity_cache"]
+    assert "hit_rate" in response.get_json()["token_claims_cache"]
+    assert "hit_rate" in response.get_json()["token_version_cache"]
+    assert "false_positives" in response.get_json()["token_revocation"]
+    assert "in_flight" in response.get_json()["password_hasher"]
+    assert "hit_rate" in response.get_json()["room_catalog"]
+
+    assert client.get("/api/v1/metrics/").status_code == 401
+
+
+def _guest(prefix="lk"):
+    return {
+        "email": f"{prefix}{uuid.uuid4().hex[:10]}@example.com",
+        "first_name": "Lock",
+        "last_name": "Guest",
+        "phone": f"+38068{uuid.uuid4().int % 10000000:07d}"
+    }
+
+
+def test_single_bookings_take_no_advisory_locks_by_default(db_session, lock_room):
+    assert booking_service.BOOKING_CONCURRENCY_MODE == "constraint"
+    start = _week_start()
+    before = lock_metrics.snapshot()["acquired"]
+
+    booking = create_booking(db_session, {
+        "room_id": lock_room.room_id, "check_in_date": start, "check_out_date": start + timedelta(days=2), **_guest()
+    })
+    update_booking_partial(db_session, booking.booking_code, {"check_out_date": start + timedelta(days=3)})
+    db_session.commit()
+    assert lock_metrics.snapshot()["acquired"] == before
+
+
+def test_lock_mode_and_group_bookings_take_advisory_locks(db_session, lock_room, monkeypatch):
+    start = _week_start()
+    before = lock_metrics.snapshot()["acquired"]
+    create_group_booking(db_session, {
+        "rooms": [{"room_id": lock_room.room_id, "check_in_date": start, "check_out_date": start + timedelta(days=2)}],
+        **_guest()
+    })
+    assert lock_metrics.snapshot()["acquired"] == before + 1
+
+    monkeypatch.setattr(booking_service, "BOOKING_CONCURRENCY_MODE", "lock")
+    later = _week_start(1)
+    create_booking(db_session, {
+        "room_id": lock_room.room_id, "check_in_date": later, "check_out_date": later + timedelta(days=2), **_guest()
+    })
+    assert lock_metrics.snapshot()["acquired"] == before + 2
@@ -0,0 +1,170 @@
+import os
+import pytest
+import uuid
+from datetime import date, timedelta
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from src.api.models.booking_model import BOOKING_OVERLAP_CONSTRAINT
+from src.api.models.room_model import Room, RoomType, RoomStatus
+from src.api.models.user_model import User, UserRole
+from src.api.services.booking_service import get_bookings_page
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+@pytest.fixture
+def alembic_config(db_session):
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    bind = db_session.get_bind()
+    # тестова БД, навіть якщо якийсь тест перезавантажив src.api.db
+    config.set_main_option("sqlalchemy.url", bind.url.render_as_string(hide_password=False).replace("%", "%%"))
+    yield config
+    db_session.close()
+    # схема тестової БД знову відповідає моделям
+    command.upgrade(config, "head")
+    with bind.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+
+def _constraint_exists(conn, name):
+    return conn.execute(text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": name}).first() is not None
+
+
+def test_overlap_constraint_migration_refuses_or_cancels_existing_overlaps(db_session, alembic_config, monkeypatch):
+    guest = User(email=f"mig_{uuid.uuid4().hex[:8]}@example.com", first_name="Mig", last_name="Guest",
+                 phone=f"+38066{uuid.uuid4().int % 10000000:07d}", role=UserRole.GUEST)
+    rooms = [Room(room_number=f"MG{uuid.uuid4().hex[:6]}", room_type=RoomType.STANDARD, max_guest=2,
+                  base_price=1000.0, status=RoomStatus.AVAILABLE, floor=1) for _ in range(2)]
+    db_session.add_all([guest, *rooms])
+    db_session.commit()
+    # до downgrade: після нього ORM не прочитає rooms без колонки version
+    guest_id, room_ids = guest.user_id, [room.room_id for room in rooms]
+    # відкрита транзакція сесії тримала б лок, на який чекає ALTER TABLE міграції
+    db_session.close()
+    bind = db_session.get_bind()
+
+    command.upgrade(alembic_config, "head")
+    command.downgrade(alembic_config, "0004")
+    with bind.connect() as conn:
+        assert not _constraint_exists(conn, BOOKING_OVERLAP_CONSTRAINT)
+
+    d = date.today() + timedelta(days=30)
+    stays = [
+        # A, B перетинається з A, C - лише з B; інша кімната не зачіпається
+        ("MIGA", room_ids[0], d, d + timedelta(days=4), "2026-01-01"),
+        ("MIGB", room_ids[0], d + timedelta(days=2), d + timedelta(days=6), "2026-01-02"),
+        ("MIGC", room_ids[0], d + timedelta(days=5), d + timedelta(days=7), "2026-01-03"),
+        ("MIGD", room_ids[1], d, d + timedelta(days=4), "2026-01-04"),
+    ]
+    with bind.begin() as conn:
+        for code, room_id, check_in, check_out, created_at in stays:
+            conn.execute(text(
+                "INSERT INTO bookings (booking_code, user_id, room_id, check_in_date, check_out_date, status, created_at) "
+                "VALUES (:code, :user_id, :room_id, :check_in, :check_out, 'ACTIVE', :created_at)"
+            ), {"code": code, "user_id": guest_id, "room_id": room_id,
+                "check_in": check_in, "check_out": check_out, "created_at": created_at})
+
+    # без явної згоди міграція нічого не скасовує і називає конфліктні бронювання
+    monkeypatch.delenv("MIGRATION_CANCEL_OVERLAPPING_BOOKINGS", raising=False)
+    with pytest.raises(RuntimeError, match="MIGB"):
+        command.upgrade(alembic_config, "head")
+    with bind.connect() as conn:
+        assert not _constraint_exists(conn, BOOKING_OVERLAP_CONSTRAINT)
+        assert conn.execute(text("SELECT status FROM bookings WHERE booking_code = 'MIGB'")).scalar() == "ACTIVE"
+
+    monkeypatch.setenv("MIGRATION_CANCEL_OVERLAPPING_BOOKINGS", "true")
+    command.upgrade(alembic_config, "head")
+
+    with bind.connect() as conn:
+        assert _constraint_exists(conn, BOOKING_OVERLAP_CONSTRAINT)
+        statuses = dict(conn.execute(text(
+            "SELECT booking_code, status FROM bookings WHERE booking_code LIKE 'MIG%'"
+        )).all())
+        assert statuses == {"MIGA": "ACTIVE", "MIGB": "CANCELLED", "MIGC": "ACTIVE", "MIGD": "ACTIVE"}
+
+    with pytest.raises(IntegrityError, match=BOOKING_OVERLAP_CONSTRAINT):
+        with bind.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO bookings (booking_code, user_id, room_id, check_in_date, check_out_date, status) "
+                "VALUES ('MIGE', :user_id, :room_id, :check_in, :check_out, 'ACTIVE')"
+            ), {"user_id": guest_id, "room_id": room_ids[0],
+                "check_in": d + timedelta(days=1), "check_out": d + timedelta(days=2)})
+
+
+def test_keyset_pagination_indexes_migration(db_session, alembic_config):
+    bind = db_session.get_bind()
+
+    def indexes(table):
+        with bind.connect() as conn:
+            return {row[0] for row in conn.execute(
+                text("SELECT indexname FROM pg_indexes WHERE tablename = :table"), {"table": table}
+            )}
+
+    command.upgrade(alembic_config, "head")
+    command.downgrade(alembic_config, "0005")
+    assert "ix_bookings_created_at_code" not in indexes("bookings")
+    assert "ix_reviews_created_at_id" not in indexes("reviews")
+
+    command.upgrade(alembic_config, "0006")
+    assert "ix_bookings_created_at_code" in indexes("bookings")
+    assert "ix_reviews_created_at_id" in indexes("reviews")
+
+
+def test_version_columns_migration_keeps_existing_rows(db_session, alembic_config):
+    room = Room(room_number=f"MV{uuid.uuid4().hex[:6]}", room_type=RoomType.STANDARD, max_guest=2,
+                base_price=1000.0, status=RoomStatus.AVAILABLE, floor=1)
+    db_session.add(room)
+    db_session.commit()
+    room_id = room.room_id
+    db_session.close()
+    bind = db_session.get_bind()
+
+    command.upgrade(alembic_config, "head")
+    command.downgrade(alembic_config, "0006")
+    with bind.connect() as conn:
+        assert "version" not in {c["name"] for c in inspect(conn).get_columns("rooms")}
+        assert "version" not in {c["name"] for c in inspect(conn).get_columns("bookings")}
+
+    command.upgrade(alembic_config, "0007")
+    assert db_session.get(Room, room_id).version == 1
+    db_session.close()
+
+
+def test_created_at_migration_lets_pagination_pass_old_null_rows(db_session, alembic_config):
+    guest = User(email=f"mig_{uuid.uuid4().hex[:8]}@example.com", first_name="Mig", last_name="Guest",
+                 phone=f"+38066{uuid.uuid4().int % 10000000:07d}", role=UserRole.GUEST)
+    room = Room(room_number=f"MC{uuid.uuid4().hex[:6]}", room_type=RoomType.STANDARD, max_guest=2,
+                base_price=1000.0, status=RoomStatus.AVAILABLE, floor=1)
+    db_session.add_all([guest, room])
+    db_session.commit()
+    guest_id, room_id = guest.user_id, room.room_id
+    db_session.close()
+    bind = db_session.get_bind()
+
+    command.upgrade(alembic_config, "head")
+    command.downgrade(alembic_config, "0007")
+    d = date.today() + timedelta(days=60)
+    with bind.begin() as conn:
+        # рядок зі старих версій без created_at між двома звичайними
+        for i, created_at in enumerate(["2026-01-01", None, "2026-01-03"]):
+            conn.execute(text(
+                "INSERT INTO bookings (booking_code, user_id, room_id, check_in_date, check_out_date, status, created_at) "
+                "VALUES (:code, :user_id, :room_id, :check_in, :check_out, 'ACTIVE', :created_at)"
+            ), {"code": f"MIGN{i}", "user_id": guest_id, "room_id": room_id, "check_in": d + timedelta(days=3 * i),
+                "check_out": d + timedelta(days=3 * i + 2), "created_at": created_at})
+
+    command.upgrade(alembic_config, "0008")
+    with bind.connect() as conn:
+        assert not {c["name"]: c for c in inspect(conn).get_columns("bookings")}["created_at"]["nullable"]
+
+    codes, cursor = [], None
+    while True:
+        page, cursor = get_bookings_page(db_session, 1, cursor)
+        codes += [booking.booking_code for booking in page]
+        if cursor is None:
+            break
+    db_session.close()
+    assert sorted(codes) == ["MIGN0", "MIGN1", "MIGN2"]
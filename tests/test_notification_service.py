@@ -1,8 +1,10 @@
 import pytest
 from datetime import date, timedelta
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
+from src.api.models.outbox_model import OutboxMessage
 from src.api.services.notification_service import (
     NotificationService,
+    NotificationType,
     send_daily_reminders
 )
 
@@ -50,8 +52,8 @@ class TestNotificationService:
         notification_service.smtp_user = 'test@example.com'
         notification_service.smtp_password = 'password'
 
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
+        # з'єднання з пулу використовується напряму, без with
+        mock_server = mock_smtp.return_value
 
         result = notification_service.send_email(
             "recipient@example.com",
@@ -110,8 +112,8 @@ class TestNotificationService:
         notification_service.smtp_user = 'test@example.com'
         notification_service.smtp_password = 'password'
 
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
+        # з'єднання з пулу використовується напряму, без with
+        mock_server = mock_smtp.return_value
 
         result = notification_service.notify_booking_created(
             "guest@example.com",
@@ -130,8 +132,8 @@ class TestNotificationService:
         notification_service.smtp_password = 'password'
         sample_booking_data['refund_amount'] = '3600.00'
 
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__.return_value = mock_server
+        # з'єднання з пулу використовується напряму, без with
+        mock_server = mock_smtp.return_value
 
         result = notification_service.notify_booking_cancelled(
             "guest@example.com",
@@ -146,19 +148,19 @@ class TestNotificationService:
 class TestDailyReminders:
     """Тести для щоденних нагадувань"""
 
-    @patch('src.api.services.notification_service.notification_service.send_email')
-    def test_send_daily_reminders_no_bookings(self, mock_send_email, db_session):
+    @patch('src.api.services.notification_service.notification_service.send_emails')
+    def test_send_daily_reminders_no_bookings(self, mock_send_emails, db_session):
         """Тест коли немає бронювань на завтра"""
         try:
             send_daily_reminders(db_session)
-            mock_send_email.assert_not_called()
+            mock_send_emails.assert_not_called()
         except Exception as e:
             pytest.fail(f"send_daily_reminders raised an exception: {e}")
 
-    @patch('src.api.services.notification_service.notification_service.send_email')
+    @patch('src.api.services.notification_service.notification_service.send_emails')
     def test_send_daily_reminders_with_checkin(
             self,
-            mock_send_email,
+            mock_send_emails,
             db_session
     ):
         from src.api.models.user_model import User, UserRole
@@ -212,15 +214,21 @@ class TestDailyReminders:
         db_session.add(booking)
         db_session.commit()
 
-        mock_send_email.return_value = True
-        send_daily_reminders(db_session)
+        stats = send_daily_reminders(db_session)
 
-        assert True
+        assert (stats["checkin"], stats["checkout"], stats["queued"]) == (1, 0, 1)
+        # нагадування чекає в outbox, а не надсилається напряму
+        mock_send_emails.assert_not_called()
+        [message] = db_session.query(OutboxMessage).all()
+        assert message.kind == NotificationType.CHECKIN_REMINDER.value
+        assert message.recipient == "checkin@test.com"
+        assert message.payload["booking_code"] == booking_code
+        assert message.payload["check_in_date"] == tomorrow.strftime('%d.%m.%Y')
 
-    @patch('src.api.services.notification_service.notification_service.send_email')
+    @patch('src.api.services.notification_service.notification_service.send_emails')
     def test_send_daily_reminders_with_checkout(
             self,
-            mock_send_email,
+            mock_send_emails,
             db_session
     ):
         """Тест нагадування про виїзд"""
@@ -274,7 +282,11 @@ class TestDailyReminders:
         db_session.add(booking)
         db_session.commit()
 
-        mock_send_email.return_value = True
-        send_daily_reminders(db_session)
+        stats = send_daily_reminders(db_session)
 
-        assert True
\ No newline at end of file
+        assert (stats["checkin"], stats["checkout"], stats["queued"]) == (0, 1, 1)
+        mock_send_emails.assert_not_called()
+        [message] = db_session.query(OutboxMessage).all()
+        assert message.kind == NotificationType.CHECKOUT_REMINDER.value
+        assert message.recipient == "checkout@test.com"
+        assert message.payload["check_out_date"] == tomorrow.strftime('%d.%m.%Y')
\ No newline at end of file
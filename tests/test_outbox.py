@@ -0,0 +1,252 @@
+import pytest
+import time
+import uuid
+from datetime import date, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.api.services import outbox
+from src.api.services.booking_service import create_booking, cancel_booking
+from src.api.services.notification_service import NotificationType, notification_service
+from src.api.services.outbox import enqueue_notification, process_outbox_batch, outbox_worker
+from src.api.models.outbox_model import OutboxMessage, OutboxStatus
+from src.api.models.room_model import Room, RoomType, RoomStatus
+
+
+class StandInSMTP:
+    """Локальна заміна smtplib.SMTP: запам'ятовує листи, може "гальмувати"."""
+    sent = []
+    delay = 0.0
+    fail = False
+    sock = None
+
+    def __init__(self, host, port, *args, **kwargs):
+        time.sleep(self.delay)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        return 250, b"OK"
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_message(self, msg):
+        if self.fail:
+            raise OSError("Connection reset by peer")
+        StandInSMTP.sent.append(msg)
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    StandInSMTP.sent = []
+    StandInSMTP.delay = 0.0
+    StandInSMTP.fail = False
+    monkeypatch.setattr("src.api.services.notification_service.smtplib.SMTP", StandInSMTP)
+    monkeypatch.setattr(notification_service, "smtp_port", 587)
+    monkeypatch.setattr(notification_service, "smtp_user", "hotel@example.com")
+    monkeypatch.setattr(notification_service, "smtp_password", "secret")
+    monkeypatch.setattr(notification_service, "email_enabled", True)
+    notification_service.smtp_pool.close_all()
+    yield StandInSMTP
+    notification_service.smtp_pool.close_all()
+
+
+@pytest.fixture
+def outbox_room(db_session):
+    room = Room(
+        room_number=f"OB{uuid.uuid4().hex[:6]}",
+        room_type=RoomType.STANDARD,
+        max_guest=2,
+        base_price=1000.0,
+        status=RoomStatus.AVAILABLE,
+        floor=1
+    )
+    db_session.add(room)
+    db_session.commit()
+    return room
+
+
+def _booking_data(room, days_ahead=10):
+    check_in = date.today() + timedelta(days=days_ahead)
+    return {
+        "room_id": room.room_id,
+        "check_in_date": check_in,
+        "check_out_date": check_in + timedelta(days=2),
+        "email": f"ob{uuid.uuid4().hex[:10]}@example.com",
+        "first_name": "Outbox",
+        "last_name": "Guest",
+        "phone": f"+38063{uuid.uuid4().int % 10000000:07d}"
+    }
+
+
+def _messages(session):
+    session.expire_all()
+    return session.query(OutboxMessage).order_by(OutboxMessage.id).all()
+
+
+def _make_due(session):
+    session.query(OutboxMessage).update({OutboxMessage.available_at: func.now()}, synchronize_session=False)
+    session.commit()
+
+
+def test_booking_commits_notification_without_sending(db_session, outbox_room, smtp):
+    smtp.delay = 2.0
+
+    started = time.perf_counter()
+    booking = create_booking(db_session, _booking_data(outbox_room))
+    assert time.perf_counter() - started < 1.0
+
+    [message] = _messages(db_session)
+    assert message.kind == NotificationType.BOOKING_CREATED.value
+    assert message.status == OutboxStatus.PENDING
+    assert message.payload["booking_code"] == booking.booking_code
+    assert message.payload["total_price"] == "2000.00"
+    assert smtp.sent == []
+
+
+def test_failed_booking_leaves_no_notification(db_session, outbox_room):
+    data = _booking_data(outbox_room)
+    create_booking(db_session, data)
+    with pytest.raises(ValueError, match="already booked"):
+        create_booking(db_session, {**_booking_data(outbox_room), "check_in_date": data["check_in_date"],
+                                    "check_out_date": data["check_out_date"]})
+    assert len(_messages(db_session)) == 1
+
+
+def test_cancel_booking_enqueues_cancellation(db_session, outbox_room):
+    booking = create_booking(db_session, _booking_data(outbox_room))
+    cancel_booking(db_session, booking.booking_code)
+    db_session.commit()
+
+    kinds = [m.kind for m in _messages(db_session)]
+    assert kinds == [NotificationType.BOOKING_CREATED.value, NotificationType.BOOKING_CANCELLED.value]
+
+
+def test_batch_delivers_through_smtp(db_session, outbox_room, smtp):
+    booking = create_booking(db_session, _booking_data(outbox_room))
+
+    assert process_outbox_batch(db_session) == 1
+    [message] = _messages(db_session)
+    assert message.status == OutboxStatus.SENT
+    assert message.attempts == 1
+    assert message.sent_at is not None
+    assert len(smtp.sent) == 1
+    assert smtp.sent[0]["To"] == message.recipient
+
+    # надіслане повторно не береться
+    assert process_outbox_batch(db_session) == 0
+    assert booking.booking_code in smtp.sent[0].get_payload()[0].get_payload(decode=True).decode()
+
+
+def test_failed_delivery_backs_off_then_gives_up(db_session, outbox_room, smtp):
+    smtp.fail = True
+    create_booking(db_session, _booking_data(outbox_room))
+
+    assert process_outbox_batch(db_session, max_attempts=2) == 1
+    [message] = _messages(db_session)
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert message.last_error
+    # наступна спроба - не раніше ніж через backoff
+    assert process_outbox_batch(db_session, max_attempts=2) == 0
+
+    _make_due(db_session)
+    assert process_outbox_batch(db_session, max_attempts=2) == 1
+    [message] = _messages(db_session)
+    assert message.status == OutboxStatus.FAILED
+    assert message.attempts == 2
+
+
+def test_open_circuit_defers_without_using_attempts(db_session, outbox_room, smtp):
+    breaker = notification_service.smtp_breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    create_booking(db_session, _booking_data(outbox_room))
+
+    assert process_outbox_batch(db_session) == 1
+    [message] = _messages(db_session)
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 0
+    assert "circuit open" in message.last_error
+    assert smtp.sent == []
+    # до кінця cool-down повідомлення не береться
+    assert process_outbox_batch(db_session) == 0
+
+    breaker.reset()
+    _make_due(db_session)
+    assert process_outbox_batch(db_session) == 1
+    assert _messages(db_session)[0].status == OutboxStatus.SENT
+
+
+def test_retry_delay_grows_exponentially_with_jitter(monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_RETRY_BASE_SECONDS", 10)
+    monkeypatch.setattr(outbox, "OUTBOX_RETRY_MAX_SECONDS", 60)
+    for attempts, full in ((1, 10), (2, 20), (3, 40), (4, 60), (9, 60)):
+        assert full / 2 <= outbox.retry_delay(attempts) <= full
+
+
+def test_disabled_email_fails_without_retries(db_session, outbox_room, monkeypatch):
+    monkeypatch.setattr(notification_service, "email_enabled", False)
+    create_booking(db_session, _booking_data(outbox_room))
+
+    process_outbox_batch(db_session)
+    [message] = _messages(db_session)
+    assert message.status == OutboxStatus.FAILED
+    assert "disabled" in message.last_error
+
+
+def test_concurrent_workers_skip_locked_messages(db_session, smtp):
+    for i in range(2):
+        enqueue_notification(db_session, NotificationType.BOOKING_CANCELLED, f"skip{i}@example.com", None, {
+            "guest_name": "Skip Locked", "booking_code": f"SK{i}", "room_number": "1",
+            "check_in_date": "01.01.2030", "check_out_date": "03.01.2030", "refund_amount": "0.00"
+        })
+    db_session.commit()
+
+    bind = db_session.get_bind()
+    holder, worker = Session(bind=bind), Session(bind=bind)
+    try:
+        # інший worker тримає перше повідомлення
+        held = holder.query(OutboxMessage).order_by(OutboxMessage.id).limit(1).with_for_update().one()
+        assert held.recipient == "skip0@example.com"
+
+        assert process_outbox_batch(worker) == 1
+        assert [msg["To"] for msg in smtp.sent] == ["skip1@example.com"]
+    finally:
+        holder.close()
+        worker.close()
+
+
+def test_background_worker_is_woken_by_commit(client, outbox_room, smtp, monkeypatch):
+    monkeypatch.setattr(outbox_worker, "poll_interval", 60)
+    outbox_worker.start()
+    try:
+        data = _booking_data(outbox_room)
+        payload = {**data, "check_in_date": data["check_in_date"].isoformat(),
+                   "check_out_date": data["check_out_date"].isoformat()}
+        assert client.post("/api/v1/bookings/", json=payload).status_code == 201
+
+        deadline = time.monotonic() + 5
+        while not smtp.sent and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(smtp.sent) == 1
+    finally:
+        outbox_worker.stop()
+
+
+def test_api_booking_latency_does_not_wait_for_smtp(client, outbox_room, smtp):
+    smtp.delay = 2.0
+    data = _booking_data(outbox_room)
+    payload = {**data, "check_in_date": data["check_in_date"].isoformat(),
+               "check_out_date": data["check_out_date"].isoformat()}
+
+    started = time.perf_counter()
+    assert client.post("/api/v1/bookings/", json=payload).status_code == 201
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,180 @@
+import pytest
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from werkzeug.security import generate_password_hash
+import secrets
+from src.api.pagination import encode_cursor, decode_cursor
+from src.api.models.booking_model import Booking, BookingStatus
+from src.api.models.review_model import Review
+from src.api.models.user_model import User, UserRole
+from src.api.models.room_model import Room, RoomType, RoomStatus
+
+
+@pytest.fixture
+def page_user(db_session):
+    user = User(
+        first_name="Page",
+        last_name=f"Walker{uuid.uuid4().hex[:6]}",
+        email=f"page_{uuid.uuid4().hex[:8]}@example.com",
+        phone=f"+38050{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.GUEST,
+        is_registered=True,
+        password=generate_password_hash(secrets.token_urlsafe(16))
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def page_room(db_session):
+    room = Room(
+        room_number=f"PG{uuid.uuid4().hex[:6]}",
+        room_type=RoomType.STANDARD,
+        max_guest=2,
+        base_price=900.0,
+        status=RoomStatus.AVAILABLE,
+        floor=2,
+        description="Room for pagination tests"
+    )
+    db_session.add(room)
+    db_session.commit()
+    return room
+
+
+@pytest.fixture
+def many_bookings(db_session, page_user, page_room):
+    # Однаковий created_at у частини бронювань: порядок має триматись на booking_code
+    same_moment = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+    bookings = []
+    for i in range(7):
+        booking = Booking(
+            booking_code=f"BKPG{i:02d}{uuid.uuid4().hex[:6]}",
+            user_id=page_user.user_id,
+            room_id=page_room.room_id,
+            check_in_date=date(2030, 2, 1) + timedelta(days=3 * i),
+            check_out_date=date(2030, 2, 2) + timedelta(days=3 * i),
+            status=BookingStatus.ACTIVE,
+            created_at=same_moment if i % 2 else same_moment + timedelta(minutes=i)
+        )
+        db_session.add(booking)
+        bookings.append(booking)
+    db_session.commit()
+    return bookings
+
+
+def _walk(client, url, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        sep = "&" if "?" in url else "?"
+        query = f"{url}{sep}limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(query)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body["items"]) <= limit
+        seen.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen, pages
+
+
+def test_cursor_round_trip():
+    moment = datetime(2030, 5, 1, 8, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor([moment, "BK42"])
+    assert decode_cursor(cursor, [Booking.created_at, Booking.booking_code]) == [moment, "BK42"]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor([1]), encode_cursor(["x", "y"])])
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, [Booking.created_at, Booking.booking_code])
+
+
+def test_bookings_pages_cover_every_row_once(client, db_session, many_bookings):
+    items, pages = _walk(client, "/api/v1/bookings/", limit=3)
+    codes = [item["booking_code"] for item in items]
+
+    assert len(codes) == len(set(codes))
+    assert set(codes) == {b.booking_code for b in db_session.query(Booking).all()}
+    assert pages >= 3
+
+    keys = [(item["created_at"], item["booking_code"]) for item in items]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_bookings_default_page_envelope(client, many_bookings):
+    response = client.get("/api/v1/bookings/")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body) == {"items", "next_cursor"}
+    assert body["next_cursor"] is None
+
+
+def test_invalid_cursor_returns_400(client):
+    for url in ("/api/v1/bookings/", "/api/v1/users/", "/api/v1/reviews/", "/api/v1/rooms/"):
+        response = client.get(f"{url}?cursor=garbage")
+        assert response.status_code == 400, url
+
+
+def test_limit_out_of_range_rejected(client):
+    assert client.get("/api/v1/bookings/?limit=0").status_code == 422
+    assert client.get("/api/v1/users/?limit=1000").status_code == 422
+
+
+def test_users_pages_ordered_by_id_with_filters(client, db_session, page_user):
+    for _ in range(4):
+        db_session.add(User(
+            first_name="Page",
+            last_name=page_user.last_name,
+            email=f"page_{uuid.uuid4().hex[:8]}@example.com",
+            phone=f"+38050{uuid.uuid4().int % 10000000:07d}",
+            role=UserRole.GUEST,
+            is_registered=False
+        ))
+    db_session.commit()
+
+    items, pages = _walk(client, f"/api/v1/users/?last_name={page_user.last_name}&role=GUEST", limit=2)
+    ids = [item["id"] for item in items]
+    assert pages == 3
+    assert len(ids) == 5
+    assert ids == sorted(ids)
+
+
+def test_reviews_pages_only_approved(client, db_session, page_user, page_room):
+    for i in range(5):
+        db_session.add(Review(
+            user_id=page_user.user_id,
+            room_id=page_room.room_id,
+            rating=5,
+            comment=f"Review {i}",
+            is_approved=i != 0
+        ))
+    db_session.commit()
+
+    try:
+        items, _ = _walk(client, "/api/v1/reviews/", limit=2)
+        assert len(items) == 4
+        assert all(item["is_approved"] for item in items)
+    finally:
+        db_session.query(Review).delete(synchronize_session=False)
+        db_session.commit()
+
+
+def test_rooms_pages_and_legacy_array(client, db_session):
+    for _ in range(5):
+        db_session.add(Room(
+            room_number=f"PG{uuid.uuid4().hex[:6]}",
+            room_type=RoomType.DELUXE,
+            max_guest=3,
+            base_price=2500.0,
+            status=RoomStatus.AVAILABLE,
+            floor=3
+        ))
+    db_session.commit()
+
+    items, pages = _walk(client, "/api/v1/rooms/", limit=2)
+    legacy = client.get("/api/v1/rooms/?all=true").get_json()
+
+    assert pages == 3
+    assert [room["id"] for room in items] == sorted(room["id"] for room in legacy)
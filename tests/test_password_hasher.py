@@ -0,0 +1,212 @@
+import os
+import pytest
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from src.api.models.user_model import User, UserRole
+from src.api.services.password_hasher import (
+    PasswordHasher, PasswordHasherBusy, normalize_method, password_hasher, DEFAULT_PBKDF2_ITERATIONS
+)
+
+CHEAP_METHOD = "pbkdf2:sha256:1000"
+
+
+@pytest.fixture
+def pool_hasher():
+    hasher = PasswordHasher(method=CHEAP_METHOD, workers=1, max_queue=0)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.parametrize("method, expected", [
+    ("pbkdf2:sha256", f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"),
+    ("pbkdf2:sha512:600000", "pbkdf2:sha512:600000"),
+    ("scrypt", "scrypt:32768:8:1"),
+    ("scrypt:16384:8:1", "scrypt:16384:8:1"),
+])
+def test_normalize_method_matches_stored_hash_prefix(method, expected):
+    assert normalize_method(method) == expected
+    if method.startswith("pbkdf2"):
+        return
+    assert generate_password_hash("x", method=method).split("$", 1)[0] == expected
+
+
+def test_pool_hashes_are_werkzeug_compatible(pool_hasher):
+    stored = pool_hasher.hash("Password1!")
+    assert stored.startswith(CHEAP_METHOD + "$")
+    assert check_password_hash(stored, "Password1!")
+    assert pool_hasher.verify(stored, "Password1!")
+    assert not pool_hasher.verify(stored, "Password2!")
+    assert pool_hasher.snapshot()["completed"] == 3
+
+
+def test_inline_mode_needs_no_pool():
+    hasher = PasswordHasher(method=CHEAP_METHOD, workers=0, max_queue=1)
+    assert hasher.verify(hasher.hash("Password1!"), "Password1!")
+    assert hasher._executor is None
+
+
+def test_needs_rehash_compares_parameters():
+    hasher = PasswordHasher(method="pbkdf2:sha256:2000", workers=0)
+    assert hasher.needs_rehash(generate_password_hash("x", method=CHEAP_METHOD))
+    assert not hasher.needs_rehash(generate_password_hash("x", method="pbkdf2:sha256:2000"))
+    assert not hasher.needs_rehash(None)
+
+
+def test_full_queue_is_shed_at_once(pool_hasher):
+    pool_hasher.method = "pbkdf2:sha256:2000000"
+    slow = threading.Thread(target=pool_hasher.hash, args=("Password1!",))
+    slow.start()
+    while pool_hasher.snapshot()["in_flight"] == 0:
+        time.sleep(0.001)
+
+    started = time.perf_counter()
+    with pytest.raises(PasswordHasherBusy):
+        pool_hasher.verify("pbkdf2:sha256:1000$salt$hash", "Password1!")
+    assert time.perf_counter() - started < 0.1
+    slow.join()
+    assert pool_hasher.snapshot()["rejected"] == 1
+
+
+def test_timed_out_hash_keeps_its_slot_until_done(pool_hasher):
+    pool_hasher.method = "pbkdf2:sha256:2000000"
+    pool_hasher.timeout = 0.05
+    with pytest.raises(PasswordHasherBusy, match="timed out"):
+        pool_hasher.hash("Password1!")
+
+    # процес пулу ще хешує - нове завдання не стає в чергу за ним
+    assert pool_hasher.snapshot()["in_flight"] == 1
+    with pytest.raises(PasswordHasherBusy):
+        pool_hasher.verify("pbkdf2:sha256:1000$salt$hash", "Password1!")
+    assert pool_hasher.snapshot()["rejected"] == 1
+
+    deadline = time.monotonic() + 30
+    while pool_hasher.snapshot()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool_hasher.snapshot()["in_flight"] == 0
+
+
+def test_broken_pool_sheds_and_is_recreated(pool_hasher, monkeypatch):
+    def no_inline_hashing(*args):
+        raise AssertionError("hashed in the request thread")
+
+    pool_hasher.hash("Password1!")
+    broken = pool_hasher._executor
+    with pytest.raises(PasswordHasherBusy):
+        # процес пулу завершується посеред завдання
+        pool_hasher._run(os._exit, 1)
+    assert pool_hasher.snapshot()["in_flight"] == 0
+
+    monkeypatch.setattr("src.api.services.password_hasher.generate_password_hash", no_inline_hashing)
+    assert pool_hasher.hash("Password1!").startswith(CHEAP_METHOD + "$")
+    assert pool_hasher._executor is not broken
+
+
+def test_malformed_stored_hash_does_not_match():
+    assert not User(password="not-a-hash").check_password("Password1!")
+
+
+@pytest.fixture
+def guest(db_session):
+    def make(password_hash=None):
+        user = User(
+            email=f"hash_{uuid.uuid4().hex[:8]}@example.com",
+            first_name="Hash",
+            last_name="Guest",
+            phone=f"+38097{uuid.uuid4().int % 10000000:07d}",
+            role=UserRole.GUEST,
+            is_registered=True
+        )
+        if password_hash:
+            user.password = password_hash
+        else:
+            user.set_password("Password1!")
+        db_session.add(user)
+        db_session.commit()
+        db_session.refresh(user)
+        return user
+    return make
+
+
+def _login(client, user, password="Password1!"):
+    return client.post("/api/v1/auth/login", json={"email": user.email, "password": password})
+
+
+def test_login_sheds_with_503_when_hashing_is_saturated(client, guest, monkeypatch):
+    user = guest()
+    monkeypatch.setattr(password_hasher, "max_queue", -password_hasher.workers)
+
+    resp = _login(client, user)
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+    resp = client.post("/api/v1/auth/register", json={
+        "email": f"shed_{uuid.uuid4().hex[:8]}@example.com", "password": "Password1!",
+        "first_name": "Shed", "last_name": "User", "phone": f"+38050{uuid.uuid4().int % 10000000:07d}"
+    })
+    assert resp.status_code == 503
+
+
+def test_login_upgrades_old_hash(client, db_session, guest):
+    user = guest(generate_password_hash("Password1!", method=CHEAP_METHOD))
+    rehashed = password_hasher.snapshot()["rehashed"]
+
+    assert _login(client, user).status_code == 200
+    db_session.refresh(user)
+    assert user.password.split("$", 1)[0] == password_hasher.prefix
+    # той самий пароль - токени користувача лишаються дійсними
+    assert user.token_version == 0
+
+    assert _login(client, user).status_code == 200
+    assert password_hasher.snapshot()["rehashed"] == rehashed + 1
+
+
+def test_failed_login_does_not_rehash(client, db_session, guest):
+    old_hash = generate_password_hash("Password1!", method=CHEAP_METHOD)
+    user = guest(old_hash)
+
+    assert _login(client, user, "Wrong1!xx").status_code == 401
+    db_session.refresh(user)
+    assert user.password == old_hash
+
+
+def test_login_throughput_per_core_benchmark():
+    """Логінів/с на ядро під час сплеску: хешування в потоках запитів vs у пулі процесів."""
+    method = "pbkdf2:sha256:100000"
+    stored = generate_password_hash("Password1!", method=method)
+    cores = os.cpu_count() or 1
+    burst = 8 * cores
+
+    def run(label, hasher):
+        hasher.verify(stored, "Password1!")  # пул запущено до вимірювання
+        other_latency = []
+
+        def other_request():
+            # легкий запит іншого ендпоінту, що чекає на GIL поруч зі сплеском логінів
+            started = time.perf_counter()
+            sum(i * i for i in range(20000))
+            other_latency.append(time.perf_counter() - started)
+
+        with ThreadPoolExecutor(max_workers=burst) as threads:
+            started = time.perf_counter()
+            logins = [threads.submit(hasher.verify, stored, "Password1!") for _ in range(burst)]
+            while not all(login.done() for login in logins):
+                other_request()
+            elapsed = time.perf_counter() - started
+        assert all(login.result() for login in logins)
+        other_latency.sort()
+        p50_ms = other_latency[len(other_latency) // 2] * 1000
+        per_core = burst / elapsed / cores
+        print(f"\n{label:<28} {burst / elapsed:7.1f} logins/s  {per_core:7.1f} logins/s/core  "
+              f"other request p50 {p50_ms:6.2f} ms")
+        return per_core
+
+    inline = PasswordHasher(method=method, workers=0, max_queue=burst)
+    pool = PasswordHasher(method=method, workers=cores, max_queue=burst)
+    try:
+        run("hash in request threads", inline)
+        assert run("process pool", pool) > 0
+    finally:
+        pool.shutdown()
@@ -0,0 +1,177 @@
+import jwt as pyjwt
+import pytest
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from flask import Flask, g
+import src.api.auth as auth
+from src.api.db import db
+from src.api.auth import (
+    create_token, token_required, token_optional, login_required_web, staff_required,
+    resolve_request_identity, token_claims_cache, decode_token
+)
+from src.api.models.user_model import User, UserRole
+from src.api.services.identity_cache import identity_cache
+
+
+@pytest.fixture
+def staff(db_session):
+    user = User(
+        email=f"auth_{uuid.uuid4().hex[:8]}@example.com",
+        first_name="Request",
+        last_name="Auth",
+        phone=f"+38068{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.STAFF,
+        is_registered=True
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Рахує справжні перевірки підпису JWT"""
+    calls = []
+    real_decode = pyjwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+def _build_app():
+    """Окремий застосунок з тим самим before_request-хуком і різними комбінаціями декораторів"""
+    auth_app = Flask(__name__)
+    auth_app.before_request(resolve_request_identity)
+    auth_app.teardown_appcontext(lambda exception=None: db.remove())
+
+    for name, decorators in {
+        "required": [token_required],
+        "stacked": [token_required, staff_required],
+        "optional": [token_optional],
+        "web": [login_required_web],
+    }.items():
+        def view():
+            user = getattr(g, "current_user", None)
+            return {"user_id": user.user_id if user else None}
+        for decorator in reversed(decorators):
+            view = decorator(view)
+        auth_app.add_url_rule(f"/{name}", name, view)
+    return auth_app
+
+
+auth_app = _build_app()
+views = {name: f"/{name}" for name in ("required", "stacked", "optional", "web")}
+
+
+@pytest.fixture
+def client():
+    return auth_app.test_client()
+
+
+def _short_lived_token(user_id, seconds):
+    payload = {"user_id": user_id, "role": "STAFF", "is_admin": False,
+               "exp": datetime.now(timezone.utc) + timedelta(seconds=seconds)}
+    return pyjwt.encode(payload, auth.SECRET_KEY, algorithm="HS256")
+
+
+def test_token_is_decoded_once_per_request_with_stacked_decorators(client, staff, decodes):
+    token = create_token(staff.user_id, role="STAFF")
+    client.set_cookie("auth_token", token)
+
+    resp = client.get(views["stacked"], headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    assert resp.get_json()["user_id"] == staff.user_id
+    # той самий токен у cookie і в заголовку - одна перевірка
+    assert decodes == [token]
+
+
+def test_verified_claims_are_memoized_across_requests(client, staff, decodes):
+    headers = {"Authorization": f"Bearer {create_token(staff.user_id, role='STAFF')}"}
+    for _ in range(5):
+        assert client.get(views["required"], headers=headers).status_code == 200
+
+    assert len(decodes) == 1
+    assert token_claims_cache.snapshot()["hits"] == 4
+
+
+def test_memoized_claims_expire_with_the_token(client, staff):
+    headers = {"Authorization": f"Bearer {_short_lived_token(staff.user_id, 1)}"}
+    assert client.get(views["required"], headers=headers).status_code == 200
+
+    time.sleep(1.1)
+    resp = client.get(views["required"], headers=headers)
+    assert resp.status_code == 401
+    assert resp.get_json()["message"] == "Token has expired"
+
+
+def test_invalid_tokens_are_not_memoized(client, decodes):
+    headers = {"Authorization": "Bearer not-a-jwt"}
+    for _ in range(2):
+        resp = client.get(views["required"], headers=headers)
+        assert resp.get_json()["message"] == "Invalid token"
+    assert len(decodes) == 2
+    assert token_claims_cache.snapshot()["size"] == 0
+
+
+def test_public_request_with_token_does_not_load_user(app, staff, monkeypatch):
+    def fail(user_id):
+        raise AssertionError("user loaded for a public endpoint")
+
+    monkeypatch.setattr(auth, "_load_user", fail)
+    token = create_token(staff.user_id, role="STAFF")
+    assert app.test_client().get("/api/v1/rooms/", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+
+def test_api_decorators_ignore_auth_cookie(client, staff):
+    client.set_cookie("auth_token", create_token(staff.user_id, role="STAFF"))
+
+    assert client.get(views["required"]).status_code == 401
+    assert client.get(views["optional"]).get_json()["user_id"] is None
+    assert client.get(views["web"]).get_json()["user_id"] == staff.user_id
+
+
+def test_web_cookie_takes_precedence_over_header(client, staff):
+    client.set_cookie("auth_token", create_token(staff.user_id, role="STAFF"))
+    resp = client.get(views["web"], headers={"Authorization": "Bearer not-a-jwt"})
+    assert resp.get_json()["user_id"] == staff.user_id
+
+
+def test_g_from_previous_request_is_not_reused(client, staff):
+    token = create_token(staff.user_id, role="STAFF")
+    with auth_app.app_context():
+        assert client.get(views["required"], headers={"Authorization": f"Bearer {token}"}).status_code == 200
+        assert client.get(views["required"]).status_code == 401
+
+
+def test_per_request_auth_overhead_benchmark(staff):
+    """Мкс на запит: перевірка JWT і пошук користувача щоразу vs один раз із кешами."""
+    token = create_token(staff.user_id, role="STAFF")
+    view = token_required(staff_required(lambda: "ok"))
+    runs = 2000
+
+    def per_request(label, prepare):
+        with auth_app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+            started = time.perf_counter()
+            for _ in range(runs):
+                prepare()
+                resolve_request_identity()
+                assert view() == "ok"
+            micros = (time.perf_counter() - started) / runs * 1e6
+        print(f"\n{label:<36} {micros:8.1f} us/request")
+        return micros
+
+    def cold():
+        token_claims_cache.clear()
+        identity_cache.clear()
+
+    uncached = per_request("decode + users query every request", cold)
+    claims_only = per_request("memoized claims, users query", identity_cache.clear)
+    warm = per_request("memoized claims + cached identity", lambda: None)
+
+    assert warm < claims_only < uncached
+    assert decode_token(token)["user_id"] == staff.user_id
@@ -70,7 +70,7 @@ def test_get_all_reviews_success(client, monkeypatch):
     
     monkeypatch.setattr(review_routes_module, "get_all_reviews", mock_get_all_reviews)
     
-    resp = client.get("/api/v1/reviews/")
+    resp = client.get("/api/v1/reviews/?all=true")
     assert resp.status_code == 200
     
     data = resp.get_json()
@@ -347,7 +347,7 @@ def test_get_all_reviews_empty_list(client, monkeypatch):
     
     monkeypatch.setattr(review_routes_module, "get_all_reviews", mock_get_all_reviews)
     
-    resp = client.get("/api/v1/reviews/")
+    resp = client.get("/api/v1/reviews/?all=true")
     assert resp.status_code == 200
     
     data = resp.get_json()
@@ -0,0 +1,246 @@
+import pytest
+import time
+import uuid
+from flask import jsonify
+from sqlalchemy import event, text, update
+from sqlalchemy.engine import Engine
+from src.api.app import app as flask_app
+from src.api.auth import create_token
+from src.api.db import SessionLocal
+from src.api.models.room_model import Room, RoomType, RoomStatus
+from src.api.models.user_model import User, UserRole
+from src.api.schemas.room_schema import RoomOutSchema
+from src.api.services.room_catalog import RoomCatalog, room_catalog
+from src.api.services.room_service import get_all_rooms
+from src.api.versioning import make_etag
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _room(number=None, price=1500.0):
+    return Room(
+        room_number=number or f"CAT{uuid.uuid4().hex[:6]}",
+        room_type=RoomType.STANDARD,
+        max_guest=2,
+        base_price=price,
+        status=RoomStatus.AVAILABLE,
+        floor=3,
+        size_sqm=22.5,
+        description="Кімната з каталогу",
+        photo_urls=["/static/a.jpg"]
+    )
+
+
+@pytest.fixture
+def rooms(db_session):
+    created = [_room() for _ in range(3)]
+    db_session.add_all(created)
+    db_session.commit()
+    for room in created:
+        db_session.refresh(room)
+    return created
+
+
+@pytest.fixture
+def admin_headers(db_session):
+    admin = User(
+        email=f"catalog_{uuid.uuid4().hex[:8]}@example.com",
+        first_name="Catalog",
+        last_name="Admin",
+        phone=f"+38095{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.ADMIN,
+        is_registered=True
+    )
+    admin.set_password("Password1!")
+    db_session.add(admin)
+    db_session.commit()
+    token = create_token(admin.user_id, role="ADMIN", is_admin=True)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def queries():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", capture)
+
+
+def test_catalog_is_served_without_queries(client, rooms, queries):
+    assert client.get("/api/v1/rooms/?all=true").status_code == 200
+    assert len(queries) == 1
+    queries.clear()
+
+    for _ in range(3):
+        assert len(client.get("/api/v1/rooms/?all=true").get_json()) == 3
+    assert queries == []
+
+    for room in rooms:
+        resp = client.get(f"/api/v1/rooms/{room.room_id}")
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] == make_etag(room.version)
+    assert client.get(f"/api/v1/rooms/{rooms[-1].room_id + 1000}").status_code == 404
+
+    # одна кімната - лише звірка версії за первинним ключем
+    assert len(queries) == 4
+    assert all("rooms.version" in q and "rooms.room_id = " in q for q in queries)
+    stats = room_catalog.snapshot()
+    assert (stats["rooms"], stats["loads"], stats["misses"], stats["hits"]) == (3, 1, 1, 7)
+
+
+def test_cached_bytes_match_fresh_serialization(client, db_session, rooms, monkeypatch):
+    # як у production: DEBUG вимкнено, jsonify пише компактний JSON
+    monkeypatch.setattr(flask_app.json, "compact", True)
+    list_body = client.get("/api/v1/rooms/?all=true").get_data()
+    room_resp = client.get(f"/api/v1/rooms/{rooms[0].room_id}")
+
+    with flask_app.app_context():
+        assert list_body == jsonify(RoomOutSchema(many=True).dump(get_all_rooms(db_session))).get_data()
+        assert room_resp.get_data() == jsonify(RoomOutSchema().dump(rooms[0])).get_data()
+    assert room_resp.mimetype == "application/json"
+
+
+def test_admin_writes_invalidate_catalog(client, rooms, admin_headers):
+    room_id = rooms[0].room_id
+    client.get("/api/v1/rooms/?all=true")
+    invalidations = room_catalog.snapshot()["invalidations"]
+
+    resp = client.patch(f"/api/v1/rooms/{room_id}", headers=admin_headers, json={"base_price": 999.0})
+    assert resp.status_code == 200
+    cached = client.get(f"/api/v1/rooms/{room_id}")
+    assert cached.get_json()["base_price"] == "999.00"
+    assert cached.headers["ETag"] == resp.headers["ETag"]
+
+    resp = client.put(f"/api/v1/rooms/{rooms[1].room_id}", headers=admin_headers, json={
+        "room_number": rooms[1].room_number, "room_type": "DELUXE", "max_guest": 3,
+        "base_price": 1200.0, "status": "AVAILABLE", "floor": 4
+    })
+    assert resp.status_code == 200
+    assert client.get(f"/api/v1/rooms/{rooms[1].room_id}").get_json()["room_type"] == "DELUXE"
+
+    created = client.post("/api/v1/rooms/", headers=admin_headers, json={
+        "room_number": f"NEW{uuid.uuid4().hex[:5]}", "room_type": "ECONOMY", "max_guest": 1,
+        "base_price": 800.0, "status": "AVAILABLE", "floor": 1
+    })
+    assert created.status_code == 201
+    assert created.get_json()["id"] in [r["id"] for r in client.get("/api/v1/rooms/?all=true").get_json()]
+
+    assert client.delete(f"/api/v1/rooms/{room_id}", headers=admin_headers).status_code == 204
+    assert client.get(f"/api/v1/rooms/{room_id}").status_code == 404
+    assert len(client.get("/api/v1/rooms/?all=true").get_json()) == 3
+    assert room_catalog.snapshot()["invalidations"] == invalidations + 4
+
+
+def test_changes_from_other_processes_are_served_at_once(client, db_session, rooms):
+    client.get("/api/v1/rooms/?all=true")
+    # інший воркер: Core-запити оминають події сесії, кеш цього процесу про них не знає
+    with db_session.get_bind().begin() as conn:
+        version = conn.execute(text(
+            "UPDATE rooms SET floor = 8, version = version + 1 WHERE room_id = :id RETURNING version"
+        ), {"id": rooms[0].room_id}).scalar()
+        created_id = conn.execute(text(
+            "INSERT INTO rooms (room_number, room_type, max_guest, base_price, status, floor, version) "
+            "VALUES (:number, 'STANDARD', 2, 1500, 'AVAILABLE', 3, 1) RETURNING room_id"
+        ), {"number": f"CAT{uuid.uuid4().hex[:6]}"}).scalar()
+        conn.execute(text("DELETE FROM rooms WHERE room_id = :id"), {"id": rooms[1].room_id})
+
+    resp = client.get(f"/api/v1/rooms/{rooms[0].room_id}")
+    assert resp.get_json()["floor"] == 8
+    assert resp.headers["ETag"] == make_etag(version)
+    assert client.get(f"/api/v1/rooms/{created_id}").status_code == 200
+    assert client.get(f"/api/v1/rooms/{rooms[1].room_id}").status_code == 404
+    # список теж перечитаний, без очікування max_age
+    assert len(client.get("/api/v1/rooms/?all=true").get_json()) == 3
+
+
+def test_bulk_update_invalidates_catalog(client, db_session, rooms):
+    client.get("/api/v1/rooms/?all=true")
+    db_session.execute(update(Room).where(Room.room_id == rooms[0].room_id).values(floor=9))
+    db_session.commit()
+    assert client.get(f"/api/v1/rooms/{rooms[0].room_id}").get_json()["floor"] == 9
+
+
+def test_rolled_back_change_keeps_catalog(client, db_session, rooms):
+    client.get("/api/v1/rooms/?all=true")
+    invalidations = room_catalog.snapshot()["invalidations"]
+    rooms[0].floor = 7
+    db_session.flush()
+    db_session.rollback()
+
+    assert room_catalog.snapshot()["invalidations"] == invalidations
+    assert client.get(f"/api/v1/rooms/{rooms[0].room_id}").get_json()["floor"] == 3
+
+
+def test_uncommitted_changes_are_not_cached(db_session, rooms):
+    catalog = RoomCatalog()
+    rooms[0].floor = 5
+    db_session.flush()
+    assert b'"floor":5' in catalog.room(db_session, rooms[0].room_id)[0]
+    db_session.rollback()
+
+    session = SessionLocal()
+    try:
+        assert b'"floor":3' in catalog.room(session, rooms[0].room_id)[0]
+    finally:
+        session.close()
+    assert catalog.snapshot()["loads"] == 1
+
+
+def test_catalog_expires_after_max_age(db_session, rooms):
+    clock = FakeClock()
+    catalog = RoomCatalog(max_age=60, clock=clock)
+    catalog.list_body(db_session)
+    clock.now = 60
+    catalog.list_body(db_session)
+    clock.now = 61
+    catalog.list_body(db_session)
+    assert catalog.snapshot()["loads"] == 2
+
+
+def test_catalog_loaded_before_invalidation_is_not_stored(db_session, rooms, monkeypatch):
+    catalog = RoomCatalog()
+    build = catalog._build
+
+    def build_racing_with_update(session, load):
+        snapshot = build(session, load)
+        catalog.invalidate()
+        return snapshot
+    monkeypatch.setattr(catalog, "_build", build_racing_with_update)
+
+    assert catalog.room(db_session, rooms[0].room_id) is not None
+    assert catalog.snapshot()["rooms"] == 0
+
+
+def test_room_list_cost_benchmark(client, db_session, monkeypatch):
+    """Мкс на запит повного списку кімнат: запит + RoomOutSchema щоразу vs готові байти з кешу."""
+    db_session.add_all([_room(price=1000.0 + i) for i in range(100)])
+    db_session.commit()
+    runs = 200
+
+    def per_request(label):
+        started = time.perf_counter()
+        for _ in range(runs):
+            assert client.get("/api/v1/rooms/?all=true").status_code == 200
+        micros = (time.perf_counter() - started) / runs * 1e6
+        print(f"\n{label:<24} {micros:8.1f} us/request")
+        return micros
+
+    # max_age < 0: каталог перечитується і серіалізується на кожному запиті, як до кешу
+    monkeypatch.setattr(room_catalog, "max_age", -1)
+    naive = per_request("query + serialize")
+    monkeypatch.undo()
+    room_catalog.reset_stats()
+    cached = per_request("room catalog")
+
+    assert cached * 2 < naive
+    assert room_catalog.snapshot()["hits"] == runs
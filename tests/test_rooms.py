@@ -403,7 +403,7 @@ def auth_headers(admin_token):
 
 def test_api_get_rooms_no_filters(client, sample_room):
     """Test GET /api/v1/rooms/ without filters"""
-    response = client.get("/api/v1/rooms/")
+    response = client.get("/api/v1/rooms/?all=true")
     assert response.status_code == 200
     data = response.get_json()
     assert isinstance(data, list)
@@ -413,7 +413,7 @@ def test_api_get_rooms_with_room_type_filter(client, sample_room):
     """Test filtering by room_type"""
     response = client.get("/api/v1/rooms/?room_type=STANDARD")
     assert response.status_code == 200
-    data = response.get_json()
+    data = response.get_json()["items"]
     assert all(room["room_type"] == "STANDARD" for room in data)
 
 
@@ -469,7 +469,7 @@ def test_api_get_rooms_exception_handling(client, monkeypatch):
     monkeypatch.setattr(rooms_module, "get_all_rooms", mock_error)
 
     with pytest.raises(Exception, match="Database error"):
-        client.get("/api/v1/rooms/")
+        client.get("/api/v1/rooms/?all=true")
 
 
 def test_api_get_room_by_id_success(client, sample_room):
@@ -716,4 +716,107 @@ def test_api_room_booked_ranges_exception(client, sample_room, monkeypatch):
     monkeypatch.setattr(rooms_module, "get_room_booked_ranges", mock_error)
 
     with pytest.raises(Exception, match="Unexpected error"):
-        client.get(f"/api/v1/rooms/{sample_room.room_id}/booked-ranges")
\ No newline at end of file
+        client.get(f"/api/v1/rooms/{sample_room.room_id}/booked-ranges")
+
+# ==================== Batch availability ====================
+
+@pytest.fixture
+def booked_sample_room(db_session, sample_room):
+    """sample_room with one ACTIVE booking for days +10..+13"""
+    from datetime import date, timedelta
+    from src.api.services.booking_service import create_booking
+
+    check_in = date.today() + timedelta(days=10)
+    create_booking(db_session, {
+        "room_id": sample_room.room_id,
+        "check_in_date": check_in,
+        "check_out_date": check_in + timedelta(days=3),
+        "email": f"batch{uuid.uuid4().hex[:8]}@example.com",
+        "first_name": "Batch",
+        "last_name": "Guest",
+        "phone": f"+38063{uuid.uuid4().int % 10000000:07d}"
+    })
+    return sample_room, check_in
+
+
+def test_api_rooms_availability_batch(client, db_session, booked_sample_room):
+    """Matrix of rooms x windows answered in one call"""
+    from datetime import timedelta
+    room, check_in = booked_sample_room
+    other = Room(
+        room_number=f"API_B{uuid.uuid4().hex[:6]}",
+        room_type=RoomType.ECONOMY,
+        max_guest=1,
+        base_price=800.0,
+        status=RoomStatus.MAINTENANCE,
+        floor=1
+    )
+    db_session.add(other)
+    db_session.commit()
+
+    windows = [
+        {"check_in": (check_in + timedelta(days=1)).isoformat(), "check_out": (check_in + timedelta(days=2)).isoformat()},
+        {"check_in": (check_in + timedelta(days=3)).isoformat(), "check_out": (check_in + timedelta(days=5)).isoformat()},
+    ]
+    response = client.post("/api/v1/rooms/availability:batch", json={
+        "room_ids": [room.room_id, other.room_id, 999999],
+        "windows": windows
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["windows"] == windows
+    assert data["rooms"] == [
+        {"room_id": room.room_id, "available": [False, True]},
+        {"room_id": other.room_id, "available": [False, False]},
+    ]
+    assert data["not_found"] == [999999]
+
+
+def test_api_rooms_availability_batch_invalid_window(client, sample_room):
+    """check_out before check_in is rejected by schema validation"""
+    response = client.post("/api/v1/rooms/availability:batch", json={
+        "room_ids": [sample_room.room_id],
+        "windows": [{"check_in": "2030-01-10", "check_out": "2030-01-05"}]
+    })
+    assert response.status_code == 422
+
+
+def test_api_rooms_availability_batch_requires_rooms(client):
+    response = client.post("/api/v1/rooms/availability:batch", json={
+        "room_ids": [],
+        "windows": [{"check_in": "2030-01-01", "check_out": "2030-01-05"}]
+    })
+    assert response.status_code == 422
+
+
+def test_api_rooms_calendar(client, booked_sample_room):
+    """Hotel-wide calendar lists every room with its booked ranges"""
+    from datetime import timedelta
+    room, check_in = booked_sample_room
+    start = check_in + timedelta(days=1)
+    end = check_in + timedelta(days=30)
+
+    response = client.get(f"/api/v1/rooms/calendar?start={start.isoformat()}&end={end.isoformat()}")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    data = response.get_json()
+    assert data["start"] == start.isoformat()
+    rooms = {r["room_id"]: r for r in data["rooms"]}
+    assert rooms[room.room_id]["room_number"] == room.room_number
+    assert rooms[room.room_id]["booked"] == [
+        {"start": start.isoformat(), "end": (check_in + timedelta(days=3)).isoformat()}
+    ]
+
+
+def test_api_rooms_calendar_room_without_bookings(client, sample_room):
+    response = client.get("/api/v1/rooms/calendar?start=2030-01-01&end=2030-02-01")
+    assert response.status_code == 200
+    rooms = {r["room_id"]: r for r in response.get_json()["rooms"]}
+    assert rooms[sample_room.room_id]["booked"] == []
+
+
+def test_api_rooms_calendar_invalid_window(client):
+    assert client.get("/api/v1/rooms/calendar?start=2030-02-01&end=2030-01-01").status_code == 400
+    assert client.get("/api/v1/rooms/calendar?start=invalid").status_code == 400
@@ -26,14 +26,16 @@ def test_send_reminders_job_logs_exception():
 
 def test_update_bookings_status_job_calls_service_and_closes_session():
     mock_session = MagicMock()
-    mock_update = MagicMock(return_value=3)
+    mock_update = MagicMock(return_value=(3, 2))
 
     with patch("src.api.db.SessionLocal", return_value=mock_session), \
-         patch("src.api.services.booking_service.update_expired_bookings_status", mock_update):
+         patch("src.api.services.booking_service.update_expired_bookings_status", mock_update), \
+         patch("src.api.scheduler.logger") as mock_logger:
 
         scheduler.update_bookings_status_job()
 
     mock_update.assert_called_once_with(mock_session)
+    mock_logger.info.assert_any_call("Updated 3 expired bookings in 2 chunk(s)")
 
 
 def test_update_bookings_status_job_logs_exception():
@@ -50,13 +52,25 @@ def test_update_bookings_status_job_logs_exception():
     mock_logger.error.assert_any_call("Error updating bookings: fail")
 
 
+def test_prune_revoked_tokens_job_calls_service_and_closes_session():
+    mock_session = MagicMock()
+    mock_prune = MagicMock(return_value=5)
+
+    with patch("src.api.db.SessionLocal", return_value=mock_session), \
+         patch("src.api.services.token_revocation.prune_expired_revocations", mock_prune):
+        scheduler.prune_revoked_tokens_job()
+
+    mock_prune.assert_called_once_with(mock_session)
+    mock_session.close.assert_called_once()
+
+
 def test_init_scheduler_adds_jobs_and_starts_scheduler():
     mock_scheduler = MagicMock()
     scheduler.scheduler = mock_scheduler
 
     scheduler.init_scheduler()
 
-    assert mock_scheduler.add_job.call_count == 2
+    assert mock_scheduler.add_job.call_count == 3
     mock_scheduler.start.assert_called_once()
 
 
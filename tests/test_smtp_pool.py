@@ -0,0 +1,200 @@
+import pytest
+import threading
+import time
+from src.api.services.email_templates import email_templates
+from src.api.services.notification_service import NotificationService
+
+
+@pytest.fixture
+def mailer(smtp_sink):
+    service = NotificationService()
+    service.smtp_host = smtp_sink.host
+    service.smtp_port = smtp_sink.port
+    service.smtp_user = "hotel@example.com"
+    service.smtp_password = "secret"
+    service.smtp_starttls = False
+    service.email_enabled = True
+    yield service
+    service.smtp_pool.close_all()
+
+
+def _emails(count):
+    return [(f"guest{i}@example.com", f"Subject {i}", f"<p>Body {i}</p>") for i in range(count)]
+
+
+def test_messages_reuse_one_connection(mailer, smtp_sink):
+    for to_email, subject, body in _emails(20):
+        assert mailer.send_email(to_email, subject, body) is True
+
+    assert len(smtp_sink.messages) == 20
+    assert smtp_sink.connections == 1
+    assert mailer.smtp_pool.stats["opened"] == 1
+    assert mailer.smtp_pool.stats["reused"] == 19
+
+
+def test_batch_is_sent_over_one_connection(mailer, smtp_sink):
+    assert mailer.send_emails(_emails(50)) == [True] * 50
+    assert len(smtp_sink.messages) == 50
+    assert smtp_sink.connections == 1
+
+
+def test_idle_connection_is_closed_after_timeout(mailer, smtp_sink):
+    mailer.smtp_pool.idle_timeout = 0
+    for to_email, subject, body in _emails(3):
+        assert mailer.send_email(to_email, subject, body)
+
+    assert smtp_sink.connections == 3
+    assert mailer.smtp_pool.stats["closed_idle"] == 2
+
+
+def test_health_check_replaces_dropped_connection(mailer, smtp_sink):
+    mailer.smtp_pool.health_check_after = 0
+    assert mailer.send_email("a@example.com", "First", "Body")
+
+    smtp_sink.disconnect_all()
+    assert mailer.send_email("b@example.com", "Second", "Body")
+
+    assert mailer.smtp_pool.stats["failed_health_checks"] == 1
+    assert smtp_sink.connections == 2
+    assert len(smtp_sink.messages) == 2
+
+
+def test_reconnects_when_connection_fails_mid_batch(mailer, smtp_sink):
+    mailer.smtp_pool.health_check_after = 3600
+    assert mailer.send_email("a@example.com", "First", "Body")
+
+    # сервер закрив з'єднання, а пул про це ще не знає
+    smtp_sink.disconnect_all()
+    time.sleep(0.05)
+    assert mailer.send_emails(_emails(5)) == [True] * 5
+
+    assert mailer.smtp_pool.stats["discarded"] == 1
+    assert smtp_sink.connections == 2
+    assert len(smtp_sink.messages) == 6
+
+
+def test_unreachable_server_reports_failure(mailer, smtp_sink):
+    mailer.smtp_port = 1
+    assert mailer.send_emails(_emails(2)) == [False, False]
+
+
+def test_pool_bounds_concurrent_connections(mailer, smtp_sink):
+    smtp_sink.connect_delay = 0.02
+    results = []
+
+    def send_some(n):
+        results.extend(mailer.send_email(*email) for email in _emails(n))
+
+    threads = [threading.Thread(target=send_some, args=(5,)) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [True] * 60
+    assert smtp_sink.connections <= mailer.smtp_pool.max_size
+
+
+def test_smtp_throughput_benchmark(mailer, smtp_sink):
+    """Лист/сек: нове з'єднання на кожен лист vs пул vs пакет через одне з'єднання."""
+    smtp_sink.connect_delay = 0.005  # приблизна ціна TCP + TLS + AUTH у локальній мережі
+    emails = _emails(200)
+
+    def run(label, send):
+        mailer.smtp_pool.close_all()
+        connections, messages = smtp_sink.connections, len(smtp_sink.messages)
+        started = time.perf_counter()
+        send()
+        elapsed = time.perf_counter() - started
+        sent = len(smtp_sink.messages) - messages
+        print(f"\n{label:<24} {sent / elapsed:8.1f} msgs/sec  connections={smtp_sink.connections - connections}")
+        assert sent == len(emails)
+        return smtp_sink.connections - connections
+
+    def one_by_one():
+        for email in emails:
+            mailer.send_email(*email)
+
+    mailer.smtp_pool.idle_timeout = 0
+    assert run("connection per message", one_by_one) == len(emails)
+
+    mailer.smtp_pool.idle_timeout = 60
+    assert run("pooled send_email", one_by_one) == 1
+    assert run("pooled send_emails batch", lambda: mailer.send_emails(emails)) == 1
+
+
+def test_connect_timeout_bounds_unresponsive_server(mailer, smtp_sink):
+    smtp_sink.connect_delay = 2.0  # сервер приймає TCP, але мовчить
+    mailer.smtp_connect_timeout = 0.2
+
+    started = time.perf_counter()
+    assert mailer.send_email("a@example.com", "Subject", "Body") is False
+    # без повторного з'єднання: воно лише вдруге чекало б на timeout
+    assert time.perf_counter() - started < 1.0
+
+
+def test_send_timeout_bounds_stalled_delivery(mailer, smtp_sink):
+    smtp_sink.data_delay = 2.0
+    mailer.smtp_send_timeout = 0.2
+
+    started = time.perf_counter()
+    assert mailer.send_email("a@example.com", "Subject", "Body") is False
+    assert time.perf_counter() - started < 1.5
+
+
+def test_circuit_opens_after_failures_and_skips_smtp(mailer, smtp_sink):
+    smtp_sink.connect_delay = 2.0
+    mailer.smtp_connect_timeout = 0.2
+    mailer.smtp_breaker.failure_threshold = 2
+
+    for _ in range(2):
+        assert mailer.send_email("a@example.com", "Subject", "Body") is False
+    assert mailer.smtp_breaker.state == "open"
+
+    started = time.perf_counter()
+    assert mailer.send_emails(_emails(3)) == [False] * 3
+    assert time.perf_counter() - started < 0.05
+    assert mailer.smtp_breaker.snapshot()["rejected"] == 1
+
+
+def test_circuit_closes_after_successful_trial(mailer, smtp_sink):
+    mailer.smtp_breaker.failure_threshold = 1
+    mailer.smtp_breaker.reset_timeout = 0.1
+    mailer.smtp_port = 1
+    assert mailer.send_email("a@example.com", "Subject", "Body") is False
+    assert mailer.smtp_breaker.state == "open"
+
+    mailer.smtp_port = smtp_sink.port
+    time.sleep(0.15)
+    assert mailer.send_email("b@example.com", "Subject", "Body") is True
+    assert mailer.smtp_breaker.state == "closed"
+    assert len(smtp_sink.messages) == 1
+
+
+def test_message_build_errors_do_not_trip_the_circuit(mailer, smtp_sink, monkeypatch):
+    mailer.smtp_breaker.failure_threshold = 1
+    real_wrap = email_templates.wrap
+
+    def wrap(body):
+        if body == "broken":
+            raise ValueError("template error")
+        return real_wrap(body)
+
+    monkeypatch.setattr(email_templates, "wrap", wrap)
+
+    assert mailer.send_email("a@example.com", "Subject", "broken") is False
+    assert mailer.send_emails([("a@example.com", "Subject", "broken"), ("b@example.com", "Subject", "Body")]) == [False, True]
+    assert mailer.smtp_breaker.state == "closed"
+    assert len(smtp_sink.messages) == 1
+
+
+def test_non_smtp_errors_do_not_trip_the_circuit(mailer, smtp_sink, monkeypatch):
+    mailer.smtp_breaker.failure_threshold = 1
+
+    def fail(messages):
+        raise RuntimeError("bug in the send path")
+
+    monkeypatch.setattr(mailer, "_send_messages", fail)
+
+    assert mailer.send_emails(_emails(2)) == [False, False]
+    assert mailer.smtp_breaker.state == "closed"
@@ -0,0 +1,207 @@
+import pytest
+import src.api.auth as auth
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from src.api.auth import generate_auth_token_for_user, decode_token
+from src.api.db import SessionLocal
+from src.api.models.revoked_token_model import RevokedToken
+from src.api.models.user_model import User, UserRole
+from src.api.services.token_revocation import (
+    BloomFilter, RevocationList, revocation_list, revoke_token, prune_expired_revocations
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _claims(minutes=60):
+    exp = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+    return {"jti": uuid.uuid4().hex, "user_id": None, "exp": int(exp.timestamp())}
+
+
+def _revoke(db_session, claims, reason="logout"):
+    revoke_token(db_session, claims, reason)
+    db_session.commit()
+    return claims["jti"]
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    members = [uuid.uuid4().hex for _ in range(10000)]
+    for jti in members:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in members)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+def test_unknown_token_is_rejected_in_memory(db_session):
+    jti = _revoke(db_session, _claims())
+
+    assert revocation_list.is_revoked(jti)
+    assert not revocation_list.is_revoked(uuid.uuid4().hex)
+    assert revocation_list.snapshot()["db_lookups"] == 0
+
+
+def test_rolled_back_revocation_is_not_published(db_session):
+    claims = _claims()
+    revoke_token(db_session, claims, "logout")
+    db_session.rollback()
+    assert not revocation_list.is_revoked(claims["jti"])
+
+
+def test_other_process_sees_revocation_after_refresh(db_session):
+    clock = FakeClock()
+    other = RevocationList(SessionLocal, refresh_interval=5, clock=clock)
+    assert not other.is_revoked(uuid.uuid4().hex)
+
+    jti = _revoke(db_session, _claims())
+    clock.now = 4
+    assert not other.is_revoked(jti)
+    clock.now = 5
+    assert other.is_revoked(jti)
+    assert other.snapshot()["refreshes"] == 2
+    assert other.snapshot()["rebuilds"] == 1
+
+
+def test_bloom_false_positive_is_settled_by_one_db_lookup(db_session):
+    small = RevocationList(SessionLocal, capacity=1, error_rate=0.5)
+    small.maybe_refresh()
+    for _ in range(3):
+        small.add(uuid.uuid4().hex)
+    innocent = next(jti for jti in iter(lambda: uuid.uuid4().hex, None) if jti in small._bloom)
+
+    assert not small.is_revoked(innocent)
+    assert not small.is_revoked(innocent)
+    assert small.snapshot()["db_lookups"] == 1
+    assert small.snapshot()["false_positives"] == 1
+
+
+def test_evicted_exact_entry_is_confirmed_from_db(db_session):
+    bounded = RevocationList(SessionLocal, exact_size=2)
+    bounded.maybe_refresh()
+    first = _revoke(db_session, _claims())
+    bounded.add(first)
+    for _ in range(2):
+        bounded.add(uuid.uuid4().hex)
+
+    assert bounded.is_revoked(first)
+    assert bounded.snapshot()["db_lookups"] == 1
+
+
+def test_rebuild_drops_expired_revocations(db_session):
+    listing = RevocationList(SessionLocal, capacity=2, refresh_interval=0)
+    expired = _revoke(db_session, _claims(minutes=-1))
+    live = _revoke(db_session, _claims())
+    listing.maybe_refresh()
+    assert listing.snapshot()["bloom_entries"] == 1
+
+    assert prune_expired_revocations(db_session) == 1
+    assert db_session.query(RevokedToken).filter_by(jti=expired).count() == 0
+    assert listing.is_revoked(live)
+
+
+@pytest.fixture
+def guest(db_session):
+    user = User(
+        email=f"revoke_{uuid.uuid4().hex[:8]}@example.com",
+        first_name="Revoke",
+        last_name="Guest",
+        phone=f"+38063{uuid.uuid4().int % 10000000:07d}",
+        role=UserRole.GUEST,
+        is_registered=True
+    )
+    user.set_password("Password1!")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_logout_revokes_token(client, guest):
+    token = generate_auth_token_for_user(guest)
+    assert client.get("/api/v1/auth/me", headers=_auth(token)).status_code == 200
+
+    assert client.post("/api/v1/auth/logout", headers=_auth(token)).status_code == 200
+    resp = client.get("/api/v1/auth/me", headers=_auth(token))
+    assert resp.status_code == 401
+    assert resp.get_json()["message"] == "Token has been revoked"
+    # інші сесії користувача лишаються дійсними
+    assert client.get("/api/v1/auth/me", headers=_auth(generate_auth_token_for_user(guest))).status_code == 200
+
+
+@pytest.mark.parametrize("claims_only", [False, True])
+def test_change_password_revokes_all_tokens_and_issues_new_one(client, guest, monkeypatch, claims_only):
+    monkeypatch.setattr(auth, "AUTH_CLAIMS_ONLY", claims_only)
+    token = generate_auth_token_for_user(guest)
+    # сесія на іншому пристрої
+    other_token = generate_auth_token_for_user(guest)
+    assert client.get("/api/v1/auth/me", headers=_auth(other_token)).status_code == 200
+
+    resp = client.post("/api/v1/auth/change-password", headers=_auth(token),
+                       json={"current_password": "Password1!", "new_password": "Password2!"})
+    assert resp.status_code == 200
+
+    assert client.get("/api/v1/auth/me", headers=_auth(token)).status_code == 401
+    resp_other = client.get("/api/v1/auth/me", headers=_auth(other_token))
+    assert resp_other.status_code == 401
+    assert resp_other.get_json()["message"] == "Token has been revoked"
+    assert client.get("/api/v1/auth/me", headers=_auth(resp.get_json()["token"])).status_code == 200
+    login = client.post("/api/v1/auth/login", json={"email": guest.email, "password": "Password2!"})
+    assert login.status_code == 200
+
+
+@pytest.mark.parametrize("body, status", [
+    ({"current_password": "Wrong1!xx", "new_password": "Password2!"}, 401),
+    ({"current_password": "Password1!", "new_password": "weak"}, 400),
+    ({"new_password": "Password2!"}, 400),
+])
+def test_change_password_rejects_bad_input(client, guest, body, status):
+    token = generate_auth_token_for_user(guest)
+    assert client.post("/api/v1/auth/change-password", headers=_auth(token), json=body).status_code == status
+    assert client.get("/api/v1/auth/me", headers=_auth(token)).status_code == 200
+
+
+def test_revocation_check_cost_benchmark(db_session, guest):
+    """Мкс на перевірку: запит до revoked_tokens щоразу vs Bloom-фільтр + точна множина."""
+    for _ in range(1000):
+        revoke_token(db_session, _claims(), "logout")
+    db_session.commit()
+    revoked = _revoke(db_session, _claims())
+    token = generate_auth_token_for_user(guest)
+    decode_token(token)
+    runs = 2000
+
+    def per_check(label, check):
+        started = time.perf_counter()
+        for _ in range(runs):
+            check()
+        micros = (time.perf_counter() - started) / runs * 1e6
+        print(f"\n{label:<32} {micros:8.1f} us/check")
+        return micros
+
+    def query_every_time():
+        session = SessionLocal()
+        try:
+            session.query(RevokedToken.id).filter_by(jti=revoked).first()
+        finally:
+            session.close()
+
+    naive = per_check("revoked_tokens query", query_every_time)
+    negative = per_check("in memory, not revoked", lambda: revocation_list.is_revoked(uuid.uuid4().hex))
+    positive = per_check("in memory, revoked", lambda: revocation_list.is_revoked(revoked))
+    per_check("decode_token (memoized claims)", lambda: decode_token(token))
+
+    assert max(negative, positive) * 10 < naive
+    assert revocation_list.snapshot()["db_lookups"] <= 5
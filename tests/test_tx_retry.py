@@ -0,0 +1,101 @@
+import pytest
+import uuid
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from src.api.models.room_model import Room, RoomType, RoomStatus
+from src.api.services.tx_retry import (
+    RetryMetrics,
+    RetriesExhaustedError,
+    begin_serializable,
+    is_serialization_failure,
+    retry_on_serialization_failure
+)
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+class _FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _db_error(pgcode):
+    return OperationalError("INSERT INTO bookings ...", {}, _PgError(pgcode))
+
+
+def _failing(failures, pgcode="40001"):
+    calls = []
+
+    def fn(session):
+        calls.append(1)
+        if len(calls) <= failures:
+            raise _db_error(pgcode)
+        return "booked"
+    return fn, calls
+
+
+@pytest.mark.parametrize("pgcode,expected", [("40001", True), ("40P01", True), ("23P01", False), (None, False)])
+def test_is_serialization_failure(pgcode, expected):
+    assert is_serialization_failure(_db_error(pgcode)) is expected
+
+
+def test_retries_until_success():
+    metrics = RetryMetrics()
+    fn, calls = _failing(2)
+    session = _FakeSession()
+
+    assert retry_on_serialization_failure(base_delay=0, metrics=metrics)(fn)(session) == "booked"
+    assert len(calls) == 3
+    assert session.rollbacks == 2
+    assert metrics.snapshot() == {"calls": 1, "attempts": 3, "retries": 2, "exhausted": 0, "retry_rate": 0.6667}
+
+
+def test_other_database_errors_are_not_retried():
+    fn, calls = _failing(1, pgcode="23505")
+    with pytest.raises(OperationalError):
+        retry_on_serialization_failure(base_delay=0, metrics=RetryMetrics())(fn)(_FakeSession())
+    assert len(calls) == 1
+
+
+def test_gives_up_after_max_attempts():
+    metrics = RetryMetrics()
+    fn, calls = _failing(10)
+
+    with pytest.raises(RetriesExhaustedError, match="not available"):
+        retry_on_serialization_failure(max_attempts=3, base_delay=0, metrics=metrics)(fn)(_FakeSession())
+    assert len(calls) == 3
+    assert metrics.snapshot()["exhausted"] == 1
+
+
+def _room():
+    return Room(room_number=f"TX{uuid.uuid4().hex[:6]}", room_type=RoomType.STANDARD, max_guest=2,
+                base_price=1000.0, status=RoomStatus.AVAILABLE, floor=1)
+
+
+def test_begin_serializable_restarts_a_read_only_transaction(db_session):
+    db_session.execute(text("SELECT 1"))
+    begin_serializable(db_session)
+    isolation = db_session.execute(text("SHOW transaction_isolation")).scalar()
+    assert isolation == "serializable"
+    db_session.rollback()
+
+
+@pytest.mark.parametrize("flush", [False, True])
+def test_begin_serializable_refuses_pending_changes(db_session, flush):
+    room = _room()
+    db_session.add(room)
+    if flush:
+        db_session.flush()
+
+    with pytest.raises(RuntimeError, match="uncommitted changes"):
+        begin_serializable(db_session)
+    # нічого не закомічено поза транзакцією, що повторюється
+    db_session.rollback()
+    assert db_session.query(Room).filter_by(room_number=room.room_number).count() == 0
@@ -681,7 +681,7 @@ def sample_user(flask_app):
 
 
 def test_api_get_all_users(client):
-    response = client.get("/api/v1/users/")
+    response = client.get("/api/v1/users/?all=true")
     assert response.status_code == 200
     assert isinstance(response.json, list)
 
@@ -841,7 +841,7 @@ def test_api_delete_user_not_found(client):
 
 
 def test_api_search_users_role_last_name(client, sample_user):
-    response = client.get(f"/api/v1/users/?role=GUEST&last_name={sample_user.last_name}")
+    response = client.get(f"/api/v1/users/?role=GUEST&last_name={sample_user.last_name}&all=true")
     assert response.status_code == 200
     # API може повертати id замість user_id
     user_ids = [u.get("user_id") or u.get("id") for u in response.json]
@@ -849,21 +849,21 @@ def test_api_search_users_role_last_name(client, sample_user):
 
 
 def test_api_search_users_only_role(client, sample_user):
-    response = client.get("/api/v1/users/?role=GUEST")
+    response = client.get("/api/v1/users/?role=GUEST&all=true")
     assert response.status_code == 200
     user_ids = [u.get("user_id") or u.get("id") for u in response.json]
     assert sample_user.user_id in user_ids
 
 
 def test_api_search_users_only_last_name(client, sample_user):
-    response = client.get(f"/api/v1/users/?last_name={sample_user.last_name}")
+    response = client.get(f"/api/v1/users/?last_name={sample_user.last_name}&all=true")
     assert response.status_code == 200
     user_ids = [u.get("user_id") or u.get("id") for u in response.json]
     assert sample_user.user_id in user_ids
 
 
 def test_api_search_users_empty_params(client, sample_user):
-    response = client.get("/api/v1/users/?role=   &last_name=   ")
+    response = client.get("/api/v1/users/?role=   &last_name=   &all=true")
     assert response.status_code == 200
     # Поведінка залежить від реалізації - або повертає все, або пустий список
     assert isinstance(response.json, list)
@@ -0,0 +1,172 @@
+import pytest
+import uuid
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+from src.api.auth import create_token
+from src.api.versioning import VersionConflictError, make_etag, parse_if_match
+from src.api.services.booking_service import (
+    create_booking,
+    update_booking_partial,
+    update_expired_bookings_status
+)
+from src.api.services.room_service import update_room_partial
+from src.api.models.booking_model import Booking, BookingStatus
+from src.api.models.room_model import Room, RoomType, RoomStatus, Amenity
+from src.api.models.user_model import User, UserRole
+
+
+@pytest.fixture
+def versioned_room(db_session):
+    room = Room(
+        room_number=f"VR{uuid.uuid4().hex[:6]}",
+        room_type=RoomType.STANDARD,
+        max_guest=2,
+        base_price=1000.0,
+        status=RoomStatus.AVAILABLE,
+        floor=1
+    )
+    db_session.add(room)
+    db_session.commit()
+    return room
+
+
+@pytest.fixture
+def versioned_booking(db_session, versioned_room):
+    check_in = date.today() + timedelta(days=14)
+    return create_booking(db_session, {
+        "room_id": versioned_room.room_id,
+        "check_in_date": check_in,
+        "check_out_date": check_in + timedelta(days=2),
+        "email": f"ver{uuid.uuid4().hex[:10]}@example.com",
+        "first_name": "Version",
+        "last_name": "Guest",
+        "phone": f"+38068{uuid.uuid4().int % 10000000:07d}"
+    })
+
+
+@pytest.fixture
+def admin_headers(db_session):
+    admin = User(
+        email=f"admin_{uuid.uuid4().hex[:6]}@test.com",
+        first_name="Admin",
+        last_name="User",
+        role=UserRole.ADMIN,
+        phone=f"+38012{uuid.uuid4().int % 10000000:07d}",
+        is_registered=True
+    )
+    admin.set_password("adminpass")
+    db_session.add(admin)
+    db_session.commit()
+    return {"Authorization": f"Bearer {create_token(admin.user_id, role='ADMIN', is_admin=True)}"}
+
+
+@pytest.mark.parametrize("header,expected", [(None, None), ("*", None), ('"3"', 3), ("7", 7)])
+def test_parse_if_match(header, expected):
+    assert parse_if_match(header) == expected
+
+
+@pytest.mark.parametrize("header", ['W/"3"', '"abc"'])
+def test_parse_if_match_rejects_unusable_tags(header):
+    with pytest.raises(VersionConflictError):
+        parse_if_match(header)
+
+
+def test_new_rows_start_at_version_one(versioned_booking, versioned_room):
+    assert versioned_booking.version == 1
+    assert versioned_room.version == 1
+
+
+def test_booking_update_bumps_version_and_checks_expected(db_session, versioned_booking):
+    code = versioned_booking.booking_code
+    update_booking_partial(db_session, code, {"special_requests": "Quiet room"}, expected_version=1)
+    db_session.commit()
+    assert db_session.query(Booking).get(code).version == 2
+
+    with pytest.raises(VersionConflictError):
+        update_booking_partial(db_session, code, {"special_requests": "Sea view"}, expected_version=1)
+
+
+def test_concurrent_stale_write_fails_fast(db_session, versioned_booking):
+    code = versioned_booking.booking_code
+    bind = db_session.get_bind()
+    first, second = Session(bind=bind), Session(bind=bind)
+    try:
+        # обидва читають версію 1 (посилання тримають об'єкти в identity map)
+        loaded = [first.query(Booking).get(code), second.query(Booking).get(code)]
+        assert [b.version for b in loaded] == [1, 1]
+
+        update_booking_partial(first, code, {"special_requests": "First"})
+        first.commit()
+
+        with pytest.raises(VersionConflictError):
+            update_booking_partial(second, code, {"special_requests": "Second"})
+    finally:
+        first.close()
+        second.close()
+
+    db_session.expire_all()
+    assert db_session.query(Booking).get(code).special_requests == "First"
+
+
+def test_expired_bookings_job_bumps_version(db_session, versioned_booking):
+    versioned_booking.check_in_date = date.today() - timedelta(days=5)
+    versioned_booking.check_out_date = date.today() - timedelta(days=2)
+    db_session.commit()
+    version = versioned_booking.version
+
+    assert update_expired_bookings_status(db_session) == (1, 1)
+    db_session.refresh(versioned_booking)
+    assert versioned_booking.status == BookingStatus.COMPLETED
+    assert versioned_booking.version == version + 1
+
+
+def test_room_amenities_only_update_bumps_version(db_session, versioned_room):
+    amenity = Amenity(amenity_name="Wi-Fi")
+    db_session.add(amenity)
+    db_session.commit()
+
+    update_room_partial(db_session, versioned_room.room_id, {"amenities": [amenity.amenity_id]}, expected_version=1)
+    assert versioned_room.version == 2
+
+    with pytest.raises(VersionConflictError):
+        update_room_partial(db_session, versioned_room.room_id, {"description": "Stale"}, expected_version=1)
+
+
+def test_api_booking_etag_round_trip(client, versioned_booking):
+    url = f"/api/v1/bookings/{versioned_booking.booking_code}"
+    etag = client.get(url).headers["ETag"]
+    assert etag == make_etag(1)
+
+    response = client.patch(url, json={"special_requests": "Extra pillow"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == make_etag(2)
+
+    stale = client.patch(url, json={"special_requests": "Late"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+
+    # без If-Match - як і раніше, без попередньої умови
+    assert client.patch(url, json={"special_requests": "Late"}).status_code == 200
+
+
+def test_api_booking_put_stale_if_match(client, versioned_booking):
+    url = f"/api/v1/bookings/{versioned_booking.booking_code}"
+    payload = {
+        "user_id": versioned_booking.user_id,
+        "room_id": versioned_booking.room_id,
+        "check_in_date": versioned_booking.check_in_date.isoformat(),
+        "check_out_date": versioned_booking.check_out_date.isoformat()
+    }
+    assert client.put(url, json=payload, headers={"If-Match": make_etag(5)}).status_code == 412
+    assert client.put(url, json=payload, headers={"If-Match": make_etag(1)}).status_code == 200
+
+
+def test_api_room_patch_if_match(client, versioned_room, admin_headers):
+    url = f"/api/v1/rooms/{versioned_room.room_id}"
+    etag = client.get(url).headers["ETag"]
+
+    ok = client.patch(url, json={"description": "Updated description"}, headers={**admin_headers, "If-Match": etag})
+    assert ok.status_code == 200
+    assert ok.headers["ETag"] == make_etag(2)
+
+    stale = client.patch(url, json={"description": "Stale description"}, headers={**admin_headers, "If-Match": etag})
+    assert stale.status_code == 412